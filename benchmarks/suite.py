@@ -0,0 +1,374 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+from cayley_tables import generators
+from cayley_tables.cayley import CayleyTable
+from utils import nt
+
+try:
+    import yaml
+except ImportError:
+    # PyYAML is only needed for the tables of the 'config' family, which is skipped without it.
+    yaml = None
+
+FAMILIES = ('cyclic', 'dihedral', 'config', 'product')
+DEFAULT_ORDERS = (10, 100, 1000, 10000)
+# The small groups of config/valid_tables.yml which are benchmarked, they have a fixed order.
+CONFIG_TABLES = {'klein4': 'cayley_klein4', 'd4': 'cayley_d4', 's3': 'cayley_s3'}
+CONFIG_PATH = root_dir / 'config' / 'valid_tables.yml'
+RUST_MISSING = 'Rust extension not built'
+# The largest order for which each associativity method is timed by default. The exact check is
+# O(n^3), and the random one takes minutes beyond a few thousand elements.
+VALIDATION_LIMITS = {'light': None, 'random': 1000, 'exact': 512}
+
+
+def rust_available() -> Dict[str, bool]:
+    # Which of the optional Rust extensions could be imported.
+    return {'gen_cyclic_cayley': generators.gcc is not None, 'nt_utils': nt._rust is not None}
+
+
+def _implementations(available: bool) -> List[Tuple[str, Optional[str]]]:
+    # The implementations to compare, with the reason a Rust run is skipped if it is.
+    return [('rust', None if available else RUST_MISSING), ('python', None)]
+
+
+@contextmanager
+def _pure_python_nt() -> Iterator[None]:
+    # Temporarily hide the nt_utils extension, so that utils.nt takes its numpy paths.
+    saved = nt._rust
+    nt._rust = None
+    try:
+        yield
+    finally:
+        nt._rust = saved
+
+
+def time_call(fn: Callable[[], Any], setup: Optional[Callable[[], Any]] = None,
+              repeats: int = 3) -> float:
+    '''
+    Time fn with time.perf_counter and return the best of several runs, which is the
+    least noisy estimate of its cost.
+
+    Arguments:
+        - fn: the callable to time, called without arguments
+        - setup: called before every run and not timed, e.g. to clear the table's caches
+        - repeats: the number of runs
+    Outputs:
+        - the fastest run in seconds
+    '''
+    best = float('inf')
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    '''
+    Return the peak memory in bytes allocated while running fn, as traced by tracemalloc.
+    numpy reports its array buffers to tracemalloc, so the tables and their temporaries are
+    included. Tracing slows Python code down, so it is measured apart from the timings.
+    '''
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _config_tables() -> Dict[str, Dict[Any, Dict[Any, Any]]]:
+    with open(CONFIG_PATH, 'r') as f:
+        tables = yaml.safe_load(f)
+    return {name: tables[key] for name, key in CONFIG_TABLES.items()}
+
+
+def _product_factors(order: int, rng: np.random.Generator) -> Tuple[Tuple[str, int], ...]:
+    # A random factorization of order as a cyclic or dihedral group times a cyclic group.
+    splits = [d for d in nt.divisors(order) if 1 < d < order]
+    if not splits:
+        return (('C', order), ('C', 1))
+    d = int(rng.choice(splits))
+    first = ('D', d // 2) if d % 2 == 0 and rng.random() < 0.5 else ('C', d)
+    return (first, ('C', order // d))
+
+
+def _factor_array(factor: Tuple[str, int], use_rust: bool) -> np.ndarray:
+    kind, size = factor
+    if kind == 'D':
+        return generators.dihedral_array(size, use_rust=use_rust)
+    return generators.cyclic_array(size, use_rust=use_rust)
+
+
+def _family_cases(families: List[str], orders: List[int], seed: int) -> Iterator[Dict[str, Any]]:
+    '''
+    Yield one case per family and order, as a dictionary with the family, the order, a
+    description of the group and a function build(use_rust) returning its CayleyTable.
+    The groups of the 'config' family have a fixed order and are yielded once.
+    '''
+    for family in families:
+        if family == 'config':
+            if yaml is None:
+                continue
+            for name, table in _config_tables().items():
+                def build_config(use_rust: bool, table=table) -> CayleyTable:
+                    return CayleyTable(table, check_axioms=False)
+                yield {'family': family, 'order': len(table), 'group': name, 'build': build_config}
+            continue
+        for order in orders:
+            if family == 'cyclic':
+                factors = (('C', order),)
+            elif family == 'dihedral':
+                # Dihedral groups have even order, the closest one below is used for odd orders.
+                factors = (('D', max(order // 2, 1)),)
+            else:
+                factors = _product_factors(order, np.random.default_rng([seed, order]))
+
+            def build(use_rust: bool, factors=factors) -> CayleyTable:
+                array = _factor_array(factors[0], use_rust)
+                for factor in factors[1:]:
+                    array = generators.direct_product_array(array, _factor_array(factor, use_rust),
+                                                            use_rust=use_rust)
+                return CayleyTable.from_array(array, check_axioms=False, copy=False)
+            group = ' x '.join(f'{kind}{size}' for kind, size in factors)
+            size = int(np.prod([2 * s if k == 'D' else s for k, s in factors]))
+            yield {'family': family, 'order': size, 'group': group, 'build': build}
+
+
+def _queries(table: CayleyTable,
+             rng: np.random.Generator) -> List[Tuple[str, Callable[[], Any], bool]]:
+    # The queries timed on a table, as (name, function, whether caches are cleared first).
+    n = table.order()
+    sample = table.labels_of(rng.integers(0, n, min(n, 1000)))
+    x, y = table.labels_of(rng.integers(0, n, 2))
+    subset = table.generated_subgroup([x]).elements
+    return [
+        ('inverse_indices', table.inverse_indices, True),
+        ('get_inverse', lambda: [table.get_inverse(g) for g in sample], False),
+        ('element_orders', table.element_orders, True),
+        ('get_order_of_element', lambda: [table.get_order_of_element(g) for g in sample], False),
+        ('get_elements_of_order',
+         lambda: [table.get_elements_of_order(d) for d in table.order_histogram()], True),
+        ('is_subgroup', lambda: table.is_subgroup(subset), True),
+        ('generated_subgroup', lambda: table.generated_subgroup([x, y]), True),
+    ]
+
+
+def _nt_cases(orders: List[int]) -> Iterator[Tuple[str, int, Callable[[], Any]]]:
+    # Number theory utilities used by the group constructions, sized by the group order.
+    for order in orders:
+        values = np.arange(1, order + 1)
+        yield 'nt/primes', order, lambda order=order: nt.primes(100 * order)
+        yield 'nt/totient_many', order, lambda values=values: nt.totient_many(values)
+        yield 'nt/is_prime_many', order, lambda values=values: nt.is_prime_many(values)
+
+
+def run(families: List[str] = FAMILIES, orders: List[int] = DEFAULT_ORDERS, repeats: int = 3,
+        limits: Optional[Dict[str, Optional[int]]] = None, seed: int = 0, memory: bool = True,
+        log: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    '''
+    Run the benchmark suite and return its results as a JSON serializable dictionary.
+
+    For every group of the requested families and orders it times the construction of the
+    Cayley table with the Rust and the pure Python generators, axiom checking with each
+    associativity method up to its order limit, inverse and order queries, subgroup tests
+    and subgroup generation, and records the peak memory of building and validating the table.
+    Caches are cleared before each run of a cached query, so that the cost of computing it is
+    measured. The number theory utilities are timed with and without the nt_utils extension.
+    Rust runs, and validations above their limit, are recorded as skipped.
+
+    Arguments:
+        - families: a subset of FAMILIES
+        - orders: the group orders, one group per family and order
+        - repeats: the number of runs of each benchmark, the fastest one is reported
+        - limits: the largest order for which each associativity method is timed, None for
+            no limit. Defaults to VALIDATION_LIMITS, and methods without a key use theirs.
+        - seed: seed for the random products and the sampled elements
+        - memory: whether to measure peak memory
+        - log: called with a line of progress for each benchmark, e.g. print
+    Outputs:
+        - a dictionary with the keys 'metadata' and 'results'. Each result has a unique
+            'name' and either 'seconds', 'peak_bytes' or 'skipped'.
+    '''
+    unknown = set(families) - set(FAMILIES)
+    if unknown:
+        raise ValueError(f'Unknown families {sorted(unknown)}, expected a subset of {FAMILIES}.')
+    if any(isinstance(order, bool) or not isinstance(order, int) or order <= 0
+           for order in orders):
+        raise ValueError('orders must be positive integers.')
+    limits = {**VALIDATION_LIMITS, **(limits or {})}
+    results = []
+
+    def record(name: str, family: str, order: int, key: Any = None, **values: Any) -> None:
+        # Benchmarks are named by the family and order, or the group for fixed groups.
+        key = order if key is None else key
+        result = {'name': f'{name}[{family}-{key}]', 'benchmark': name, 'family': family,
+                  'order': order, **values}
+        results.append(result)
+        if log is not None:
+            value = values.get('seconds', values.get('peak_bytes', values.get('skipped')))
+            log(f'{result["name"]}: {value}')
+
+    available = rust_available()
+    for case in _family_cases(list(families), list(orders), seed):
+        family, order, build = case['family'], case['order'], case['build']
+        key = case['group'] if family == 'config' else None
+
+        def add(name: str, **values: Any) -> None:
+            record(name, family, order, key, group=case['group'], **values)
+        if family == 'config':
+            add('construct/python', seconds=time_call(lambda: build(False), repeats=repeats))
+        else:
+            for implementation, skipped in _implementations(available['gen_cyclic_cayley']):
+                if skipped:
+                    add(f'construct/{implementation}', skipped=skipped)
+                    continue
+                use_rust = implementation == 'rust'
+                add(f'construct/{implementation}',
+                    seconds=time_call(lambda: build(use_rust), repeats=repeats))
+        table = build(True)
+        for method, limit in limits.items():
+            if limit is not None and order > limit:
+                add(f'validate/{method}', skipped=f'order above the limit {limit}')
+                continue
+            add(f'validate/{method}', seconds=time_call(
+                lambda: table.is_group(method), table._cache.clear, repeats=repeats))
+        for name, query, cold in _queries(table, np.random.default_rng([seed, order])):
+            setup = table._cache.clear if cold else None
+            add(name, seconds=time_call(query, setup, repeats=repeats))
+        if memory:
+            del table
+
+            def build_and_validate() -> None:
+                build(True).is_group('light')
+            add('memory', peak_bytes=peak_memory(build_and_validate))
+    for name, order, fn in _nt_cases(list(orders)):
+        for implementation, skipped in _implementations(available['nt_utils']):
+            benchmark = f'{name}/{implementation}'
+            if skipped:
+                record(benchmark, 'nt', order, skipped=skipped)
+                continue
+            if implementation == 'rust':
+                seconds = time_call(fn, repeats=repeats)
+            else:
+                with _pure_python_nt():
+                    seconds = time_call(fn, repeats=repeats)
+            record(benchmark, 'nt', order, seconds=seconds)
+    metadata = {'python': platform.python_version(), 'numpy': np.__version__,
+                'platform': platform.platform(), 'rust': available,
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'parameters': {'families': list(families), 'orders': list(orders),
+                               'repeats': repeats, 'limits': limits, 'seed': seed}}
+    return {'metadata': metadata, 'results': results}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 1.25,
+            min_seconds: float = 1e-3) -> List[Dict[str, Any]]:
+    '''
+    Compare the results of a run against a baseline run, matching benchmarks by name.
+
+    A benchmark regresses when its time or peak memory grew by more than the factor
+    threshold. Timings below min_seconds in both runs are dominated by noise and never
+    count as regressions. Benchmarks which are missing or skipped in either run are ignored.
+
+    Arguments:
+        - results, baseline: outputs of run, or their JSON
+        - threshold: the largest accepted ratio of current to baseline value
+        - min_seconds: timings are only compared when one of them exceeds this
+    Outputs:
+        - a list with one dictionary per compared value, with the keys 'name', 'metric',
+            'baseline', 'current', 'ratio' and 'regression'
+    '''
+    if threshold < 1:
+        raise ValueError('threshold must be at least 1.')
+    previous = {result['name']: result for result in baseline['results']}
+    comparisons = []
+    for result in results['results']:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if metric not in result or metric not in old:
+                continue
+            current, reference = result[metric], old[metric]
+            ratio = current / reference if reference else float('inf') if current else 1.0
+            noise = metric == 'seconds' and max(current, reference) < min_seconds
+            comparisons.append({'name': result['name'], 'metric': metric, 'baseline': reference,
+                                'current': current, 'ratio': ratio,
+                                'regression': ratio > threshold and not noise})
+    return comparisons
+
+
+def _parse_arguments(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Benchmark Cayley table construction, validation and queries.')
+    parser.add_argument('--families', nargs='+', choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument('--orders', nargs='+', type=int, default=list(DEFAULT_ORDERS))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per benchmark, the fastest is reported')
+    parser.add_argument('--exact-limit', type=int, default=VALIDATION_LIMITS['exact'],
+                        help='largest order for which exact associativity checking is timed')
+    parser.add_argument('--random-limit', type=int, default=VALIDATION_LIMITS['random'],
+                        help='largest order for which random associativity checking is timed')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip peak memory measurements')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against the JSON results of a previous run')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio to the baseline above which a benchmark regresses')
+    parser.add_argument('--quiet', action='store_true', help='do not print progress')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    '''
+    Command line entry point, see --help. Progress goes to stderr, and the results are written
+    as JSON to --output, or to stdout without it. With --baseline the comparison is printed
+    and the exit status is 1 if any benchmark regressed.
+    '''
+    args = _parse_arguments(argv)
+
+    def log(line: str) -> None:
+        print(line, file=sys.stderr)
+    limits = {'exact': args.exact_limit, 'random': args.random_limit}
+    results = run(args.families, args.orders, args.repeat, limits, args.seed,
+                  memory=not args.no_memory, log=None if args.quiet else log)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    comparisons = compare(results, baseline, args.threshold)
+    for comparison in comparisons:
+        flag = 'REGRESSION' if comparison['regression'] else 'ok'
+        log('{name} {metric}: {baseline:.6g} -> {current:.6g} ({ratio:.2f}x) '.format(**comparison)
+            + flag)
+    regressions = sum(comparison['regression'] for comparison in comparisons)
+    log(f'{regressions} of {len(comparisons)} compared values regressed.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
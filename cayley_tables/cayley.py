@@ -1,5 +1,128 @@
-from typing import Dict, Any, Union, List
-from utils import dict_utils
+import json
+import math
+import os
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Union, List, Optional, Tuple
+from cayley_tables import instrumentation, parallel
+
+# Ways of verifying associativity, selected through check_axioms:
+#   - 'exact': compare (a * b) * c with a * (b * c) for every triple, one row of a at a time
+#   - 'light': Light's test, which only needs the triples whose middle entry is a generator
+#   - 'random': Rajagopalan-Schulman test over random subsets, wrong with probability at most
+#     error_bound when the operation is not associative
+#   - 'parallel': the exact test, split by rows across a pool of processes sharing the table
+ASSOCIATIVITY_METHODS = ('exact', 'light', 'random', 'parallel')
+
+# Binary table format, see CayleyTable.save: TABLE_MAGIC, the length of a JSON header as a
+# little-endian uint64, the header {"order", "dtype", "elements"}, zero padding up to a multiple
+# of TABLE_ALIGNMENT bytes and the n by n matrix of element indices in row-major order.
+TABLE_MAGIC = b'ALGPYCT1'
+TABLE_ALIGNMENT = 64
+
+
+def index_dtype(n_elements: int) -> np.dtype:
+    """
+    Return the smallest unsigned integer dtype able to hold every index 0, ..., n_elements.
+    The value n_elements itself is reserved as a sentinel for products which are not elements
+    of the table, e.g. when a table is not closed.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_elements <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def as_indices(indices: Any, n_elements: int) -> np.ndarray:
+    # indices as an intp array, raising a ValueError unless they are all in [0, n_elements).
+    array = np.asarray(indices)
+    if array.dtype.kind not in 'iu' and not (array.size == 0 and array.dtype.kind == 'f'):
+        raise ValueError('Element indices must be integers.')
+    if array.size and (array.min() < 0 or array.max() >= n_elements):
+        raise ValueError(f'Element indices must be in [0, {n_elements}).')
+    return array.astype(np.intp, copy=False)
+
+
+def as_exponents(exponents: Any) -> np.ndarray:
+    # exponents as an int64 array, raising a ValueError unless they are all integers.
+    array = np.asarray(exponents)
+    if array.dtype.kind not in 'iu' and array.size:
+        raise ValueError('Exponents must be integers.')
+    return array.astype(np.int64)
+
+
+def as_words(words: Any, n_elements: int, identity: int) -> np.ndarray:
+    """
+    Return words of element indices as the rows of a 2D intp array, padding words shorter than
+    the longest one with the identity, which does not change their products.
+
+    Arguments:
+        - words: a 2D array of indices, or a sequence of sequences of indices of any lengths
+        - n_elements: the order of the group
+        - identity: the index of its identity
+    """
+    try:
+        array = np.asarray(words)
+    except ValueError:
+        array = np.asarray(words, dtype=object)
+    if array.dtype == object:
+        rows = [as_indices(word, n_elements).ravel() for word in words]
+        array = np.full((len(rows), max(map(len, rows), default=0)), identity, dtype=np.intp)
+        for row, word in zip(array, rows):
+            row[:len(word)] = word
+        return array
+    if array.ndim != 2 and not (array.ndim == 1 and array.size == 0):
+        raise ValueError('words must be a 2D array or a sequence of sequences of indices.')
+    width = array.shape[1] if array.ndim == 2 else 0
+    return as_indices(array, n_elements).reshape(len(array), width)
+
+
+def _merge_orbits(n_elements: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Vectorized union-find over 0, ..., n_elements - 1, joining each source with its target.
+    Every round hooks the larger root of each unmerged pair onto the smaller one and then
+    compresses paths by pointer jumping. Returns the smallest element of each orbit.
+    """
+    parent = np.arange(n_elements)
+    while True:
+        roots_1, roots_2 = parent[sources], parent[targets]
+        unmerged = roots_1 != roots_2
+        if not unmerged.any():
+            return parent
+        np.minimum.at(parent, np.maximum(roots_1, roots_2)[unmerged],
+                      np.minimum(roots_1, roots_2)[unmerged])
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def _write_header(file, elements: List[Any]) -> np.dtype:
+    # Write the header of the binary format for the given labels, returning the matrix dtype.
+    n = len(elements)
+    dtype = index_dtype(n)
+    header = json.dumps({'order': n, 'dtype': dtype.str, 'elements': list(elements)})
+    if json.loads(header)['elements'] != list(elements):
+        raise TypeError('Only tables labelled by strings and numbers can be saved.')
+    header = header.encode('utf-8')
+    length = len(TABLE_MAGIC) + 8 + len(header)
+    file.write(TABLE_MAGIC + len(header).to_bytes(8, 'little') + header
+               + bytes(-length % TABLE_ALIGNMENT))
+    return dtype
+
+
+def _read_header(file) -> Tuple[List[Any], np.dtype, int]:
+    # Read the header of the binary format, returning the labels, the dtype and the data offset.
+    if file.read(len(TABLE_MAGIC)) != TABLE_MAGIC:
+        raise ValueError('Not a Cayley table file.')
+    length = int.from_bytes(file.read(8), 'little')
+    header = json.loads(file.read(length).decode('utf-8'))
+    elements, dtype = header['elements'], np.dtype(header['dtype'])
+    if header['order'] != len(elements) or dtype != index_dtype(len(elements)):
+        raise ValueError('Corrupt Cayley table header.')
+    offset = len(TABLE_MAGIC) + 8 + length
+    return elements, dtype, offset + (-offset % TABLE_ALIGNMENT)
 
 
 class CayleyTable():
@@ -13,82 +136,568 @@ class CayleyTable():
     and fields, because (R,+) is an abelian group for any ring R, and (F,*) is an abelian
     group for any field F.
 
+    Internally the elements are interned: element i of self.elements is represented by the
+    integer i, and the operation is stored as an n by n numpy array of such indices, using
+    the smallest unsigned dtype that fits the order. The nested dictionary interface is still
+    available through self.table, which is a view onto the array.
+
+    The identity, the inverse and order of every element and the abelian flag are computed
+    lazily, once, and cached. Changing an entry through set_product (or self.table[x][y] = z)
+    clears the cache.
+
     Arguments:
         - table (Dict[Any, Dict[Any, Any]]): Cayley table representing the group operation
         - check_axioms: Whether to verify if the input table satisfies the group axioms or not.
-            Should be False when initializing a given type of finite group, e.g. cyclic or dihedral
+            Should be False when initializing a given type of finite group, e.g. cyclic or dihedral.
+            True checks associativity exactly; pass one of ASSOCIATIVITY_METHODS to choose how.
+        - error_bound: Probability of wrongly accepting a non-associative table, only used when
+            check_axioms is 'random'.
+        - workers: Number of processes used when check_axioms is 'parallel', defaults to the
+            number of CPUs.
 
     Outputs:
         - Cayley table corresponding to the input dictionary
-    
+
     Methods:
+        - from_array
+        - save
+        - load
         - is_group
+        - validate
+        - find_nonassociative_triple
         - get_identity
+        - index_of
+        - op
+        - set_product
+        - memory_footprint
+        - indices_of
+        - labels_of
+        - op_many
+        - reduce
+        - pow_many
+        - is_subgroup
+        - generated_subgroup
+        - inverse_indices
+        - element_orders
+        - order_histogram
+        - conjugacy_classes
+        - center
+        - centralizer
+        - left_cosets
+        - right_cosets
+        - is_normal
+        - quotient
     """
-    def __init__(self, table: Dict[Any, Dict[Any, Any]], check_axioms=True) -> None:
-        
-        self.elements = list(table.keys())
-        self.table = table
+    def __init__(self, table: Dict[Any, Dict[Any, Any]], check_axioms=True,
+                 error_bound: float = 1e-9, workers: Optional[int] = None) -> None:
+        elements = list(table.keys())
+        index = {element: i for i, element in enumerate(elements)}
+        n = len(elements)
+        array = np.full((n, n), n, dtype=index_dtype(n))
+        foreign = {}
+        with instrumentation.timer('construct/dict'):
+            for i, element in enumerate(elements):
+                row = table[element]
+                for j, x in enumerate(elements):
+                    if x not in row:
+                        continue
+                    value = row[x]
+                    k = index.get(value)
+                    if k is None:
+                        # Products outside of the element set are kept aside so the table can
+                        # still be inspected, but they are never elements of the array.
+                        foreign[(i, j)] = value
+                    else:
+                        array[i, j] = k
+        self._setup(elements, array, check_axioms, error_bound, index=index, foreign=foreign,
+                    workers=workers)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, elements: Optional[List[Any]] = None,
+                   check_axioms=True, error_bound: float = 1e-9,
+                   workers: Optional[int] = None, copy: bool = True) -> 'CayleyTable':
+        """
+        Build a Cayley table directly from an n by n array of element indices, skipping the
+        nested dictionary entirely.
+
+        Arguments:
+            - array: square integer array whose entry (i, j) is the index of i * j
+            - elements: labels for the indices 0, ..., n - 1. Defaults to the indices themselves.
+            - check_axioms: Whether to verify the group axioms, see CayleyTable.
+            - error_bound, workers: See CayleyTable.
+            - copy: Whether to copy array. With False, a writeable array which already has the
+                index dtype is owned by the table from then on, and set_product modifies it in
+                place, which saves a copy of freshly generated arrays. Defaults to True.
+        Outputs:
+            - The corresponding CayleyTable
+        """
+        with instrumentation.timer('construct/array'):
+            array = np.asarray(array)
+            if array.ndim != 2 or array.shape[0] != array.shape[1]:
+                raise ValueError('array must be a square matrix.')
+            n = array.shape[0]
+            if elements is None:
+                elements = list(range(n))
+            elif len(elements) != n:
+                raise ValueError('Number of elements does not match the size of the array.')
+            if array.size and (array.min() < 0 or array.max() > n):
+                raise ValueError('array entries must be element indices.')
+            converted = array.astype(index_dtype(n), copy=False)
+            if ((copy or not converted.flags.writeable)
+                    and np.may_share_memory(converted, array)):
+                converted = converted.copy()
+        table = cls.__new__(cls)
+        table._setup(list(elements), converted, check_axioms, error_bound, workers=workers)
+        return table
+
+    def _setup(self, elements: List[Any], array: np.ndarray, check_axioms: Union[bool, str],
+               error_bound: float, index: Optional[Dict[Any, int]] = None,
+               foreign: Optional[Dict[Any, Any]] = None, workers: Optional[int] = None) -> None:
+        self.elements = elements
+        self._index = index if index is not None else {x: i for i, x in enumerate(elements)}
+        self._array = array
+        self._foreign = foreign or {}
+        self._cache = {}
+        self.table = _TableView(self)
         self.check_axioms = check_axioms
+        self.error_bound = error_bound
+        self.workers = workers
+        self.associativity_witness = None
+        if instrumentation._profiles:
+            instrumentation.record_table(array.nbytes)
+        if check_axioms not in (True, False) and check_axioms not in ASSOCIATIVITY_METHODS:
+            raise ValueError(f'check_axioms must be a bool or one of {ASSOCIATIVITY_METHODS}.')
+        if not 0 < error_bound < 1:
+            raise ValueError('error_bound must be strictly between 0 and 1.')
+        if workers is not None and (not isinstance(workers, int) or workers <= 0):
+            raise ValueError('workers must be a positive integer.')
         if any(element == "" or element is None for element in self.elements):
             raise TypeError('Group elements cannot be the empty string or None.')
-        
+        if len(self._index) != len(self.elements):
+            raise ValueError('Group elements must be distinct.')
+
         # Prevent initialization of any Cayley Table that does not correspond to a valid group.
         if self.check_axioms:
-            if not self.is_group():
-                raise ValueError('Input table does not correspond to a valid group.')
+            report = self.validate()
+            if not report:
+                raise ValueError(
+                    f'Input table does not correspond to a valid group. {report.message}')
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Save the table in the binary format described at TABLE_MAGIC: a small header with the
+        labels and the dtype, followed by the raw index matrix. Labels must be strings or
+        numbers. Products outside of the table are stored as the sentinel n and not kept.
+        """
+        with open(path, 'wb') as f:
+            dtype = _write_header(f, self.elements)
+            np.ascontiguousarray(self._array, dtype=dtype).tofile(f)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True, check_axioms=False,
+             error_bound: float = 1e-9, workers: Optional[int] = None) -> 'CayleyTable':
+        """
+        Load a table written by save or by the importers of cayley_tables.table_io.
+
+        Arguments:
+            - path: the table file
+            - mmap: if True, the matrix is opened with numpy.memmap (copy on write), so only
+                the pages touched by queries are read and set_product never modifies the file.
+                Otherwise the matrix is read into memory.
+            - check_axioms: Whether to verify the group axioms, see CayleyTable. Defaults to
+                False, since a saved table is normally one which was validated before it was
+                saved, and checking reads the whole matrix. Pass 'light' for a fast check.
+            - error_bound, workers: See CayleyTable.
+        Outputs:
+            - The corresponding CayleyTable
+        """
+        with open(path, 'rb') as f:
+            elements, dtype, offset = _read_header(f)
+            n = len(elements)
+            if os.fstat(f.fileno()).st_size != offset + n * n * dtype.itemsize:
+                raise ValueError('Cayley table file is truncated.')
+            if mmap and n:
+                array = np.memmap(f, dtype=dtype, mode='c', offset=offset, shape=(n, n))
+            else:
+                f.seek(offset)
+                array = np.fromfile(f, dtype=dtype, count=n * n).reshape(n, n)
+        table = cls.__new__(cls)
+        table._setup(elements, array, check_axioms, error_bound, workers=workers)
+        return table
+
+    @property
+    def array(self) -> np.ndarray:
+        # The operation as an n by n array of element indices. Use set_product to modify it.
+        view = self._array.view()
+        view.flags.writeable = False
+        return view
+
+    def _cached(self, key: str, compute) -> Any:
+        # Return the cached value of key, computing it on first access.
+        if instrumentation._profiles:
+            instrumentation.count_cache(key, key in self._cache)
+            if key not in self._cache:
+                with instrumentation.timer(f'compute/{key}'):
+                    self._cache[key] = compute()
+        elif key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Return the memory held by the table in bytes: 'array' for the index array, 'cache' for
+        the numpy arrays among the cached invariants and 'total' for their sum. Labels and
+        other Python objects are not counted.
+        """
+        cache = sum(value.nbytes for value in self._cache.values() if isinstance(value, np.ndarray))
+        return {'array': self._array.nbytes, 'cache': cache, 'total': self._array.nbytes + cache}
+
+    def set_product(self, element_1: Any, element_2: Any, value: Any) -> None:
+        """
+        Set element_1 * element_2 = value, invalidating every cached invariant. The table is not
+        re-validated.
+        """
+        i, j = self.index_of(element_1), self.index_of(element_2)
+        self._foreign.pop((i, j), None)
+        if value in self._index:
+            self._array[i, j] = self._index[value]
+        else:
+            self._array[i, j] = self.order()
+            self._foreign[(i, j)] = value
+        self._cache.clear()
+        self.associativity_witness = None
 
     def order(self) -> int:
         return len(self.elements)
-    
+
     def elements(self) -> List[any]:
         return self.elements
-    
+
     def table(self) -> Dict[Any, Dict[Any, Any]]:
         return self.table
 
-    def is_group(self) -> bool:
+    def index_of(self, element: Any) -> int:
+        # Return the integer index of element, raising a KeyError if it is not in the table.
+        try:
+            return self._index[element]
+        except (KeyError, TypeError):
+            raise KeyError(f'{element} is not an element of the group.') from None
+
+    def indices_of(self, elements: Iterable[Any]) -> np.ndarray:
+        # Return the indices of elements as an array, raising a KeyError for any non-element.
+        return np.array([self.index_of(element) for element in elements],
+                        dtype=index_dtype(self.order()))
+
+    def op(self, element_1: Any, element_2: Any) -> Any:
+        # Return element_1 * element_2, looked up through the index array.
+        i, j = self.index_of(element_1), self.index_of(element_2)
+        k = int(self._array[i, j])
+        if instrumentation._profiles:
+            instrumentation.count('lookups')
+        if k == self.order():
+            if (i, j) in self._foreign:
+                return self._foreign[(i, j)]
+            raise KeyError(f'{element_1} * {element_2} is not defined.')
+        return self.elements[k]
+
+    def labels_of(self, indices: Any) -> List[Any]:
+        # Return the elements with the given indices, as a (nested) list of the same shape.
+        indices = as_indices(indices, self.order())
+        return self._cached('labels', self._label_array)[indices].tolist()
+
+    def _label_array(self) -> np.ndarray:
+        # The elements as a 1D object array, filled one by one so that tuples stay elements.
+        labels = np.empty(self.order(), dtype=object)
+        for i, element in enumerate(self.elements):
+            labels[i] = element
+        return labels
+
+    def op_many(self, xs: Any, ys: Any) -> np.ndarray:
+        """
+        Return the products xs * ys of arrays of element indices, broadcast against each other,
+        with a single gather from the index array. Indices are validated once per batch.
+        """
+        n = self.order()
+        products = self._array[as_indices(xs, n), as_indices(ys, n)]
+        if instrumentation._profiles:
+            instrumentation.count('lookups', products.size)
+        if not self._is_closed() and (products == n).any():
+            raise KeyError('Some products are not elements of the table.')
+        return products.astype(np.intp)
+
+    def reduce(self, words: Any) -> np.ndarray:
+        """
+        Return the product of each word of element indices, evaluated left to right for all
+        words at once: the running products are multiplied by the next letter of every word in
+        one gather, so a batch of w words of length m costs m gathers of size w.
+
+        Arguments:
+            - words: a 2D array with one word per row, or a sequence of words of any lengths
+        Outputs:
+            - the array of the indices of the products, of length the number of words
+        """
+        identity = self._group_identity()
+        words = as_words(words, self.order(), identity)
+        products = np.full(len(words), identity, dtype=np.intp)
+        if instrumentation._profiles:
+            instrumentation.count('lookups', words.size)
+        for letters in words.T:
+            products = self._array[products, letters].astype(np.intp)
+        return products
+
+    def pow_many(self, xs: Any, ks: Any) -> np.ndarray:
+        """
+        Return the powers x^k of an array of element indices xs, broadcast against the integer
+        exponents ks, by repeated squaring. Exponents are first reduced modulo the order of x,
+        so negative powers are supported and at most log2(n) squarings are needed.
+        """
+        identity = self._group_identity()
+        xs, ks = np.broadcast_arrays(as_indices(xs, self.order()), as_exponents(ks))
+        ks = ks % self.element_orders()[xs].astype(np.int64)
+        powers = np.full(xs.shape, identity, dtype=np.intp)
+        while ks.any():
+            odd = (ks & 1).astype(bool)
+            powers[odd] = self._array[powers[odd], xs[odd]]
+            xs = self._array[xs, xs].astype(np.intp)
+            ks = ks >> 1
+        return powers
+
+    def _group_identity(self) -> int:
+        # Index of the identity, raising a ValueError unless powers and words are well defined.
+        identity = self._identity_index()
+        if identity is None or not self._is_closed() or not self.element_orders().all():
+            raise ValueError('Words and powers are only defined for groups.')
+        return identity
+
+    def is_group(self, method: Optional[str] = None) -> bool:
         """
         Check the four group axioms to determine if the input table corresponds to a group:
             - closure under the operation
             - existence of identity element
             - existence of inverses
             - associativity of binary operation
+
+        Arguments:
+            - method: one of ASSOCIATIVITY_METHODS, defaults to the one chosen at construction
+        """
+        return self.validate(method).is_group
+
+    def validate(self, method: Optional[str] = None) -> 'ValidationReport':
         """
-        return (self._is_closed()
-                and self.get_identity() is not None and not isinstance(self.get_identity(), List)
-                and self._has_inverses()
-                and self._is_associative())
+        Check the group axioms in order of cost and stop at the first failure, returning a
+        ValidationReport which names the failing axiom and a witness:
+            - 'closure': a pair (a, b) whose product is not an element, one array comparison
+            - 'latin_square': every row and column of a group table is a permutation, checked
+                in O(n^2) by scattering the entries into an n by n occupancy matrix. The
+                witness is (a, b, c) with b != c and a * b = a * c (row) or b * a = c * a
+                (column).
+            - 'identity': no left identity, found in the same O(n^2) pass over the rows
+            - 'inverses': an element without a unique two-sided inverse
+            - 'associativity': a triple (a, b, c) with (a * b) * c != a * (b * c)
+        Only a table which passes the first four checks reaches the expensive associativity
+        check.
+
+        Each check is timed as a phase of the active instrumentation profiles, see
+        instrumentation.Profile.
+
+        Arguments:
+            - method: one of ASSOCIATIVITY_METHODS, defaults to the one chosen at construction
+        """
+        with instrumentation.timer('validate'):
+            return self._validate(method)
+
+    def _validate(self, method: Optional[str]) -> 'ValidationReport':
+        n = self.order()
+        T = self._array
+        label = self.elements.__getitem__
+        with instrumentation.timer('validate/closure'):
+            closed = self._is_closed()
+        if not closed:
+            a, b = np.unravel_index(np.argmax(T >= n), T.shape)
+            return ValidationReport('closure', (label(a), label(b)),
+                                    f'Closure fails: {label(a)} * {label(b)} is not an element.')
+        for side, M in (('row', T), ('column', T.T)):
+            with instrumentation.timer('validate/latin_square'):
+                occupied = np.zeros((n, n), dtype=bool)
+                occupied[np.arange(n)[:, None], M] = True
+                full = occupied.all(axis=1)
+            if not full.all():
+                a = int(np.argmin(full))
+                repeated = np.argmax(np.bincount(M[a], minlength=n) > 1)
+                b, c = np.flatnonzero(M[a] == repeated)[:2]
+                product = '{0} * {1} = {0} * {2}' if side == 'row' else '{1} * {0} = {2} * {0}'
+                return ValidationReport(
+                    'latin_square', (label(a), label(b), label(c)),
+                    f'The table is not a Latin square: {product.format(*map(label, (a, b, c)))}.')
+        with instrumentation.timer('validate/identity'):
+            identity = self._identity_index()
+        if identity is None:
+            return ValidationReport('identity', None, 'There is no identity element.')
+        with instrumentation.timer('validate/inverses'):
+            inverses = self.inverse_indices()
+        if (inverses == n).any():
+            a = label(np.argmax(inverses == n))
+            return ValidationReport('inverses', a, f'{a} does not have a unique inverse.')
+        with instrumentation.timer('validate/associativity'):
+            associative = self._is_associative(method)
+        if not associative:
+            return ValidationReport(
+                'associativity', self.associativity_witness,
+                'Associativity fails for (a, b, c) = {}.'.format(self.associativity_witness))
+        return ValidationReport()
 
     def _is_closed(self) -> bool:
         # G must be closed under the binary operation *.
+        return self._cached('closed', lambda: bool((self._array < self.order()).all()))
 
-        for element in self.elements:
-            if not all(self.table[element][x] in self.elements for x in self.elements):
-                return False
-        return True
-    
-    def _has_inverses(self) -> bool:
-        # Every element must have a unique inverse.
-        return (all(self.get_inverse(element) is not None for element in self.elements)
-                and all(not isinstance(self.get_inverse(element), list)
-                        for element in self.elements))
-    
-    def _is_associative(self) -> bool:
+    def _is_associative(self, method: Optional[str] = None) -> bool:
         """
         The group operation must be associative, i.e. (a * b) * c = a * (b * c) for all a, b, c.
         Note that there is no algorithm which in general is better than O(n^3) because it is
         possible for a group to be associative except for a single triple (a, b, c).
+
+        Any counterexample found is recorded in self.associativity_witness.
         """
-        for a in self.elements:
-            for b in self.elements:
-                for c in self.elements:
-                    ab = self.table[a][b]
-                    bc = self.table[b][c]
-                    if self.table[ab][c] != self.table[a][bc]:
-                        return False
-        return True
-    
+        if method is None:
+            method = self.check_axioms if self.check_axioms in ASSOCIATIVITY_METHODS else 'exact'
+        with instrumentation.timer(f'validate/associativity/{method}'):
+            self.associativity_witness = self.find_nonassociative_triple(
+                method, self.error_bound, workers=self.workers)
+        return self.associativity_witness is None
+
+    def find_nonassociative_triple(self, method: str = 'exact', error_bound: float = 1e-9,
+                                   seed: Optional[int] = None,
+                                   workers: Optional[int] = None) -> Optional[Tuple[Any, Any, Any]]:
+        """
+        Search for a triple (a, b, c) with (a * b) * c != a * (b * c).
+
+        Arguments:
+            - method: one of ASSOCIATIVITY_METHODS
+                - 'exact' compares one slice T[T[a], :] against T[a][T] per element a, O(n^3)
+                - 'light' runs Light's test over a generating set S, O(n^2 |S|)
+                - 'random' runs ceil(log(error_bound) / log(7 / 8)) Rajagopalan-Schulman trials,
+                    each O(n^2), and only misses a counterexample with probability error_bound
+                - 'parallel' splits the 'exact' check by rows a across worker processes, and
+                    returns the same triple
+            - error_bound: failure probability of the 'random' method
+            - seed: seed for the random number generator of the 'random' method
+            - workers: number of processes of the 'parallel' method, defaults to the CPU count
+        Outputs:
+            - The offending triple of elements, or None if the operation is associative
+        """
+        if method not in ASSOCIATIVITY_METHODS:
+            raise ValueError(f'method must be one of {ASSOCIATIVITY_METHODS}.')
+        if not self._is_closed():
+            raise ValueError('Associativity is only defined for closed tables.')
+        if method == 'exact':
+            triple = self._exact_counterexample()
+        elif method == 'light':
+            triple = self._light_counterexample()
+        elif method == 'parallel':
+            triple = parallel.find_counterexample(self._array, workers)
+        else:
+            triple = self._random_counterexample(error_bound, seed)
+        if triple is None:
+            return None
+        return tuple(self.elements[i] for i in triple)
+
+    def _exact_counterexample(self) -> Optional[Tuple[int, int, int]]:
+        # Row a of both sides at once: T[T[a], :][b, c] = (ab)c and T[a][T][b, c] = a(bc).
+        T = self._array
+        for a in range(self.order()):
+            mismatches = np.argwhere(T[T[a], :] != T[a][T])
+            if len(mismatches):
+                b, c = mismatches[0]
+                return a, int(b), int(c)
+        return None
+
+    def _light_counterexample(self) -> Optional[Tuple[int, int, int]]:
+        # Light's test: the operation is associative iff (x * g) * y = x * (g * y) for every
+        # generator g of the magma and all x, y.
+        T = self._array
+        for g in self._generating_set():
+            mismatches = np.argwhere(T[T[:, g], :] != T[:, T[g, :]])
+            if len(mismatches):
+                x, y = mismatches[0]
+                return int(x), g, int(y)
+        return None
+
+    def _generating_set(self) -> List[int]:
+        """
+        Greedily pick generators of the table as a magma, i.e. a set S such that every element
+        is a product of elements of S under some bracketing. The closure is grown incrementally
+        so that every pair of generated elements is only multiplied once, O(n^2) in total.
+        """
+        T = self._array
+        generated = np.zeros(self.order(), dtype=bool)
+        generators = []
+        for x in range(self.order()):
+            if generated[x]:
+                continue
+            generators.append(x)
+            generated[x] = True
+            frontier = np.array([x])
+            while len(frontier):
+                members = np.flatnonzero(generated)
+                products = np.concatenate((T[np.ix_(frontier, members)].ravel(),
+                                           T[np.ix_(members, frontier)].ravel()))
+                frontier = np.unique(products[~generated[products]])
+                generated[frontier] = True
+        return generators
+
+    def _random_counterexample(self, error_bound: float,
+                               seed: Optional[int]) -> Optional[Tuple[int, int, int]]:
+        """
+        Rajagopalan-Schulman test. Subsets of G are vectors over GF(2) and the operation extends
+        bilinearly to them. If * is not associative then for random subsets U, V, W the
+        associator (UV)W + U(VW) is nonzero with probability at least 1/8. A nonzero associator
+        is then bisected down to a single offending triple.
+        """
+        rng = np.random.default_rng(seed)
+        trials = math.ceil(math.log(error_bound) / math.log(7 / 8))
+        n = self.order()
+        for _ in range(trials):
+            u, v, w = (rng.integers(0, 2, size=n).astype(bool) for _ in range(3))
+            if self._associator(u, v, w).any():
+                return self._bisect_associator(u, v, w)
+        return None
+
+    def _subset_product(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        # Product of two subsets as GF(2) vectors: x appears iff it is an odd number of products.
+        products = self._array[np.ix_(np.flatnonzero(u), np.flatnonzero(v))]
+        return (np.bincount(products.ravel(), minlength=self.order()) & 1).astype(bool)
+
+    def _associator(self, u: np.ndarray, v: np.ndarray, w: np.ndarray) -> np.ndarray:
+        return (self._subset_product(self._subset_product(u, v), w)
+                ^ self._subset_product(u, self._subset_product(v, w)))
+
+    def _bisect_associator(self, u: np.ndarray, v: np.ndarray,
+                           w: np.ndarray) -> Tuple[int, int, int]:
+        # The associator is linear in each argument, so when it is nonzero on a subset it is
+        # nonzero on one of the two halves of that subset.
+        vectors = [u, v, w]
+        for k in range(3):
+            while vectors[k].sum() > 1:
+                support = np.flatnonzero(vectors[k])
+                half = np.zeros_like(vectors[k])
+                half[support[:len(support) // 2]] = True
+                trial = vectors.copy()
+                trial[k] = half
+                if self._associator(*trial).any():
+                    vectors[k] = half
+                else:
+                    vectors[k] = vectors[k] & ~half
+        return tuple(int(np.flatnonzero(vector)[0]) for vector in vectors)
+
+    def _identity_index(self) -> Optional[int]:
+        # Index of the unique left identity, None if there is none.
+        n = self.order()
+        identities = self._cached(
+            'identities', lambda: np.flatnonzero((self._array == np.arange(n)).all(axis=1)))
+        if len(identities) > 1:
+            raise ValueError("Identity element is not unique.")
+        return int(identities[0]) if len(identities) == 1 else None
+
     def get_identity(self) -> Any:
         """
         Given a table containing the combination under a binary operation of every pair of elements,
@@ -103,15 +712,8 @@ class CayleyTable():
         Outputs:
             - The identity element
         """
-        identities = []
-        for element in self.table:
-            if all(self.table[element][x] == x for x in self.table):
-                identities.append(element)
-        if len(identities) == 1:
-            return identities.pop()
-        elif len(identities) > 1:
-            raise ValueError("Identity element is not unique.")
-        return None
+        identity = self._identity_index()
+        return None if identity is None else self.elements[identity]
 
     def get_inverse(self, element: Any) -> Any:
         """
@@ -123,26 +725,167 @@ class CayleyTable():
         Outputs:
             - The inverse of element
         """
-        if element not in self.elements:
-            raise KeyError(f'{element} is not an element of the group.')
-        inverses = []
-        identity = self.get_identity()
-        for x in self.elements:
-            if self.table[element][x] == identity and self.table[x][element] == identity:
-                inverses.append(x)
-        if len(inverses) == 1:
-            return inverses.pop()
-        else:
-            return None
-        
+        inverse = self.inverse_indices()[self.index_of(element)]
+        return self.elements[inverse] if inverse < self.order() else None
+
+    def inverse_indices(self) -> np.ndarray:
+        """
+        Return the array whose entry i is the index of the inverse of element i, or the order of
+        the table if element i does not have a unique inverse. Computed once in O(n^2).
+        """
+        return self._cached('inverses', self._compute_inverses)
+
+    def _compute_inverses(self) -> np.ndarray:
+        n = self.order()
+        inverses = np.full(n, n, dtype=index_dtype(n))
+        identity = self._identity_index()
+        if identity is None:
+            return inverses
+        is_identity = self._array == identity
+        two_sided = is_identity & is_identity.T
+        unique = two_sided.sum(axis=1) == 1
+        inverses[unique] = two_sided[unique].argmax(axis=1)
+        inverses.flags.writeable = False
+        return inverses
+
     def is_abelian(self) -> bool:
         # Returns true if the table represents an abelian group, and false otherwise.
-        for i in range(len(self.elements)):
-            for j in range(i + 1, len(self.elements)):
-                x, y = self.elements[i], self.elements[j]
-                if self.table[x][y] != self.table[y][x]:
-                    return False
-        return True
+        if 'center' in self._cache:
+            return self._cache['center'].order() == self.order()
+        return self._cached('abelian',
+                            lambda: bool(np.array_equal(self._array, self._array.T)))
+
+    def conjugacy_class_indices(self) -> np.ndarray:
+        """
+        Return the array whose entry i is the smallest index in the conjugacy class of element i.
+        Computed once and cached.
+
+        The conjugacy classes are the orbits of G acting on itself by conjugation, which are also
+        the orbits of any generating set S. All n |S| conjugates h^-1 g h are gathered at once as
+        T[T[inv[h], g], h], and the orbits are merged with a vectorized union-find.
+        """
+        return self._cached('conjugacy_classes', self._compute_conjugacy_classes)
+
+    def _compute_conjugacy_classes(self) -> np.ndarray:
+        T = self._array
+        inverses = self.inverse_indices()
+        if (inverses == self.order()).any():
+            raise ValueError('Table does not have unique inverses.')
+        generators = np.array(self._generating_set(), dtype=np.intp)
+        elements = np.arange(self.order())
+        conjugates = T[T[inverses[generators][:, None], elements[None, :]], generators[:, None]]
+        sources = np.broadcast_to(elements, conjugates.shape).ravel()
+        classes = _merge_orbits(self.order(), sources, conjugates.ravel().astype(np.intp))
+        classes.flags.writeable = False
+        return classes
+
+    def conjugacy_classes(self) -> List[List[Any]]:
+        # The conjugacy classes of G, each as a list of labels, ordered by their first element.
+        return self._blocks(self.conjugacy_class_indices())
+
+    def _blocks(self, labels: np.ndarray) -> List[List[Any]]:
+        # The partition of G with the given block labels, as lists of element labels.
+        order = np.argsort(labels, kind='stable')
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        return [[self.elements[i] for i in block] for block in np.split(order, boundaries)]
+
+    def center(self) -> 'Subgroup':
+        """
+        Return the center Z(G) = {g : g h = h g for all h} as a Subgroup view, computed once and
+        cached. It suffices for g to commute with each element of a generating set S, which is
+        checked for all g at once with O(n |S|) lookups.
+        """
+        def compute() -> 'Subgroup':
+            T = self._array
+            generators = self._generating_set()
+            central = (T[:, generators] == T[generators, :].T).all(axis=1)
+            return Subgroup._from_mask(self, central, np.flatnonzero(central))
+        return self._cached('center', compute)
+
+    def centralizer(self, element: Any) -> 'Subgroup':
+        # The centralizer C(g) = {h : h g = g h} of element as a Subgroup view, cached per element.
+        g = self.index_of(element)
+        centralizers = self._cached('centralizers', dict)
+        if g not in centralizers:
+            commuting = self._array[:, g] == self._array[g, :]
+            centralizers[g] = Subgroup._from_mask(self, commuting, np.flatnonzero(commuting))
+        return centralizers[g]
+
+    def _as_subgroup(self, subgroup: Union['Subgroup', List[Any]]) -> 'Subgroup':
+        # subgroup as a Subgroup view of this table, raising a ValueError if it is not one.
+        if isinstance(subgroup, Subgroup):
+            if subgroup.parent is not self:
+                raise ValueError('subgroup belongs to a different table.')
+            return subgroup
+        return self.subgroup(subgroup)
+
+    def coset_indices(self, subgroup: Union['Subgroup', List[Any]],
+                      side: str = 'left') -> np.ndarray:
+        """
+        Return the array whose entry i is the smallest index in the left coset g H (side 'left')
+        or the right coset H g (side 'right') of element i. Computed once per subgroup and side.
+
+        The left coset g H is the orbit of g under right multiplication by the generators S of
+        H, so all n |S| products g s are gathered at once as columns of the table, and the
+        orbits are merged with a vectorized union-find. Right cosets use the rows instead.
+        """
+        if side not in ('left', 'right'):
+            raise ValueError("side must be 'left' or 'right'.")
+        subgroup = self._as_subgroup(subgroup)
+        cosets = self._cached('cosets', dict)
+        key = (subgroup.bitset(), side)
+        if key not in cosets:
+            generators = np.asarray(subgroup.generators, dtype=np.intp)
+            elements = np.arange(self.order())
+            if side == 'left':
+                products = self._array[elements[:, None], generators[None, :]]
+            else:
+                products = self._array[generators[None, :], elements[:, None]]
+            sources = np.broadcast_to(elements[:, None], products.shape).ravel()
+            labels = _merge_orbits(self.order(), sources, products.ravel().astype(np.intp))
+            labels.flags.writeable = False
+            cosets[key] = labels
+        return cosets[key]
+
+    def left_cosets(self, subgroup: Union['Subgroup', List[Any]]) -> List[List[Any]]:
+        # The left cosets g H, each as a list of labels, ordered by their first element.
+        return self._blocks(self.coset_indices(subgroup, 'left'))
+
+    def right_cosets(self, subgroup: Union['Subgroup', List[Any]]) -> List[List[Any]]:
+        # The right cosets H g, each as a list of labels, ordered by their first element.
+        return self._blocks(self.coset_indices(subgroup, 'right'))
+
+    def is_normal(self, subgroup: Union['Subgroup', List[Any]]) -> bool:
+        """
+        Return True if H is a normal subgroup. It suffices that s^-1 h s lies in H for every
+        generator s of G and every generator h of H, which is checked with O(|S| |S_H|) lookups.
+        The generators S of G are those of self._group_generators.
+        """
+        subgroup = self._as_subgroup(subgroup)
+        T = self._array
+        generators = self._group_generators()
+        inverses = self.inverse_indices().astype(np.intp)
+        h = np.asarray(subgroup.generators, dtype=np.intp)
+        conjugates = T[T[inverses[generators][:, None], h[None, :]], generators[:, None]]
+        return bool(subgroup.mask()[conjugates].all())
+
+    def quotient(self, subgroup: Union['Subgroup', List[Any]]) -> 'CayleyTable':
+        """
+        Return the Cayley table of the quotient group G / N, raising a ValueError unless N is a
+        normal subgroup. Each coset is labelled by its representative, the element of smallest
+        index in it, and (g N)(h N) = (g h) N is read off the products of representatives in a
+        single gather, so the table is built in O(|G / N|^2) without checking the axioms.
+        """
+        subgroup = self._as_subgroup(subgroup)
+        if not self.is_normal(subgroup):
+            raise ValueError('Can only take the quotient by a normal subgroup.')
+        labels = self.coset_indices(subgroup)
+        representatives = np.unique(labels)
+        position = np.zeros(self.order(), dtype=np.intp)
+        position[representatives] = np.arange(len(representatives))
+        array = position[labels[self._array[np.ix_(representatives, representatives)]]]
+        return CayleyTable.from_array(array, [self.elements[i] for i in representatives],
+                                      check_axioms=False, copy=False)
 
     def get_order_of_element(self, element: Any) -> Union[int, float]:
         '''
@@ -150,28 +893,353 @@ class CayleyTable():
         element^m = e, and infinity otherwise. By Lagrange's Theorem, the order of any element
         is at most the size of the group.
         '''
-        if element not in self.elements:
-            raise ValueError('Invalid input: element not in group.')
-        if element == self.get_identity():
-            return 1
-        
-        count = 1
-        current_power = element
-        while count < self.order() + 1:
-            count += 1
-            current_power = self.table[current_power][element]
-            if current_power == self.get_identity():
-                return count
-        return float('inf')
-    
+        try:
+            index = self.index_of(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        order = int(self.element_orders()[index])
+        return order if order else float('inf')
+
     def get_elements_of_order(self, order: int) -> List[Any]:
         # Return a list containing all elements of order order.
-        return set([element for element in self.elements
-                    if self.get_order_of_element(element) == order])
-    
+        return set([self.elements[i] for i in np.flatnonzero(self.element_orders() == order)])
+
+    def element_orders(self) -> np.ndarray:
+        """
+        Return the array whose entry i is the order of element i, with 0 standing for infinite
+        order. Computed once and cached.
+
+        Each element whose order is still unknown has its powers g, g^2, ..., g^m = e walked
+        once, and every power on the way is assigned its order m / gcd(k, m) for free, so the
+        whole group is handled in a single pass. The shortcut relies on powers being well
+        defined, which holds for groups.
+        """
+        return self._cached('orders', self._compute_element_orders)
+
+    def _compute_element_orders(self) -> np.ndarray:
+        n = self.order()
+        T = self._array
+        orders = np.zeros(n, dtype=index_dtype(n))
+        identity = self._identity_index()
+        if identity is None:
+            return orders
+        orders[identity] = 1
+        for g in range(n):
+            if orders[g]:
+                continue
+            powers = [g]
+            while powers[-1] != identity and len(powers) <= n:
+                powers.append(int(T[powers[-1], g]))
+            if powers[-1] != identity:
+                continue
+            m = len(powers)
+            for k, power in enumerate(powers, start=1):
+                if not orders[power]:
+                    orders[power] = m // math.gcd(k, m)
+        orders.flags.writeable = False
+        return orders
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        # Return a dictionary mapping each element order to the number of elements of that order.
+        values, counts = np.unique(self.element_orders(), return_counts=True)
+        return {(int(value) if value else float('inf')): int(count)
+                for value, count in zip(values, counts)}
+
     def is_subgroup(self, subset: List[Any]) -> bool:
         """
         Returns True if the subgroup formed from the elements of subset is a group, else False.
+
+        Assumes that the table itself is a group. Associativity is then inherited and, since the
+        group is finite, a nonempty subset is a subgroup iff it is closed under the operation
+        (the finite one-step subgroup test). This is O(k^2) lookups into the parent's array.
         """
-        potential_subgroup = CayleyTable(dict_utils.restricted(subset, self.table))
-        return potential_subgroup.is_group()
+        indices = np.unique(self.indices_of(subset))
+        return len(indices) > 0 and self._is_closed_subset(indices)
+
+    def _is_closed_subset(self, indices: np.ndarray, block_size: int = 1024) -> bool:
+        # Check the products of indices in blocks of rows, to bound the size of temporaries.
+        # member has an extra False entry for the index n of undefined products.
+        member = np.zeros(self.order() + 1, dtype=bool)
+        member[indices] = True
+        for start in range(0, len(indices), block_size):
+            rows = indices[start:start + block_size]
+            if not member[self._array[np.ix_(rows, indices)]].all():
+                return False
+        return True
+
+    def subgroup(self, subset: List[Any]) -> 'Subgroup':
+        # Return subset as a Subgroup view, raising a ValueError if it is not a subgroup.
+        if not self.is_subgroup(subset):
+            raise ValueError('subset is not a subgroup.')
+        return Subgroup(self, self.indices_of(subset))
+
+    def generated_subgroup(self, generators: List[Any]) -> 'Subgroup':
+        """
+        Return the subgroup generated by generators, as a Subgroup view.
+
+        In a finite group the inverse of g is a power of g, so the subgroup is the closure of
+        {e} under right multiplication by the generators alone. It is built with Dimino's
+        algorithm: the generators are added one at a time, and each intermediate subgroup H is
+        extended to J a whole right coset H x at a time, so only O(|J : H| |S|) products are
+        looked up for the coset representatives when S is the set of generators.
+        """
+        return self._closure(self.indices_of(generators))
+
+    def _group_generators(self) -> np.ndarray:
+        # A small generating set of the group, found once with Dimino's algorithm and cached.
+        return self._cached('group_generators',
+                            lambda: self._closure(np.arange(self.order())).generators)
+
+    def _closure(self, generator_indices: np.ndarray,
+                 subgroup: Optional['Subgroup'] = None) -> 'Subgroup':
+        # Subgroup generated by subgroup (default trivial) and the elements with the given indices.
+        identity = self._identity_index()
+        if identity is None:
+            raise ValueError('Table does not have an identity element.')
+        if subgroup is None:
+            member = np.zeros(self.order(), dtype=bool)
+            member[identity] = True
+            generators = []
+        else:
+            member = subgroup.mask().copy()
+            generators = [int(g) for g in subgroup.generators]
+        for g in generator_indices:
+            g = int(g)
+            if not member[g]:
+                generators.append(g)
+                self._extend_subgroup(member, generators, identity)
+        return Subgroup._from_mask(self, member, np.array(generators, dtype=np.intp))
+
+    def _extend_subgroup(self, member: np.ndarray, generators: List[int], identity: int) -> None:
+        """
+        One step of Dimino's algorithm. member is the mask of a subgroup H and is extended in
+        place to the subgroup J generated by H and generators, as a union of right cosets H x.
+
+        The cosets H g^i of the newest generator g are added first, in one gather. Then the
+        cosets found in the last round are multiplied by the generators in S only, in a
+        breadth first search, so O(|J : H| |S|) products are looked up for the coset
+        representatives, and the cosets themselves are filled in O(|J|).
+        """
+        T = self._array
+        base = np.flatnonzero(member)
+        g = generators[-1]
+        powers = [identity]
+        power = g
+        while not member[power]:
+            powers.append(power)
+            power = int(T[power, g])
+        member[T[np.ix_(base, powers)]] = True
+        frontier = powers
+        multipliers = np.array(generators, dtype=np.intp)
+        while frontier:
+            products = T[np.array(frontier)[:, None], multipliers].ravel()
+            frontier = []
+            for x in products[~member[products]].tolist():
+                if not member[x]:
+                    member[T[base, x]] = True
+                    frontier.append(x)
+
+
+class Subgroup():
+    """
+    A subgroup H of the group given by a Cayley table, stored as the sorted indices of its
+    elements in the parent table. The operation is read from the parent's array, so nothing is
+    copied when subgroups are created.
+
+    Subgroups are hashable: two subgroups of the same table are equal iff they have the same
+    elements, and the hash is that of the bitset of their elements.
+
+    Arguments:
+        - parent (CayleyTable): the table of the ambient group
+        - indices: the indices of the elements of H in parent
+        - generators: indices of a generating set of H, if one is known
+
+    Methods:
+        - order
+        - elements
+        - mask
+        - bitset
+        - op
+        - is_subgroup_of
+        - to_cayley_table
+    """
+    def __init__(self, parent: CayleyTable, indices: np.ndarray,
+                 generators: Optional[np.ndarray] = None) -> None:
+        self.parent = parent
+        self.indices = np.unique(np.asarray(indices, dtype=index_dtype(parent.order())))
+        self.indices.flags.writeable = False
+        self.generators = self.indices if generators is None else np.asarray(generators)
+        self._mask = None
+        self._bitset = None
+
+    @classmethod
+    def _from_mask(cls, parent: CayleyTable, member: np.ndarray,
+                   generators: np.ndarray) -> 'Subgroup':
+        # Build a subgroup from its boolean mask over the parent's indices, taking ownership of it.
+        subgroup = cls.__new__(cls)
+        subgroup.parent = parent
+        subgroup.indices = np.flatnonzero(member).astype(parent._array.dtype)
+        subgroup.indices.flags.writeable = False
+        subgroup.generators = generators
+        member.flags.writeable = False
+        subgroup._mask = member
+        subgroup._bitset = None
+        return subgroup
+
+    def order(self) -> int:
+        return len(self.indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def elements(self) -> List[Any]:
+        # Labels of the elements of H, in the order of the parent table.
+        return [self.parent.elements[i] for i in self.indices]
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __contains__(self, element: Any) -> bool:
+        try:
+            i = self.parent.index_of(element)
+        except KeyError:
+            return False
+        return bool(self.mask()[i])
+
+    def mask(self) -> np.ndarray:
+        # Boolean array over the parent's indices which is True exactly on H.
+        if self._mask is None:
+            self._mask = np.zeros(self.parent.order(), dtype=bool)
+            self._mask[self.indices] = True
+            self._mask.flags.writeable = False
+        return self._mask
+
+    def bitset(self) -> bytes:
+        # The elements of H as a packed bitset over the parent's indices.
+        if self._bitset is None:
+            self._bitset = np.packbits(self.mask()).tobytes()
+        return self._bitset
+
+    def __hash__(self) -> int:
+        return hash(self.bitset())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Subgroup):
+            return NotImplemented
+        return self.parent is other.parent and self.bitset() == other.bitset()
+
+    def __repr__(self) -> str:
+        return f'Subgroup({self.elements})'
+
+    def op(self, element_1: Any, element_2: Any) -> Any:
+        if element_1 not in self or element_2 not in self:
+            raise KeyError('Can only operate on elements of the subgroup.')
+        return self.parent.op(element_1, element_2)
+
+    def is_subgroup_of(self, other: 'Subgroup') -> bool:
+        # Containment of subgroups of the same table.
+        return self.parent is other.parent and bool(other.mask()[self.indices].all())
+
+    def to_cayley_table(self) -> CayleyTable:
+        # Copy H into a standalone CayleyTable, with its elements relabelled by their parent labels.
+        position = np.zeros(self.parent.order(), dtype=np.int64)
+        position[self.indices] = np.arange(self.order())
+        array = position[self.parent.array[np.ix_(self.indices, self.indices)]]
+        return CayleyTable.from_array(array, self.elements, check_axioms=False, copy=False)
+
+
+class ValidationReport():
+    """
+    The outcome of CayleyTable.validate. It is truthy exactly when the table is a group.
+
+    Attributes:
+        - is_group (bool): whether every axiom holds
+        - axiom (str): the first failing axiom, see CayleyTable.validate, or None
+        - witness: elements exhibiting the failure, or None
+        - message (str): human readable description of the failure
+
+    Methods:
+        - to_dict
+    """
+    def __init__(self, axiom: Optional[str] = None, witness: Any = None,
+                 message: str = 'The table is a group.') -> None:
+        self.is_group = axiom is None
+        self.axiom = axiom
+        self.witness = witness
+        self.message = message
+
+    def __bool__(self) -> bool:
+        return self.is_group
+
+    def __repr__(self) -> str:
+        return f'ValidationReport(axiom={self.axiom!r}, witness={self.witness!r})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'is_group': self.is_group, 'axiom': self.axiom, 'witness': self.witness,
+                'message': self.message}
+
+
+class _TableView(Mapping):
+    # Nested dictionary view of a CayleyTable, so that table[x][y] == x * y.
+    def __init__(self, cayley_table: CayleyTable) -> None:
+        self._cayley = cayley_table
+
+    def __getitem__(self, element: Any) -> '_RowView':
+        return _RowView(self._cayley, self._cayley.index_of(element))
+
+    def __iter__(self):
+        return iter(self._cayley.elements)
+
+    def __len__(self) -> int:
+        return self._cayley.order()
+
+    def __contains__(self, element: Any) -> bool:
+        try:
+            return element in self._cayley._index
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        return repr({x: dict(row) for x, row in self.items()})
+
+
+class _RowView(Mapping):
+    # A single row x -> {y: x * y} of a _TableView.
+    def __init__(self, cayley_table: CayleyTable, row: int) -> None:
+        self._cayley = cayley_table
+        self._row = row
+
+    def __getitem__(self, element: Any) -> Any:
+        j = self._cayley.index_of(element)
+        k = int(self._cayley._array[self._row, j])
+        if instrumentation._profiles:
+            instrumentation.count('lookups')
+        if k == self._cayley.order():
+            if (self._row, j) in self._cayley._foreign:
+                return self._cayley._foreign[(self._row, j)]
+            raise KeyError(element)
+        return self._cayley.elements[k]
+
+    def __iter__(self):
+        n = self._cayley.order()
+        defined = self._cayley._array[self._row, :] < n
+        for j, element in enumerate(self._cayley.elements):
+            if defined[j] or (self._row, j) in self._cayley._foreign:
+                yield element
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, element: Any) -> bool:
+        try:
+            self[element]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, element: Any, value: Any) -> None:
+        self._cayley.set_product(self._cayley.elements[self._row], element, value)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -0,0 +1,79 @@
+import numpy as np
+from cayley_tables import instrumentation
+from cayley_tables.cayley import index_dtype
+
+try:
+    import gen_cyclic_cayley as gcc
+except ImportError:
+    # The Rust extension is optional, the tables are then generated with numpy broadcasting.
+    gcc = None
+
+
+def cyclic_array(n_elements: int, use_rust: bool = True) -> np.ndarray:
+    '''
+    Return the index table of the cyclic group C_n, whose entry (i, j) is (i + j) mod n.
+
+    Arguments:
+        - n_elements: the order of the group
+        - use_rust: whether to use the Rust extension when it is available
+
+    Outputs:
+        - an n by n array with dtype index_dtype(n)
+    '''
+    if use_rust and gcc is not None:
+        with instrumentation.timer('generate/cyclic/rust'):
+            return gcc.gen_cyclic_array(n_elements)
+    with instrumentation.timer('generate/cyclic/python'):
+        residues = np.arange(n_elements)
+        return ((residues[:, None] + residues[None, :]) % n_elements).astype(
+            index_dtype(n_elements))
+
+
+def dihedral_array(n_vertices: int, use_rust: bool = True) -> np.ndarray:
+    '''
+    Return the index table of the dihedral group of order 2n, with r^i s^j encoded as i + n j.
+    Products are given by r^a s^b * r^c s^d = r^(a + (-1)^b c) s^(b + d).
+
+    Arguments:
+        - n_vertices: the number of vertices n of the regular n-gon
+        - use_rust: whether to use the Rust extension when it is available
+
+    Outputs:
+        - a 2n by 2n array with dtype index_dtype(2n)
+    '''
+    if use_rust and gcc is not None:
+        with instrumentation.timer('generate/dihedral/rust'):
+            return gcc.gen_dihedral_array(n_vertices)
+    with instrumentation.timer('generate/dihedral/python'):
+        codes = np.arange(2 * n_vertices)
+        rotation, reflection = codes % n_vertices, codes // n_vertices
+        sign = np.where(reflection == 1, -1, 1)
+        product_rotation = (rotation[:, None] + sign[:, None] * rotation[None, :]) % n_vertices
+        product_reflection = (reflection[:, None] + reflection[None, :]) % 2
+        return (product_rotation + n_vertices * product_reflection).astype(
+            index_dtype(2 * n_vertices))
+
+
+def direct_product_array(array_1: np.ndarray, array_2: np.ndarray,
+                         use_rust: bool = True) -> np.ndarray:
+    '''
+    Return the index table of G x H from the index tables of G and H, with the pair (g, h)
+    encoded as g |H| + h.
+
+    Arguments:
+        - array_1, array_2: index tables of G and H
+        - use_rust: whether to use the Rust extension when it is available
+
+    Outputs:
+        - a |G||H| by |G||H| array with dtype index_dtype(|G||H|)
+    '''
+    n_1, n_2 = len(array_1), len(array_2)
+    if use_rust and gcc is not None:
+        with instrumentation.timer('generate/direct_product/rust'):
+            return gcc.gen_direct_product_array(np.ascontiguousarray(array_1, dtype=np.uint32),
+                                                np.ascontiguousarray(array_2, dtype=np.uint32))
+    with instrumentation.timer('generate/direct_product/python'):
+        dtype = index_dtype(n_1 * n_2)
+        product = (array_1.astype(dtype)[:, None, :, None] * dtype.type(n_2)
+                   + array_2.astype(dtype)[None, :, None, :])
+        return product.reshape(n_1 * n_2, n_1 * n_2)
@@ -0,0 +1,148 @@
+import numpy as np
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Union
+from cayley_tables.cayley import CayleyTable, Subgroup, as_indices
+from cayley_tables.isomorphism import _as_table, _extend
+
+
+def _generator_columns(table: CayleyTable) -> np.ndarray:
+    # Columns T[:, s] of the table for the cached generators s of the group, as an n by |S| array.
+    return table._cached('generator_columns', lambda: np.ascontiguousarray(
+        table._array[:, table._group_generators()]).astype(np.intp))
+
+
+def are_homomorphisms(source: Any, target: Any, maps: Any) -> np.ndarray:
+    '''
+    Check a batch of maps from source to target at once. It suffices that
+    phi(x s) = phi(x) phi(s) for every element x and every generator s of the source, since
+    every element is a word in the generators. This needs O(n |S|) lookups per map instead of
+    n^2, and the generators and the columns T[:, s] are computed once per source and cached.
+
+    Arguments:
+        - source, target: Groups or CayleyTables
+        - maps: an m by n array whose rows are the images of the source's indices
+    Outputs:
+        - a boolean array of length m, True for the rows which are homomorphisms
+    '''
+    source, target = _as_table(source), _as_table(target)
+    maps = as_indices(maps, target.order()).reshape(-1, source.order())
+    generators = source._group_generators()
+    columns = _generator_columns(source)
+    # phi(x s) for every map, x and s, against phi(x) phi(s).
+    left = maps[:, columns]
+    right = target._array[maps[:, :, None], maps[:, None, generators]]
+    # The identity has to be checked separately when G is trivial and S is empty.
+    identity = maps[:, source._identity_index()] == target._identity_index()
+    return identity & (left == right).all(axis=(1, 2))
+
+
+class Homomorphism():
+    """
+    A homomorphism phi: G -> H between finite groups, stored as the array of the indices of
+    phi(g) in H over the indices of G, so that applying it to a batch of elements is a single
+    gather.
+
+    It is defined either by the full image array or by a mapping from some elements of G to
+    their images. In the second case the map is extended by closure along right multiplication
+    by the given elements, checking every edge x -> x g against phi(x) phi(g) on the way, so
+    only the generator and relator pairs are verified. The given elements must generate G.
+
+    A full image array is verified with are_homomorphisms, in O(|G| |S|) lookups for a cached
+    generating set S of G. The kernel, the image and the composition of homomorphisms are
+    computed with vectorized gathers, and the kernel and image are cached.
+
+    Attributes:
+        - source (CayleyTable): the domain G
+        - target (CayleyTable): the codomain H
+        - images (numpy.ndarray): images[i] is the index in H of the image of element i of G
+
+    Parameters:
+        - source, target: Groups or CayleyTables
+        - images: an array of indices of H of length |G|, or a dictionary mapping labels of
+            elements of G to labels of their images in H
+        - check (bool): whether to verify an image array, defaults to True
+
+    Methods:
+        - __call__
+        - map_indices
+        - kernel
+        - image
+        - compose
+        - is_injective
+        - is_surjective
+        - is_isomorphism
+        - as_dict
+    """
+    def __init__(self, source: Any, target: Any, images: Union[np.ndarray, Dict[Any, Any]],
+                 check=True) -> None:
+        self.source, self.target = _as_table(source), _as_table(target)
+        if isinstance(images, Mapping):
+            self.images = self._extend_by_closure(images)
+        else:
+            self.images = as_indices(images, self.target.order()).copy()
+            if self.images.shape != (self.source.order(),):
+                raise ValueError('images must have one entry per element of the source.')
+            if check and not are_homomorphisms(self.source, self.target, self.images)[0]:
+                raise ValueError('images do not define a homomorphism.')
+        self.images.flags.writeable = False
+        self._kernel = None
+        self._image = None
+
+    def _extend_by_closure(self, images: Dict[Any, Any]) -> np.ndarray:
+        generators = np.array([self.source.index_of(g) for g in images], dtype=np.intp)
+        values = np.array([self.target.index_of(h) for h in images.values()], dtype=np.intp)
+        if self.source._identity_index() is None or self.target._identity_index() is None:
+            raise ValueError('Homomorphisms are only defined between groups.')
+        phi = _extend(self.source, self.target, generators, values, injective=False)
+        if phi is None:
+            raise ValueError('images do not extend to a homomorphism.')
+        if (phi < 0).any():
+            raise ValueError('The given elements do not generate the source.')
+        return phi.astype(np.intp)
+
+    def __repr__(self) -> str:
+        return f'Homomorphism({self.source.order()} -> {self.target.order()} elements)'
+
+    def __call__(self, element: Any) -> Any:
+        # The image of an element of G, by label.
+        return self.target.elements[self.images[self.source.index_of(element)]]
+
+    def map_indices(self, indices: Any) -> np.ndarray:
+        # The images of an array of indices of G, as indices of H.
+        return self.images[as_indices(indices, self.source.order())]
+
+    def kernel(self) -> Subgroup:
+        # The kernel {g : phi(g) = e}, a normal subgroup of G.
+        if self._kernel is None:
+            member = self.images == self.target._identity_index()
+            self._kernel = Subgroup._from_mask(self.source, member, np.flatnonzero(member))
+        return self._kernel
+
+    def image(self) -> Subgroup:
+        # The image phi(G), a subgroup of H generated by the images of the generators of G.
+        if self._image is None:
+            member = np.zeros(self.target.order(), dtype=bool)
+            member[self.images] = True
+            generators = np.unique(self.images[self.source._group_generators()])
+            self._image = Subgroup._from_mask(self.target, member, generators)
+        return self._image
+
+    def compose(self, other: 'Homomorphism') -> 'Homomorphism':
+        # The composition self o other, applying other first. Needs other.target == self.source.
+        if other.target is not self.source:
+            raise ValueError('Can only compose when the target of other is the source of self.')
+        return Homomorphism(other.source, self.target, self.images[other.images], check=False)
+
+    def is_injective(self) -> bool:
+        return self.kernel().order() == 1
+
+    def is_surjective(self) -> bool:
+        return self.image().order() == self.target.order()
+
+    def is_isomorphism(self) -> bool:
+        return self.is_injective() and self.is_surjective()
+
+    def as_dict(self, elements: Optional[Any] = None) -> Dict[Any, Any]:
+        # The map as a dictionary of labels, restricted to elements if given.
+        elements = self.source.elements if elements is None else elements
+        return {g: self(g) for g in elements}
@@ -0,0 +1,169 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# The profiles currently collecting measurements, innermost last. The instrumented code paths
+# only test this list for emptiness, so instrumentation costs nothing while no profile is active.
+# Profiles are process wide: measurements from every thread go to every active profile.
+_profiles = []
+
+
+class Profile():
+    """
+    Collects measurements from the instrumented code paths of CayleyTable, Group and the table
+    generators while it is active, i.e. inside a with block. Profiles can be nested, and every
+    active profile receives every measurement.
+
+    Timers are inclusive, so a phase which runs inside another one is counted in both:
+        - 'generate/<family>/<implementation>': index array generation, with the Rust extension
+            or with numpy
+        - 'construct/dict': conversion of a nested dictionary to the index array
+        - 'construct/array': conversion and bounds checking of an index array
+        - 'validate' and 'validate/<axiom>': the axiom checks of CayleyTable.validate, with
+            'validate/associativity/<method>' for the associativity check by method
+        - 'compute/<key>': the computation of a cached invariant on a cache miss, e.g.
+            'compute/inverses' or 'compute/orders'
+        - 'group/construct': Group construction from a dictionary or an array
+
+    Counters:
+        - 'lookups': products looked up by op, op_many and reduce
+        - 'cache_hits', 'cache_misses', and 'cache_hits/<key>', 'cache_misses/<key>' per key
+        - 'tables': the number of tables set up
+
+    Memory, in bytes:
+        - 'table_bytes': the largest index array set up
+        - 'tables_bytes': the total size of the index arrays set up
+
+    Attributes:
+        - timers (Dict[str, Dict[str, float]]): the number of 'calls' and total 'seconds' by phase
+        - counters (Dict[str, int]): event counts by name
+        - memory (Dict[str, int]): memory footprints by name
+
+    Parameters:
+        - callback: called with a dictionary {'type', 'name', 'value'} for each timed phase
+            ('timer', in seconds) and memory record ('memory', in bytes) as it happens, e.g.
+            to forward them to a metrics pipeline. Counters are not forwarded one by one.
+
+    Methods:
+        - reset
+        - as_dict
+        - to_json
+    """
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], Any]] = None) -> None:
+        self.callback = callback
+        self.reset()
+
+    def __enter__(self) -> 'Profile':
+        _profiles.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _profiles.remove(self)
+
+    def reset(self) -> None:
+        # Discard every measurement.
+        self.timers = {}
+        self.counters = {}
+        self.memory = {}
+
+    def _add_time(self, name: str, seconds: float) -> None:
+        timer = self.timers.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        timer['calls'] += 1
+        timer['seconds'] += seconds
+        if self.callback is not None:
+            self.callback({'type': 'timer', 'name': name, 'value': seconds})
+
+    def _count(self, name: str, amount: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _add_memory(self, nbytes: int) -> None:
+        self.memory['table_bytes'] = max(self.memory.get('table_bytes', 0), nbytes)
+        self.memory['tables_bytes'] = self.memory.get('tables_bytes', 0) + nbytes
+        if self.callback is not None:
+            self.callback({'type': 'memory', 'name': 'table_bytes', 'value': nbytes})
+
+    def as_dict(self) -> Dict[str, Any]:
+        # The measurements as a JSON serializable dictionary with the keys timers, counters, memory.
+        return {'timers': {name: dict(timer) for name, timer in self.timers.items()},
+                'counters': dict(self.counters), 'memory': dict(self.memory)}
+
+    def to_json(self, **kwargs: Any) -> str:
+        # The measurements as a JSON string, kwargs are passed on to json.dumps.
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def profile(callback: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Profile:
+    '''
+    Return a new Profile, to be used as a context manager:
+
+        with profile() as p:
+            group = CyclicGroup(1000)
+            group.validate()
+        p.as_dict()
+
+    Arguments:
+        - callback: see Profile
+    Outputs:
+        - the Profile
+    '''
+    return Profile(callback)
+
+
+class _Timer():
+    # Times a with block and adds it to every active profile.
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        seconds = time.perf_counter() - self.start
+        for active in _profiles:
+            active._add_time(self.name, seconds)
+
+
+class _NullTimer():
+    # Stands in for _Timer when no profile is active.
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str) -> Any:
+    # A context manager timing the phase name, which does nothing when no profile is active.
+    return _Timer(name) if _profiles else _NULL_TIMER
+
+
+def count(name: str, amount: int = 1) -> None:
+    # Add amount to the counter name of every active profile.
+    for active in _profiles:
+        active._count(name, amount)
+
+
+def count_cache(key: str, hit: bool) -> None:
+    # Count a hit or a miss of the cached invariant key, in total and by key.
+    kind = 'cache_hits' if hit else 'cache_misses'
+    count(kind)
+    count(f'{kind}/{key}')
+
+
+def record_table(nbytes: int) -> None:
+    # Record the memory footprint of a newly set up index array.
+    count('tables')
+    for active in _profiles:
+        active._add_memory(nbytes)
+
+
+def active_profiles() -> List[Profile]:
+    # The active profiles, innermost last.
+    return list(_profiles)
@@ -0,0 +1,138 @@
+import numpy as np
+from typing import Any, Hashable, List, Optional, Tuple
+from cayley_tables.cayley import CayleyTable
+
+
+def _as_table(group: Any) -> CayleyTable:
+    # Accept either a CayleyTable or anything exposing one, such as a Group.
+    return group if isinstance(group, CayleyTable) else group.cayley_table
+
+
+def _element_invariants(table: CayleyTable) -> np.ndarray:
+    # Isomorphism invariants of each element: its order and the size of its conjugacy class.
+    classes = table.conjugacy_class_indices()
+    class_sizes = np.bincount(classes, minlength=table.order())[classes]
+    return np.stack((table.element_orders().astype(np.int64), class_sizes), axis=1)
+
+
+def fingerprint(group: Any) -> Hashable:
+    '''
+    Return a hashable fingerprint of a finite group, computed once and cached on its table.
+    Isomorphic groups have equal fingerprints, so a collection of groups can be bucketed by
+    fingerprint in one pass before running is_isomorphic within each bucket.
+
+    The fingerprint consists of the order, the abelian flag, the order histogram and the number
+    of conjugacy classes of each size, refined by the order of their elements.
+
+    Arguments:
+        - group: a Group or CayleyTable
+    Outputs:
+        - a tuple of the invariants
+    '''
+    table = _as_table(group)
+
+    def compute() -> Tuple:
+        invariants = _element_invariants(table)
+        representatives = np.unique(table.conjugacy_class_indices())
+        profile, counts = np.unique(invariants[representatives], axis=0, return_counts=True)
+        return (table.order(), table.is_abelian(), tuple(table.order_histogram().items()),
+                tuple((int(o), int(s), int(c)) for (o, s), c in zip(profile, counts)))
+    return table._cached('fingerprint', compute)
+
+
+def _generating_sequence(table: CayleyTable) -> List[int]:
+    # Greedily pick a short generating sequence, preferring elements of large order.
+    orders = table.element_orders()
+    subgroup = table._closure([])
+    generators = []
+    for g in np.argsort(-orders.astype(np.int64), kind='stable'):
+        if subgroup.order() == table.order():
+            break
+        if not subgroup.mask()[g]:
+            generators.append(int(g))
+            subgroup = table._closure([g], subgroup)
+    return generators
+
+
+def _extend(table_1: CayleyTable, table_2: CayleyTable, generators: List[int],
+            images: List[int], injective: bool = True) -> Optional[np.ndarray]:
+    """
+    Extend generators -> images to the subgroup K they generate, by a breadth first search
+    along right multiplication by the generators. Every edge x -> x g of K is checked against
+    phi(x) phi(g), so the result is a homomorphism on K exactly when no edge conflicts. Returns
+    the map as an array over the indices of table_1 (-1 outside of K), or None if it is not
+    well defined, or not injective when injective is True.
+    """
+    T_1, T_2 = table_1._array, table_2._array
+    phi = np.full(table_1.order(), -1, dtype=np.int64)
+    identity = table_1._identity_index()
+    phi[identity] = table_2._identity_index()
+    frontier = np.array([identity])
+    while len(frontier):
+        targets = T_1[np.ix_(frontier, generators)].ravel()
+        values = T_2[np.ix_(phi[frontier], images)].ravel()
+        unknown = phi[targets] < 0
+        phi[targets[unknown]] = values[unknown]
+        if (phi[targets] != values).any():
+            return None
+        frontier = np.unique(targets[unknown])
+    reached = phi[phi >= 0]
+    if injective and len(np.unique(reached)) != len(reached):
+        return None
+    return phi
+
+
+def find_isomorphism(group_1: Any, group_2: Any) -> Optional[np.ndarray]:
+    '''
+    Return an isomorphism between two finite groups as an array mapping the index of each
+    element of group_1 to the index of its image in group_2, or None if they are not isomorphic.
+
+    The fingerprints are compared first. Otherwise a short generating sequence g_1, ..., g_k of
+    group_1 is fixed and the images of the g_i are chosen by backtracking, among the elements
+    of group_2 with the same order and conjugacy class size. After each choice the partial map
+    is extended by closure to <g_1, ..., g_i>, and the branch is abandoned as soon as it is not
+    a well defined injective homomorphism, so the search is far smaller than the n! bijections.
+
+    Arguments:
+        - group_1, group_2: Groups or CayleyTables
+    Outputs:
+        - the isomorphism as an index array, or None
+    '''
+    table_1, table_2 = _as_table(group_1), _as_table(group_2)
+    if fingerprint(table_1) != fingerprint(table_2):
+        return None
+    invariants_1, invariants_2 = _element_invariants(table_1), _element_invariants(table_2)
+    generators = _generating_sequence(table_1)
+    candidates = [np.flatnonzero((invariants_2 == invariants_1[g]).all(axis=1)).tolist()
+                  for g in generators]
+
+    def search(images: List[int]) -> Optional[np.ndarray]:
+        i = len(images)
+        for h in candidates[i]:
+            phi = _extend(table_1, table_2, generators[:i + 1], images + [h])
+            if phi is None:
+                continue
+            if i + 1 == len(generators):
+                return phi
+            result = search(images + [h])
+            if result is not None:
+                return result
+        return None
+
+    if not generators:
+        return np.zeros(1, dtype=np.int64)
+    return search([])
+
+
+def is_isomorphic(group_1: Any, group_2: Any) -> bool:
+    '''
+    Return True if the finite groups group_1 and group_2 are isomorphic, see find_isomorphism.
+    Finite abelian groups are determined up to isomorphism by their order histogram, so for
+    those the fingerprints alone decide.
+    '''
+    table_1, table_2 = _as_table(group_1), _as_table(group_2)
+    if fingerprint(table_1) != fingerprint(table_2):
+        return False
+    if table_1.is_abelian():
+        return True
+    return find_isomorphism(table_1, table_2) is not None
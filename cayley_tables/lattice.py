@@ -0,0 +1,271 @@
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Tuple
+from cayley_tables.cayley import CayleyTable, Subgroup
+from utils import nt
+
+
+def iter_subgroups(table: CayleyTable) -> Iterator[Subgroup]:
+    '''
+    Generate every subgroup of the group given by table, each exactly once, in order of
+    discovery, so that the caller can stop early.
+
+    Every subgroup is generated by its elements of prime power order, hence is a join of
+    cyclic subgroups of prime power order. All cyclic subgroups are found first, one per class
+    of generators, and larger subgroups are then grown layer by layer by joining each newly
+    found subgroup H with each cyclic subgroup C of prime power order not contained in H.
+    Subgroups are deduplicated through the bitset of their elements.
+
+    Most joins are never computed, as their result is already known:
+        - H v C = H v h^-1 C h for h in H, so C is taken once per orbit under conjugation by H.
+        - Once L v C = K is found, H v C = K for every H with L <= H <= K. Otherwise K is still
+            contained in H v C when L <= H, and the closure starts from the largest such K.
+        - Once some H v C has prime index over H, it is also H v C' for every C' in it.
+        - The order of H v C is a divisor of |G| which is a multiple of |H| and of the orders
+            of the products h c, and is at least the size of the product sets H C and H <h c>.
+            When the smallest order left is |G|, or is the order of an already known subgroup
+            containing H and C, that subgroup is the join.
+    Containment in the known subgroups is checked against their bitsets, all at once.
+
+    Arguments:
+        - table: Cayley table of a group
+    Outputs:
+        - the subgroups, as Subgroup views into table
+    '''
+    n = table.order()
+    orders = table.element_orders()
+    divisors = np.array(nt.divisors(n))
+    whole = Subgroup(table, np.arange(n))
+    # found maps the bitset of each subgroup found to its position in known, and row k of
+    # bitsets is the bitset of known[k], grown by doubling.
+    found = {}
+    known = []
+    bitsets = np.zeros((16, (n + 7) // 8), dtype=np.uint8)
+
+    def is_new(subgroup: Subgroup) -> bool:
+        nonlocal bitsets
+        if subgroup.bitset() in found:
+            return False
+        found[subgroup.bitset()] = len(known)
+        if len(known) == len(bitsets):
+            bitsets = np.concatenate([bitsets, np.zeros_like(bitsets)])
+        bitsets[len(known)] = np.frombuffer(subgroup.bitset(), dtype=np.uint8)
+        known.append(subgroup)
+        return True
+
+    prime_divisors = set(nt.factorize(n))
+
+    trivial = table._closure([])
+    is_new(trivial)
+    yield trivial
+
+    # cyclic_of[g] is the position of <g> in cyclic.
+    cyclic = [trivial]
+    cyclic_of = np.full(n, -1, dtype=np.intp)
+    cyclic_of[trivial.indices] = 0
+    for g in range(n):
+        if cyclic_of[g] >= 0:
+            continue
+        subgroup = table._closure([g])
+        # Every element of <g> with the same order as g generates <g>.
+        cyclic_of[subgroup.indices[orders[subgroup.indices] == orders[g]]] = len(cyclic)
+        is_new(subgroup)
+        cyclic.append(subgroup)
+        yield subgroup
+    cyclic_masks = np.array([C.mask() for C in cyclic])
+    cyclic_orders = np.array([C.order() for C in cyclic])
+
+    def join(subgroup: Subgroup, other: Subgroup, inside: Subgroup) -> Subgroup:
+        # Dimino's algorithm walks the cosets of the subgroup it starts from, so start from the
+        # largest of H, C, the cyclic subgroups generated by the products h c and a subgroup
+        # known to lie inside H v C.
+        generator = other.generators[0]
+        candidates = np.append(table._array[subgroup.generators, generator], generator)
+        start = cyclic[cyclic_of[candidates[np.argmax(orders[candidates])]]]
+        start = max((start, other, subgroup, inside), key=lambda H: H.order())
+        return table._closure(np.append(subgroup.generators, generator), start)
+
+    def smallest_join_orders(subgroup: Subgroup, generators: np.ndarray) -> np.ndarray:
+        # The smallest order H v <c> can have for each c in generators, by Lagrange's theorem:
+        # a divisor of |G| which is a multiple of |H| and of the orders of the products h c, and
+        # at least the size of the product sets H <c> and H <h c>.
+        h = subgroup.order()
+        products = table._array[subgroup.indices[:, None], generators]
+        product_orders = orders[products]
+        multiples = np.lcm(np.lcm.reduce(product_orders, axis=0), h)
+        largest = cyclic_of[products[np.argmax(product_orders, axis=0),
+                                     np.arange(len(generators))]]
+        lower = np.full(len(generators), h)
+        for cyclic_positions in (cyclic_of[generators], largest):
+            common = cyclic_masks[cyclic_positions][:, subgroup.indices].sum(axis=1)
+            lower = np.maximum(lower, h * cyclic_orders[cyclic_positions] // common)
+        valid = ((divisors % multiples[:, None] == 0) & (divisors >= lower[:, None])
+                 & (divisors > h))
+        return divisors[np.argmax(valid, axis=1)]
+
+    partners = [C for C in cyclic if len(nt.factorize(C.order())) == 1]
+    partner_generators = np.array([C.generators[0] for C in partners], dtype=np.intp)
+    partner_position = {C: i for i, C in enumerate(partners)}
+    partner_masks = cyclic_masks[cyclic_of[partner_generators]]
+    partner_of = np.full(len(cyclic), -1, dtype=np.intp)
+    partner_of[cyclic_of[partner_generators]] = np.arange(len(partners))
+    inverses = table.inverse_indices()
+
+    def conjugacy_orbits(subgroup: Subgroup, candidates: np.ndarray) -> List[List[int]]:
+        # The orbits of the partners under conjugation by H which meet candidates, each
+        # starting with its first candidate, since H v C = H v h^-1 C h for every h in H.
+        conjugations = [partner_of[cyclic_of[table._array[
+            table._array[inverses[h], partner_generators], h]]].tolist()
+            for h in subgroup.generators]
+        seen = np.zeros(len(partners), dtype=bool)
+        orbits = []
+        for i in candidates.tolist():
+            if seen[i]:
+                continue
+            seen[i] = True
+            orbit = [i]
+            for j in orbit:
+                for conjugation in conjugations:
+                    if not seen[conjugation[j]]:
+                        seen[conjugation[j]] = True
+                        orbit.append(conjugation[j])
+            orbits.append(orbit)
+        return orbits
+
+    # The joins L v C = K found are recorded, since then H v C = K for every subgroup H with
+    # L <= H <= K and those joins are skipped. records maps the positions of L and K in known to
+    # a row r, where row r of ends holds them and |K|, and row r of joined_partners marks the
+    # partners C. Both arrays are grown by doubling.
+    records = {}
+    ends = np.zeros((16, 3), dtype=np.intp)
+    joined_partners = np.zeros((16, len(partners)), dtype=bool)
+
+    # Joins of two prime power cyclic subgroups are symmetric, so C_i v C_j is only computed
+    # for i < j, and every other subgroup is joined with all of them.
+    layer = [(subgroup, partner_position.get(subgroup, -1)) for subgroup in cyclic]
+    while layer:
+        next_layer = []
+        for subgroup, position in layer:
+            bits = np.frombuffer(subgroup.bitset(), dtype=np.uint8)
+            below = ~(bitsets[:len(known)] & ~bits).any(axis=1)
+            above = ~(~bitsets[:len(known)] & bits).any(axis=1)
+            # Partners which are already known to give nothing new for this subgroup: those in
+            # H, those containing H, which are already known, and those with a recorded join.
+            skip = subgroup.mask()[partner_generators]
+            skip |= partner_masks[:, subgroup.generators].all(axis=1)
+            below_from = below[ends[:len(records), 0]]
+            recorded = below_from & above[ends[:len(records), 1]]
+            if recorded.any():
+                skip |= joined_partners[np.flatnonzero(recorded)].any(axis=0)
+            rest = np.arange(position + 1, len(partners))
+            orbits = conjugacy_orbits(subgroup, rest[~skip[rest]])
+            if not orbits:
+                continue
+            rest = np.array([orbit[0] for orbit in orbits], dtype=np.intp)
+            join_orders = smallest_join_orders(subgroup, partner_generators[rest]).tolist()
+            # A recorded L v C = K with L <= H gives K <= H v C, the largest such K is kept.
+            inside = [subgroup] * len(rest)
+            if below_from.any():
+                rows = np.flatnonzero(below_from)
+                sizes = joined_partners[np.ix_(rows, rest)] * ends[rows, 2][:, None]
+                for j, r in enumerate(np.argmax(sizes, axis=0).tolist()):
+                    if sizes[r, j]:
+                        inside[j] = known[ends[rows[r], 1]]
+            # The known subgroups containing H, by order.
+            supergroups = {}
+            for k in np.flatnonzero(above).tolist():
+                supergroups.setdefault(known[k].order(), []).append(known[k])
+            for orbit, order, contained in zip(orbits, join_orders, inside):
+                i = orbit[0]
+                if skip[i]:
+                    continue
+                other = partners[i]
+                # H v C is the known subgroup containing H and C of the smallest order it can
+                # have, if there is one, else it is computed.
+                joined = whole if order == n else next(
+                    (K for K in supergroups.get(order, ()) if K.mask()[other.generators[0]]),
+                    None)
+                if joined is None:
+                    joined = join(subgroup, other, contained)
+                if joined.order() // subgroup.order() in prime_divisors:
+                    # H v C is then also H v C' for every C' in it which is not in H.
+                    skip |= joined.mask()[partner_generators]
+                if is_new(joined):
+                    supergroups.setdefault(joined.order(), []).append(joined)
+                    next_layer.append((joined, -1))
+                    yield joined
+                record = (found[subgroup.bitset()], found[joined.bitset()])
+                if record not in records:
+                    if len(records) == len(ends):
+                        ends = np.concatenate([ends, np.zeros_like(ends)])
+                        joined_partners = np.concatenate(
+                            [joined_partners, np.zeros_like(joined_partners)])
+                    ends[len(records)] = record + (joined.order(),)
+                    records[record] = len(records)
+                joined_partners[records[record], orbit] = True
+        layer = next_layer
+
+
+class SubgroupLattice():
+    """
+    The lattice of subgroups of a finite group, ordered by inclusion.
+
+    Arguments:
+        - subgroups (Iterable[Subgroup]): every subgroup of a group, e.g. from iter_subgroups
+
+    Attributes:
+        - subgroups (List[Subgroup]): the subgroups, sorted by order
+        - containment (np.ndarray): boolean matrix whose entry (i, j) is True iff subgroup i is
+            contained in subgroup j
+
+    Methods:
+        - edges
+        - index
+        - subgroups_of_order
+        - maximal_subgroups
+        - minimal_supergroups
+    """
+    def __init__(self, subgroups: Iterable[Subgroup]) -> None:
+        self.subgroups = sorted(subgroups, key=lambda H: (H.order(), H.indices.tolist()))
+        self._positions = {H: i for i, H in enumerate(self.subgroups)}
+        masks = np.array([H.mask() for H in self.subgroups], dtype=np.float32)
+        sizes = masks.sum(axis=1)
+        # |H_i n H_j| = |H_i| iff H_i is contained in H_j.
+        self.containment = (masks @ masks.T) == sizes[:, None]
+        strict = self.containment & ~np.eye(len(self.subgroups), dtype=bool)
+        strict_float = strict.astype(np.float32)
+        self._covers = strict & ~((strict_float @ strict_float) > 0)
+
+    def __len__(self) -> int:
+        return len(self.subgroups)
+
+    def __iter__(self) -> Iterator[Subgroup]:
+        return iter(self.subgroups)
+
+    def __getitem__(self, i: int) -> Subgroup:
+        return self.subgroups[i]
+
+    def index(self, subgroup: Subgroup) -> int:
+        # Position of subgroup in self.subgroups.
+        return self._positions[subgroup]
+
+    def edges(self) -> List[Tuple[int, int]]:
+        # Covering pairs (i, j) of the Hasse diagram: H_i is a maximal subgroup of H_j.
+        return [(int(i), int(j)) for i, j in np.argwhere(self._covers)]
+
+    def subgroups_of_order(self, order: int) -> List[Subgroup]:
+        return [H for H in self.subgroups if H.order() == order]
+
+    def maximal_subgroups(self, subgroup: Subgroup) -> List[Subgroup]:
+        column = self._covers[:, self.index(subgroup)]
+        return [self.subgroups[i] for i in np.flatnonzero(column)]
+
+    def minimal_supergroups(self, subgroup: Subgroup) -> List[Subgroup]:
+        row = self._covers[self.index(subgroup), :]
+        return [self.subgroups[j] for j in np.flatnonzero(row)]
+
+    def order_profile(self) -> Dict[int, int]:
+        # Number of subgroups of each order.
+        profile = {}
+        for H in self.subgroups:
+            profile[H.order()] = profile.get(H.order(), 0) + 1
+        return profile
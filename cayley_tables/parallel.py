@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# State of a worker process, set once by _init_worker.
+_worker = {}
+
+
+def _init_worker(name: str, shape: Tuple[int, int], dtype: str, best) -> None:
+    # Attach to the shared operation matrix without copying it.
+    shm = shared_memory.SharedMemory(name=name)
+    _worker['shm'] = shm
+    _worker['array'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker['best'] = best
+
+
+def _check_rows(bounds: Tuple[int, int]) -> Optional[Tuple[int, int, int]]:
+    """
+    Run the exact check for the rows a in range(*bounds), in order. A row is skipped once some
+    worker has found a counterexample in an earlier row, since it can no longer be the first.
+    """
+    T, best = _worker['array'], _worker['best']
+    for a in range(*bounds):
+        if a >= best.value:
+            return None
+        mismatches = np.argwhere(T[T[a], :] != T[a][T])
+        if len(mismatches):
+            with best.get_lock():
+                best.value = min(best.value, a)
+            b, c = mismatches[0]
+            return a, int(b), int(c)
+    return None
+
+
+def find_counterexample(array: np.ndarray, workers: Optional[int] = None,
+                        rows_per_task: Optional[int] = None) -> Optional[Tuple[int, int, int]]:
+    '''
+    Parallel version of the exact associativity check. The operation matrix is copied once
+    into shared memory and slices of rows a are handed out to a pool of processes, each of
+    which compares T[T[a], :] with T[a][T]. The smallest row with a counterexample found so far
+    is shared between the workers, which then skip every later row, so the returned triple is
+    the same as the one found by the serial check.
+
+    Arguments:
+        - array: n by n matrix of element indices of a closed table
+        - workers: the number of processes, defaults to os.cpu_count()
+        - rows_per_task: the size of the row slices, defaults to about 8 slices per worker
+    Outputs:
+        - the first (a, b, c) with (ab)c != a(bc) in the order of the serial check, or None
+    '''
+    n = len(array)
+    workers = workers or os.cpu_count() or 1
+    if n == 0:
+        return None
+    rows_per_task = rows_per_task or max(1, -(-n // (8 * workers)))
+    shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    try:
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared[:] = array
+        best = multiprocessing.Value('q', n)
+        tasks = [(start, min(start + rows_per_task, n)) for start in range(0, n, rows_per_task)]
+        with multiprocessing.Pool(workers, _init_worker,
+                                  (shm.name, array.shape, array.dtype.str, best)) as pool:
+            found = [triple for triple in pool.imap_unordered(_check_rows, tasks) if triple]
+        del shared
+        return min(found) if found else None
+    finally:
+        shm.close()
+        shm.unlink()
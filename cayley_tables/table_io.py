@@ -0,0 +1,161 @@
+import csv
+import os
+import numpy as np
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+from cayley_tables import cayley
+
+try:
+    import yaml
+except ImportError:
+    # PyYAML is only needed to import YAML tables.
+    yaml = None
+else:
+    # The libyaml event parser is much faster than the pure Python one, when it is available.
+    _YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+Row = Tuple[Any, List[Tuple[Any, Any]]]
+
+
+class _TableWriter():
+    """
+    Writes a table in the binary format of CayleyTable.save one row at a time, through a
+    memory map of the output file, so that only the current row is ever held in memory.
+    Products which are not elements, and rows which are never written, are stored as the
+    sentinel n.
+
+    Parameters:
+        - path: the output file
+        - elements: the labels of the table, in order
+    """
+    def __init__(self, path: Union[str, os.PathLike], elements: List[Any]) -> None:
+        self.elements = elements
+        self._index = {element: i for i, element in enumerate(elements)}
+        if len(self._index) != len(elements):
+            raise ValueError('Group elements must be distinct.')
+        n = len(elements)
+        with open(path, 'wb') as f:
+            dtype = cayley._write_header(f, elements)
+            offset = f.tell()
+            f.truncate(offset + n * n * dtype.itemsize)
+        self._matrix = np.memmap(path, dtype=dtype, mode='r+', offset=offset, shape=(n, n))
+        self._written = np.zeros(n, dtype=bool)
+
+    def write_row(self, label: Any, row: Iterable[Tuple[Any, Any]]) -> None:
+        # Write the products label * column = value given as (column, value) pairs.
+        n = len(self.elements)
+        if label not in self._index:
+            raise ValueError(f'Row {label} is not labelled by an element.')
+        i = self._index[label]
+        if self._written[i]:
+            raise ValueError(f'Row {label} appears twice.')
+        values = np.full(n, n, dtype=self._matrix.dtype)
+        for column, value in row:
+            if column not in self._index:
+                raise ValueError(f'Column {column} is not labelled by an element.')
+            values[self._index[column]] = self._index.get(value, n)
+        self._matrix[i] = values
+        self._written[i] = True
+
+    def close(self) -> None:
+        self._matrix[~self._written] = len(self.elements)
+        self._matrix.flush()
+        del self._matrix
+
+
+def _write_rows(rows: Iterator[Row], path: Union[str, os.PathLike],
+                elements: Optional[List[Any]] = None) -> None:
+    # Stream rows into path, taking the labels from the columns of the first row by default.
+    writer = None
+    for label, row in rows:
+        if writer is None:
+            writer = _TableWriter(path, elements or [column for column, _ in row])
+        writer.write_row(label, row)
+    if writer is None:
+        raise ValueError('Table is empty.')
+    writer.close()
+
+
+def _yaml_rows(stream, name: Optional[str]) -> Iterator[Row]:
+    # Walk the YAML event stream and yield the rows of the table one at a time.
+    loader = yaml.SafeLoader('')
+    events = yaml.parse(stream, Loader=_YamlLoader)
+
+    def scalar(event) -> Any:
+        if not isinstance(event, yaml.ScalarEvent):
+            raise ValueError('Table entries must be scalars.')
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value)
+        construct = loader.yaml_constructors.get(tag, yaml.SafeLoader.construct_scalar)
+        return construct(loader, node)
+
+    def skip(event) -> None:
+        depth = isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent))
+        while depth:
+            event = next(events)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+
+    event = next(events)
+    while isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+        event = next(events)
+    if not isinstance(event, yaml.MappingStartEvent):
+        raise ValueError('Expected a mapping.')
+    if name is not None:
+        while True:
+            event = next(events)
+            if isinstance(event, yaml.MappingEndEvent):
+                raise KeyError(f'No table named {name}.')
+            key, event = scalar(event), next(events)
+            if key == name:
+                break
+            skip(event)
+        if not isinstance(event, yaml.MappingStartEvent):
+            raise ValueError(f'{name} is not a table.')
+    while not isinstance(event := next(events), yaml.MappingEndEvent):
+        label = scalar(event)
+        if not isinstance(next(events), yaml.MappingStartEvent):
+            raise ValueError(f'Row {label} is not a mapping.')
+        row = []
+        while not isinstance(event := next(events), yaml.MappingEndEvent):
+            row.append((scalar(event), scalar(next(events))))
+        yield label, row
+
+
+def import_yaml(source: Union[str, os.PathLike], destination: Union[str, os.PathLike],
+                name: Optional[str] = None) -> None:
+    '''
+    Convert a YAML Cayley table, a nested mapping as in config/valid_tables.yml, to the binary
+    format of CayleyTable.save. The YAML is parsed as a stream of events and written row by
+    row, so the nested dictionary is never built. The labels are the columns of the first row.
+
+    Arguments:
+        - source: the YAML file
+        - destination: the binary file to write
+        - name: the key of the table if the file holds several, otherwise the whole document
+            is the table
+    '''
+    if yaml is None:
+        raise ImportError('PyYAML is required to import YAML tables.')
+    with open(source, 'r') as f:
+        _write_rows(_yaml_rows(f, name), destination)
+
+
+def import_csv(source: Union[str, os.PathLike], destination: Union[str, os.PathLike],
+               delimiter: str = ',') -> None:
+    '''
+    Convert a CSV Cayley table to the binary format of CayleyTable.save, row by row. The first
+    line holds the column labels after an ignored corner cell, and every other line holds a
+    row label followed by its products. Labels are read as strings.
+
+    Arguments:
+        - source: the CSV file
+        - destination: the binary file to write
+        - delimiter: the field delimiter
+    '''
+    with open(source, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        columns = next(reader, [None])[1:]
+        rows = ((line[0], list(zip(columns, line[1:]))) for line in reader if line)
+        _write_rows(rows, destination, columns)
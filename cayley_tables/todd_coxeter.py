@@ -0,0 +1,237 @@
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from cayley_tables.cayley import index_dtype
+
+# Words are sequences of letters: the letter 2 i stands for the generator g_i and 2 i + 1 for its
+# inverse, so that x ^ 1 is the inverse of the letter x and the columns of a coset table are
+# indexed by letters.
+
+
+def invert_word(word: Sequence[int]) -> List[int]:
+    # The inverse of a word, its letters inverted in reverse order.
+    return [x ^ 1 for x in reversed(word)]
+
+
+def reduce_word(word: Sequence[int]) -> List[int]:
+    # Cancel adjacent inverse letters, e.g. g h h^-1 -> g.
+    reduced = []
+    for x in word:
+        if reduced and reduced[-1] == x ^ 1:
+            reduced.pop()
+        else:
+            reduced.append(x)
+    return reduced
+
+
+class _CosetEnumeration():
+    """
+    State of a Hasse-Lunar-Todd-Coxeter (HLT) coset enumeration, with the coset table stored
+    as a flat list of 2m entries per coset, -1 for undefined entries. Cosets are never reused,
+    so at most max_cosets of them are ever defined and the table never holds more than
+    2 m max_cosets entries. Coincident cosets are merged with a union-find forest in which the
+    smaller coset is always the representative, so coset 0 stays the subgroup itself.
+    """
+    def __init__(self, n_generators: int, max_cosets: int,
+                 callback: Optional[Callable[[Dict[str, int]], Any]],
+                 callback_interval: int) -> None:
+        self.width = 2 * n_generators
+        self.max_cosets = max_cosets
+        self.callback = callback
+        self.callback_interval = callback_interval
+        self.table = [-1] * self.width
+        self.parent = [0]
+        self.n_dead = 0
+        self.n_coincidences = 0
+
+    def stats(self) -> Dict[str, int]:
+        # The progress reported to the callback.
+        defined = len(self.parent)
+        return {'defined': defined, 'live': defined - self.n_dead,
+                'coincidences': self.n_coincidences, 'max_cosets': self.max_cosets}
+
+    def define(self, c: int, x: int) -> None:
+        # Define a new coset d = c x, and d x^-1 = c.
+        d = len(self.parent)
+        if d >= self.max_cosets:
+            raise RuntimeError(f'Coset enumeration aborted after defining {d} cosets, '
+                               'increase max_cosets or check the presentation.')
+        self.parent.append(d)
+        self.table.extend([-1] * self.width)
+        self.table[c * self.width + x] = d
+        self.table[d * self.width + (x ^ 1)] = c
+        if self.callback is not None and (d + 1) % self.callback_interval == 0:
+            self.callback(self.stats())
+
+    def find(self, c: int) -> int:
+        # The representative of the class of coincident cosets of c, compressing the path.
+        root = c
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[c] != root:
+            self.parent[c], c = root, self.parent[c]
+        return root
+
+    def _merge(self, a: int, b: int, queue: List[int]) -> None:
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            a, b = min(a, b), max(a, b)
+            self.parent[b] = a
+            self.n_dead += 1
+            queue.append(b)
+
+    def coincidence(self, a: int, b: int) -> None:
+        """
+        Process the coincidence a = b and every coincidence it implies. The row of each dead
+        coset is moved onto its representative, and a conflicting entry is a new coincidence.
+        """
+        self.n_coincidences += 1
+        table, width = self.table, self.width
+        queue = []
+        self._merge(a, b, queue)
+        for dead in queue:
+            for x in range(width):
+                target = table[dead * width + x]
+                if target < 0:
+                    continue
+                table[target * width + (x ^ 1)] = -1
+                c, d = self.find(dead), self.find(target)
+                if table[c * width + x] >= 0:
+                    self._merge(d, table[c * width + x], queue)
+                elif table[d * width + (x ^ 1)] >= 0:
+                    self._merge(c, table[d * width + (x ^ 1)], queue)
+                else:
+                    table[c * width + x] = d
+                    table[d * width + (x ^ 1)] = c
+
+    def scan_and_fill(self, c: int, word: Sequence[int]) -> None:
+        """
+        Trace c w = c from both ends of the word w, defining new cosets until the scan
+        completes. A completed scan which ends in two different cosets is a coincidence, and
+        one which is a single letter short is a deduction.
+        """
+        table, width = self.table, self.width
+        f = b = c
+        i, j = 0, len(word) - 1
+        while True:
+            while i <= j and table[f * width + word[i]] >= 0:
+                f = table[f * width + word[i]]
+                i += 1
+            if i > j:
+                if f != b:
+                    self.coincidence(f, b)
+                return
+            while j >= i and table[b * width + (word[j] ^ 1)] >= 0:
+                b = table[b * width + (word[j] ^ 1)]
+                j -= 1
+            if j < i:
+                self.coincidence(f, b)
+                return
+            if i == j:
+                table[f * width + word[i]] = b
+                table[b * width + (word[i] ^ 1)] = f
+                return
+            self.define(f, word[i])
+
+    def run(self, relators: List[List[int]], subgroup: List[List[int]]) -> None:
+        # HLT: scan the subgroup generators at coset 0, then every relator at every live coset in
+        # order, filling each row of the table before moving on to the next coset.
+        for word in subgroup:
+            self.scan_and_fill(0, word)
+        c = 0
+        while c < len(self.parent):
+            for word in relators:
+                if self.parent[c] != c:
+                    break
+                self.scan_and_fill(c, word)
+            if self.parent[c] == c:
+                for x in range(self.width):
+                    if self.table[c * self.width + x] < 0:
+                        self.define(c, x)
+            c += 1
+
+    def standardized(self) -> np.ndarray:
+        # The table of the live cosets, renumbered in the order of a breadth first search from
+        # coset 0 along the letters, so that the numbering only depends on the group.
+        width = self.width
+        number = {0: 0}
+        order = [0]
+        for c in order:
+            for x in range(width):
+                d = self.table[c * width + x]
+                if d not in number:
+                    number[d] = len(order)
+                    order.append(d)
+        rows = np.array(self.table, dtype=np.int64).reshape(-1, width)[order]
+        renumber = np.zeros(len(self.parent), dtype=np.int64)
+        renumber[order] = np.arange(len(order))
+        return renumber[rows]
+
+
+def enumerate_cosets(n_generators: int, relators: Sequence[Sequence[int]],
+                     subgroup: Sequence[Sequence[int]] = (), max_cosets: int = 1 << 20,
+                     callback: Optional[Callable[[Dict[str, int]], Any]] = None,
+                     callback_interval: int = 4096) -> np.ndarray:
+    '''
+    Enumerate the right cosets of the subgroup H generated by the words subgroup in the group
+    G = <g_1, ..., g_m | relators>, with the Todd-Coxeter algorithm in its HLT form.
+
+    The coset table is built incrementally: a coset is defined whenever a relator cannot be
+    traced through the table, deductions fill single missing entries, and cosets found to be
+    equal are merged. Memory is bounded by max_cosets, the number of cosets defined before the
+    enumeration is aborted, which also stops presentations of infinite or very large groups.
+
+    Arguments:
+        - n_generators: the number m of generators
+        - relators: words which equal the identity in G, see the letter encoding at the top
+        - subgroup: words generating H, defaults to the trivial subgroup
+        - max_cosets: the number of cosets which may be defined, including the ones which
+            are later found to coincide
+        - callback: called every callback_interval definitions with a dictionary of counts
+            {'defined', 'live', 'coincidences', 'max_cosets'}, e.g. to report progress
+        - callback_interval: see callback
+    Outputs:
+        - the coset table as an index by 2m array of coset numbers: entry (c, 2 i) is c g_i
+            and entry (c, 2 i + 1) is c g_i^-1. Coset 0 is H and the cosets are numbered in
+            breadth first order.
+    '''
+    if isinstance(n_generators, bool) or not isinstance(n_generators, int) or n_generators < 0:
+        raise ValueError('n_generators must be a nonnegative integer.')
+    if max_cosets < 1 or callback_interval < 1:
+        raise ValueError('max_cosets and callback_interval must be positive.')
+    words = [reduce_word(word) for word in list(relators) + list(subgroup)]
+    if any(not 0 <= x < 2 * n_generators for word in words for x in word):
+        raise ValueError('Words must consist of letters 0, ..., 2 n_generators - 1.')
+    relators, subgroup = words[:len(relators)], words[len(relators):]
+    enumeration = _CosetEnumeration(n_generators, max_cosets, callback, callback_interval)
+    enumeration.run([word for word in relators if word], [word for word in subgroup if word])
+    table = enumeration.standardized()
+    if callback is not None:
+        callback(enumeration.stats())
+    return table
+
+
+def regular_cayley_array(coset_table: np.ndarray) -> Tuple[np.ndarray, List[List[int]]]:
+    '''
+    Return the Cayley table of G from the coset table of its trivial subgroup, on which G acts
+    regularly, so that coset c is a single element g_c. Every element is reached by a
+    breadth first search from coset 0, the identity, along the letters, which gives a word
+    w_c for each element and g_a g_c = a w_c. The column of c is the column of its parent in
+    the search followed by one letter, so the whole table takes n gathers of length n.
+
+    Arguments:
+        - coset_table: a standardized coset table of the trivial subgroup, see enumerate_cosets
+    Outputs:
+        - the n by n array of indices with dtype index_dtype(n)
+        - the word w_c of each element, of minimal length and first in the order of letters
+    '''
+    n, width = coset_table.shape
+    words = [[]] + [None] * (n - 1)
+    array = np.empty((n, n), dtype=index_dtype(n))
+    array[:, 0] = np.arange(n)
+    for c in range(n):
+        for x in range(width):
+            d = coset_table[c, x]
+            if words[d] is None:
+                words[d] = words[c] + [x]
+                array[:, d] = coset_table[array[:, c], x]
+    return array, words
@@ -0,0 +1,405 @@
+import math
+import numpy
+from typing import Any, Dict, List, Union
+import sys
+from pathlib import Path
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+from cayley_tables import cayley
+from groups.group import Group
+from utils import nt
+
+
+class FiniteField():
+    """
+    The finite field GF(q) with q = p^k elements, realised as GF(p)[x] / (f) for a primitive
+    polynomial f of degree k. The element c_0 + c_1 x + ... + c_{k-1} x^{k-1} is encoded as
+    the integer c_0 + c_1 p + ... + c_{k-1} p^{k-1}, so the elements are 0, ..., q - 1, and for
+    k = 1 they are the residues mod p. The coset of x, the primitive element, generates the
+    multiplicative group.
+
+    Only tables of size O(q) are stored, never a q by q Cayley table:
+        - antilog[i] = x^i, for 0 <= i < 2(q - 1) so that sums of two logarithms need no reduction
+        - log[a], the discrete logarithm of a != 0
+        - zech[n] = log(1 + x^n), Zech's logarithm, -1 where 1 + x^n = 0
+    Multiplication, inverses and powers are then additions of logarithms, and the sum of x^i
+    and x^j is x^(i + zech[j - i]). In characteristic 2 addition is the XOR of the codes, and
+    for k = 1 it is addition mod p. All arithmetic is vectorized over numpy arrays of elements.
+
+    Attributes:
+        - p (int): the characteristic
+        - k (int): the degree over GF(p)
+        - q (int): the number of elements
+        - modulus (List[int]): the coefficients f_0, ..., f_k of the primitive polynomial f
+        - primitive_element (int): the code of x
+
+    Parameters:
+        - p (int): a prime
+        - k (int): a positive integer
+
+    Methods:
+        - add
+        - neg
+        - sub
+        - mul
+        - inv
+        - div
+        - pow
+        - log
+        - additive_group
+        - multiplicative_group
+    """
+    def __init__(self, p: int, k: int = 1) -> None:
+        if isinstance(p, bool) or not isinstance(p, int) or p < 2 or not nt.is_prime(p):
+            raise ValueError('p must be a prime.')
+        if isinstance(k, bool) or not isinstance(k, int) or k <= 0:
+            raise ValueError('k must be a positive integer.')
+        self.p = p
+        self.k = k
+        self.q = p ** k
+        self._dtype = numpy.int32 if 2 * self.q < 2 ** 31 else numpy.int64
+        self.modulus = self._find_primitive_polynomial()
+        self._build_tables()
+        self._additive_group = None
+        self._multiplicative_group = None
+
+    def __repr__(self) -> str:
+        return f'GF({self.p}^{self.k})' if self.k > 1 else f'GF({self.p})'
+
+    def __len__(self) -> int:
+        return self.q
+
+    def __contains__(self, element: Any) -> bool:
+        return (isinstance(element, (int, numpy.integer)) and not isinstance(element, bool)
+                and 0 <= element < self.q)
+
+    def _to_digits(self, code: int) -> List[int]:
+        # Coefficients of the encoded polynomial, lowest degree first.
+        return [code // self.p ** i % self.p for i in range(self.k)]
+
+    def _multiply(self, a: List[int], b: List[int], modulus: List[int]) -> List[int]:
+        # The product of the polynomials a and b modulo the monic polynomial modulus.
+        product = [0] * (2 * self.k - 1)
+        for i, c in enumerate(a):
+            if c:
+                for j, d in enumerate(b):
+                    product[i + j] += c * d
+        for degree in range(2 * self.k - 2, self.k - 1, -1):
+            leading = product[degree] % self.p
+            if leading:
+                for j in range(self.k):
+                    product[degree - self.k + j] -= leading * modulus[j]
+        return [c % self.p for c in product[:self.k]]
+
+    def _power(self, a: List[int], exponent: int, modulus: List[int]) -> List[int]:
+        # a^exponent modulo modulus, by repeated squaring.
+        result = [1] + [0] * (self.k - 1)
+        while exponent:
+            if exponent & 1:
+                result = self._multiply(result, a, modulus)
+            a = self._multiply(a, a, modulus)
+            exponent >>= 1
+        return result
+
+    def _find_primitive_polynomial(self) -> List[int]:
+        """
+        Return the first monic polynomial f of degree k (ordered by the code of f - x^k) for
+        which x has multiplicative order exactly q - 1 modulo f, i.e. x^(q - 1) = 1 and
+        x^((q - 1) / r) != 1 for every prime r dividing q - 1. The ring GF(p)[x] / (f) then
+        has q - 1 units, so f is irreducible and x is a primitive element.
+        """
+        one = [1] + [0] * (self.k - 1)
+        exponents = [(self.q - 1) // r for r in nt.factorize(self.q - 1)] if self.q > 2 else []
+        for code in range(1, self.q):
+            modulus = self._to_digits(code) + [1]
+            # x itself, which is -f_0 when k = 1.
+            x = [0, 1] + [0] * (self.k - 2) if self.k > 1 else [-modulus[0] % self.p]
+            if (self._power(x, self.q - 1, modulus) == one
+                    and all(self._power(x, e, modulus) != one for e in exponents)):
+                return modulus
+        raise ValueError(f'No primitive polynomial found for GF({self.p}^{self.k}).')
+
+    def _build_tables(self) -> None:
+        """
+        Multiplication by x is a permutation of the codes: it shifts the coefficients up and
+        replaces the x^k term by x^k = -(f_0 + ... + f_{k-1} x^{k-1}). Multiplication by x^m
+        is its m-th power, so the powers of x are built by doubling, with
+        antilog[m:2m] = times_x^m[antilog[:m]] and times_x^2m = times_x^m[times_x^m].
+        """
+        n = self.q - 1
+        codes = numpy.arange(self.q, dtype=self._dtype)
+        top, times_x = numpy.divmod(codes, self.p ** (self.k - 1))
+        times_x *= self.p
+        # Only the digits where f has a nonzero coefficient change.
+        for i, c in enumerate(self.modulus[:-1]):
+            if c:
+                digit = times_x // self.p ** i % self.p
+                times_x += ((digit - top * c) % self.p - digit) * self.p ** i
+        self.primitive_element = int(times_x[1])
+        powers, m = numpy.ones(1, dtype=self._dtype), 1
+        while m < n:
+            powers = numpy.concatenate((powers, times_x[powers]))
+            times_x, m = times_x[times_x], 2 * m
+        codes = powers[:n]
+        self._antilog = numpy.concatenate((codes, codes))
+        self._log = numpy.zeros(self.q, dtype=self._dtype)
+        self._log[codes] = numpy.arange(n, dtype=self._dtype)
+        # 1 + x^n, adding the constant coefficients.
+        ones = codes - codes % self.p + (codes + 1) % self.p
+        self._zech = numpy.where(ones == 0, -1, self._log[ones]).astype(self._dtype)
+        for table in (self._antilog, self._log, self._zech):
+            table.flags.writeable = False
+
+    def _check(self, elements: Any) -> numpy.ndarray:
+        # elements as an integer array, raising a ValueError unless they are all in the field.
+        array = numpy.asarray(elements)
+        out_of_range = array.size and (array.min() < 0 or array.max() >= self.q)
+        if array.dtype.kind not in 'iu' or out_of_range:
+            raise ValueError(f'Elements of {self} must be integers in [0, {self.q}).')
+        return array.astype(self._dtype, copy=False)
+
+    def _result(self, elements: Any, result: numpy.ndarray) -> Union[int, numpy.ndarray]:
+        # Return plain integers for scalar inputs.
+        return int(result) if numpy.ndim(elements) == 0 and numpy.ndim(result) == 0 else result
+
+    def log(self, a: Any) -> Union[int, numpy.ndarray]:
+        # The discrete logarithm of a to the base self.primitive_element.
+        a = self._check(a)
+        if (a == 0).any():
+            raise ValueError('0 has no logarithm.')
+        return self._result(a, self._log[a])
+
+    def add(self, a: Any, b: Any) -> Union[int, numpy.ndarray]:
+        a, b = numpy.broadcast_arrays(self._check(a), self._check(b))
+        if self.p == 2:
+            return self._result(a, a ^ b)
+        if self.k == 1:
+            return self._result(a, (a + b) % self.p)
+        log_a, log_b = self._log[a], self._log[b]
+        zech = self._zech[(log_b - log_a) % (self.q - 1)]
+        total = numpy.where(zech < 0, 0, self._antilog[log_a + numpy.maximum(zech, 0)])
+        total = numpy.where(a == 0, b, numpy.where(b == 0, a, total))
+        return self._result(a, total.astype(self._dtype))
+
+    def neg(self, a: Any) -> Union[int, numpy.ndarray]:
+        a = self._check(a)
+        if self.p == 2:
+            return self._result(a, a.copy())
+        if self.k == 1:
+            return self._result(a, (-a) % self.p)
+        # -1 = x^((q - 1) / 2) in odd characteristic.
+        negated = self._antilog[self._log[a] + (self.q - 1) // 2]
+        return self._result(a, numpy.where(a == 0, 0, negated).astype(self._dtype))
+
+    def sub(self, a: Any, b: Any) -> Union[int, numpy.ndarray]:
+        return self.add(a, self.neg(b))
+
+    def mul(self, a: Any, b: Any) -> Union[int, numpy.ndarray]:
+        a, b = numpy.broadcast_arrays(self._check(a), self._check(b))
+        product = self._antilog[self._log[a] + self._log[b]]
+        return self._result(a, numpy.where((a == 0) | (b == 0), 0, product).astype(self._dtype))
+
+    def inv(self, a: Any) -> Union[int, numpy.ndarray]:
+        a = self._check(a)
+        if (a == 0).any():
+            raise ZeroDivisionError('0 has no multiplicative inverse.')
+        return self._result(a, self._antilog[(self.q - 1 - self._log[a]) % (self.q - 1)])
+
+    def div(self, a: Any, b: Any) -> Union[int, numpy.ndarray]:
+        return self.mul(a, self.inv(b))
+
+    def pow(self, a: Any, exponent: Any) -> Union[int, numpy.ndarray]:
+        a, exponent = numpy.broadcast_arrays(self._check(a), numpy.asarray(exponent))
+        if exponent.dtype.kind not in 'iu':
+            raise ValueError('Exponents must be integers.')
+        if ((a == 0) & (exponent < 0)).any():
+            raise ZeroDivisionError('0 has no multiplicative inverse.')
+        reduced = exponent.astype(numpy.int64) % (self.q - 1)
+        power = self._antilog[self._log[a].astype(numpy.int64) * reduced % (self.q - 1)]
+        power = numpy.where(a == 0, numpy.where(exponent == 0, 1, 0), power)
+        return self._result(a, power.astype(self._dtype))
+
+    def additive_group(self) -> 'AdditiveGroup':
+        # (GF(q), +), an elementary abelian p-group.
+        if self._additive_group is None:
+            self._additive_group = AdditiveGroup(self)
+        return self._additive_group
+
+    def multiplicative_group(self) -> 'MultiplicativeGroup':
+        # (GF(q)^*, *), a cyclic group of order q - 1 generated by self.primitive_element.
+        if self._multiplicative_group is None:
+            self._multiplicative_group = MultiplicativeGroup(self)
+        return self._multiplicative_group
+
+
+class AdditiveGroup(Group):
+    """
+    The additive group of a finite field GF(p^k), which is elementary abelian: every nonzero
+    element has order p. Queries are answered with the field arithmetic, and the Cayley table
+    is only built when self.cayley_table is accessed.
+
+    Attributes:
+        - field (FiniteField): the field
+        - cayley_table (CayleyTable): generated on first access
+
+    Parameters:
+        - field (FiniteField): the field
+        - check_axioms: passed on to the Cayley table when it is generated
+    """
+    def __init__(self, field: FiniteField, check_axioms=False) -> None:
+        self.field = field
+        self.check_axioms = check_axioms
+        self.elements = range(field.q)
+        self._cayley_table = None
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            codes = numpy.arange(self.field.q)
+            self._cayley_table = cayley.CayleyTable.from_array(
+                self.field.add(codes[:, None], codes[None, :]), check_axioms=self.check_axioms,
+                copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _check_element(self, element: Any) -> int:
+        if element not in self.field:
+            raise KeyError(f'{element} is not an element of the group.')
+        return int(element)
+
+    def op(self, element_1: Any, element_2: Any) -> int:
+        try:
+            a, b = self._check_element(element_1), self._check_element(element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+        return self.field.add(a, b)
+
+    def order(self) -> int:
+        return self.field.q
+
+    def is_abelian(self) -> bool:
+        return True
+
+    def get_identity(self) -> int:
+        return 0
+
+    def get_inverse(self, element: Any) -> int:
+        return self.field.neg(self._check_element(element))
+
+    def inverse_indices(self) -> numpy.ndarray:
+        return self.field.neg(numpy.arange(self.field.q))
+
+    def get_order_of_element(self, element: Any) -> int:
+        try:
+            element = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        return 1 if element == 0 else self.field.p
+
+    def get_elements_of_order(self, order: int) -> List[Any]:
+        if order == 1:
+            return {0}
+        return set(range(1, self.field.q)) if order == self.field.p else set()
+
+    def element_orders(self) -> numpy.ndarray:
+        orders = numpy.full(self.field.q, self.field.p)
+        orders[0] = 1
+        return orders
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        histogram = {1: 1}
+        if self.field.q > 1:
+            histogram[self.field.p] = self.field.q - 1
+        return histogram
+
+
+class MultiplicativeGroup(Group):
+    """
+    The multiplicative group of a finite field GF(q), cyclic of order q - 1 and generated by
+    the primitive element x. The element x^i has order (q - 1) / gcd(i, q - 1), so every query
+    is answered from the logarithm table, and the Cayley table is only built when
+    self.cayley_table is accessed.
+
+    Attributes:
+        - field (FiniteField): the field
+        - cayley_table (CayleyTable): generated on first access, with elements 1, ..., q - 1
+
+    Parameters:
+        - field (FiniteField): the field
+        - check_axioms: passed on to the Cayley table when it is generated
+    """
+    def __init__(self, field: FiniteField, check_axioms=False) -> None:
+        self.field = field
+        self.check_axioms = check_axioms
+        self.elements = range(1, field.q)
+        self._cayley_table = None
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            codes = numpy.arange(1, self.field.q)
+            products = self.field.mul(codes[:, None], codes[None, :]) - 1
+            self._cayley_table = cayley.CayleyTable.from_array(
+                products, list(self.elements), check_axioms=self.check_axioms, copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _check_element(self, element: Any) -> int:
+        if element not in self.field or element == 0:
+            raise KeyError(f'{element} is not an element of the group.')
+        return int(element)
+
+    def op(self, element_1: Any, element_2: Any) -> int:
+        try:
+            a, b = self._check_element(element_1), self._check_element(element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+        return self.field.mul(a, b)
+
+    def order(self) -> int:
+        return self.field.q - 1
+
+    def is_abelian(self) -> bool:
+        return True
+
+    def get_identity(self) -> int:
+        return 1
+
+    def get_inverse(self, element: Any) -> int:
+        return self.field.inv(self._check_element(element))
+
+    def inverse_indices(self) -> numpy.ndarray:
+        return self.field.inv(numpy.arange(1, self.field.q)) - 1
+
+    def get_order_of_element(self, element: Any) -> int:
+        try:
+            element = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        n = self.field.q - 1
+        return n // math.gcd(self.field.log(element), n)
+
+    def get_elements_of_order(self, order: int) -> List[Any]:
+        # The elements of order d are x^((q - 1) / d k) for k coprime to d, if d divides q - 1.
+        n = self.field.q - 1
+        if not isinstance(order, int) or order <= 0 or n % order:
+            return set()
+        return set(self.field.pow(self.field.primitive_element,
+                                  numpy.array(nt.units(order)) * (n // order)).tolist())
+
+    def element_orders(self) -> numpy.ndarray:
+        n = self.field.q - 1
+        return n // numpy.gcd(self.field.log(numpy.arange(1, self.field.q)), n)
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        # There are exactly phi(d) elements of order d for every divisor d of q - 1.
+        return {d: nt.totient(d) for d in nt.divisors(self.field.q - 1)}
@@ -1,6 +1,6 @@
-from typing import Dict
-import gen_cyclic_cayley as gcc
-from group import Group
+import math
+import numpy
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Union
 import sys
 from pathlib import Path
 
@@ -8,35 +8,345 @@ current_dir = Path(__file__).resolve().parent
 root_dir = current_dir.parent
 sys.path.append(str(root_dir))
 
+from cayley_tables import cayley, generators, lattice
+from groups.group import Group
+from groups.permutation_group import PermutationGroup
+from utils import nt
+
+# A subgroup of C_n given as a CyclicSubgroup, a Subgroup view of its table or a list of elements.
+_Subgroup = Union['CyclicSubgroup', cayley.Subgroup, List[Any]]
+
 
 class CyclicGroup(Group):
     """
-    The finite cylic group C_n of order n is a group which is generated by a single element a. 
+    The finite cylic group C_n of order n is a group which is generated by a single element a.
     Namely, if x is any element of G, then x = a^m for some m < n, with e = a^0. Such a group
     is isomorphic to Z/nZ, so the elements are residue classes modulo n, with addition modulo
-    n as the binary operation. 
+    n as the binary operation.
+
+    Every query is answered arithmetically, e.g. the order of k is n / gcd(k, n), so the Cayley
+    table is never needed. In lazy mode it is only built when self.cayley_table is accessed,
+    which keeps memory O(1) and makes groups such as C_100000 usable. Since a Subgroup is a view
+    of a Cayley table, the methods returning subgroups (generated_subgroup, subgroups, center
+    and centralizer) return a CyclicSubgroup in lazy mode, which has the interface of a
+    Subgroup with arithmetic membership, and subgroup_lattice is only available when the group
+    is not lazy.
 
     Attributes:
         - n_elements (int): the number of elements
-        - cayley_table (Dict[Any, Dict[Any, Any]]): 
-            a nested dictionary representing the Cayley table of the elements of C_n. Does not
-            need to be passed in as a parameter.
+        - cayley_table (CayleyTable):
+            the Cayley table of the elements of C_n, backed directly by the index array from
+            cayley_tables.generators. Does not need to be passed in as a parameter, and in lazy
+            mode is generated on first access.
 
     Parameters:
         - n_elements (int): the number of elements, a positive integer
+        - check_axioms: passed on to the Cayley table when it is generated
+        - lazy (bool): if True, do not generate the Cayley table up front
 
     Methods:
-        - _generate_input_table: 
+        - _generate_input_table:
             generates the Cayley table for the cyclic group with n elements.
+        - is_subgroup
+        - subgroup_of_order
+        - generated_subgroup
+        - subgroups
+        - left_cosets
+        - right_cosets
+        - is_normal
+        - quotient
+        - as_permutation_group
     """
-    def __init__(self, n_elements: int, check_axioms=False) -> Dict[int, Dict[int, int]]:
+    def __init__(self, n_elements: int, check_axioms=False, lazy=False) -> None:
         self.check_axioms = check_axioms
+        if isinstance(n_elements, bool) or not isinstance(n_elements, int):
+            raise TypeError('n_elements must be an integer.')
         if n_elements <= 0:
             raise ValueError('n_elements must be a positive integer.')
         self.n_elements = n_elements
-        cayley_table = self._generate_input_table(n_elements)
-        super().__init__(input_table=cayley_table, check_axioms=check_axioms)
+        self.lazy = lazy
+        self._cayley_table = None
+        if lazy:
+            self.elements = range(n_elements)
+        else:
+            self.elements = self.cayley_table.elements
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            self._cayley_table = cayley.CayleyTable.from_array(
+                self._generate_input_table(self.n_elements), check_axioms=self.check_axioms,
+                copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _generate_input_table(self, n_elements: int) -> numpy.ndarray:
+        # Generates the index array backing the Cayley table of the Cyclic group of order n, C_n.
+        return generators.cyclic_array(n_elements)
+
+    def as_permutation_group(self) -> PermutationGroup:
+        # C_n as a group of rotations of n points, see PermutationGroup.cyclic.
+        return PermutationGroup.cyclic(self.n_elements)
+
+    def _check_element(self, element: Any) -> int:
+        # Elements of C_n are the integers 0, ..., n - 1.
+        if (isinstance(element, bool) or not isinstance(element, (int, numpy.integer))
+                or not 0 <= element < self.n_elements):
+            raise KeyError(f'{element} is not an element of the group.')
+        return int(element)
+
+    def op(self, element_1: Any, element_2: Any) -> int:
+        try:
+            return (self._check_element(element_1)
+                    + self._check_element(element_2)) % self.n_elements
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+
+    def indices_of(self, elements: Iterable[Any]) -> numpy.ndarray:
+        # Elements of C_n are their own indices.
+        if not isinstance(elements, numpy.ndarray):
+            elements = list(elements)
+        try:
+            return cayley.as_indices(elements, self.n_elements)
+        except ValueError:
+            raise KeyError('Can only index elements of the group.') from None
+
+    def labels_of(self, indices: Any) -> List[int]:
+        return cayley.as_indices(indices, self.n_elements).tolist()
+
+    def op_many(self, xs: Any, ys: Any) -> numpy.ndarray:
+        n = self.n_elements
+        return (cayley.as_indices(xs, n) + cayley.as_indices(ys, n)) % n
+
+    def reduce(self, words: Any) -> numpy.ndarray:
+        # The product of a word is the sum of its letters modulo n.
+        n = self.n_elements
+        return cayley.as_words(words, n, 0).sum(axis=1) % n
+
+    def pow_many(self, xs: Any, ks: Any) -> numpy.ndarray:
+        # The k-th power of x is k x modulo n.
+        n = self.n_elements
+        return cayley.as_indices(xs, n) * (cayley.as_exponents(ks) % n) % n
+
+    def order(self) -> int:
+        return self.n_elements
+
+    def is_abelian(self) -> bool:
+        return True
+
+    def get_identity(self) -> int:
+        return 0
+
+    def get_inverse(self, element: Any) -> int:
+        return -self._check_element(element) % self.n_elements
+
+    def inverse_indices(self) -> numpy.ndarray:
+        return -numpy.arange(self.n_elements) % self.n_elements
+
+    def get_order_of_element(self, element: Any) -> int:
+        try:
+            element = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        return self.n_elements // math.gcd(element, self.n_elements)
+
+    def get_elements_of_order(self, order: int) -> List[Any]:
+        # The elements of order d are (n / d) * k for 1 <= k <= d coprime to d, if d divides n.
+        if not isinstance(order, int) or order <= 0 or self.n_elements % order:
+            return set()
+        step = self.n_elements // order
+        return set(step * k % self.n_elements for k in nt.units(order))
+
+    def element_orders(self) -> numpy.ndarray:
+        return self.n_elements // numpy.gcd(numpy.arange(self.n_elements), self.n_elements)
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        # There are exactly phi(d) elements of order d for every divisor d of n.
+        return {d: nt.totient(d) for d in nt.divisors(self.n_elements)}
+
+    def subgroup_of_order(self, order: int) -> List[int]:
+        # C_n has exactly one subgroup of each order d dividing n, generated by n / d.
+        if not isinstance(order, int) or order <= 0 or self.n_elements % order:
+            raise ValueError(f'C_{self.n_elements} has no subgroup of order {order}.')
+        return list(range(0, self.n_elements, self.n_elements // order))
+
+    def is_subgroup(self, subset: List[Any]) -> bool:
+        # A subset is a subgroup iff its size d divides n and it is the multiples of n / d.
+        subset = set(self._check_element(element) for element in subset)
+        if not subset or self.n_elements % len(subset):
+            return False
+        step = self.n_elements // len(subset)
+        return all(element % step == 0 for element in subset)
+
+    def _subgroup_step(self, subgroup: _Subgroup) -> int:
+        # The generator n / |H| of a subgroup H, given as a subgroup or a list of elements.
+        if isinstance(subgroup, CyclicSubgroup) and subgroup.parent is self:
+            return subgroup.step
+        elements = list(subgroup.elements if isinstance(subgroup, cayley.Subgroup) else subgroup)
+        if not self.is_subgroup(elements):
+            raise ValueError('subset is not a subgroup.')
+        return self.n_elements // len(set(elements))
+
+    def generated_subgroup(self, generators: List[Any]
+                           ) -> Union[cayley.Subgroup, 'CyclicSubgroup']:
+        """
+        Return the subgroup generated by generators, which is the one generated by
+        gcd(generators, n). A Subgroup view of the Cayley table, or a CyclicSubgroup in lazy
+        mode.
+        """
+        if not self.lazy:
+            return super().generated_subgroup(generators)
+        return CyclicSubgroup(self, math.gcd(self.n_elements,
+                                             *(self._check_element(g) for g in generators)))
+
+    def subgroups(self) -> Iterator[Union[cayley.Subgroup, 'CyclicSubgroup']]:
+        """
+        Stream every subgroup, exactly one of each order d dividing n. These are Subgroup views
+        of the Cayley table, or CyclicSubgroups in lazy mode, in increasing order.
+        """
+        if not self.lazy:
+            return super().subgroups()
+        return (CyclicSubgroup(self, self.n_elements // d) for d in nt.divisors(self.n_elements))
+
+    def subgroup_lattice(self) -> lattice.SubgroupLattice:
+        if self.lazy:
+            raise ValueError('The subgroup lattice needs the Cayley table, use subgroups() or '
+                             'lazy=False.')
+        return super().subgroup_lattice()
+
+    def center(self) -> Union[cayley.Subgroup, 'CyclicSubgroup']:
+        # C_n is abelian, so it is its own center, a CyclicSubgroup in lazy mode.
+        return super().center() if not self.lazy else CyclicSubgroup(self, 1)
+
+    def centralizer(self, element: Any) -> Union[cayley.Subgroup, 'CyclicSubgroup']:
+        # The whole group, a CyclicSubgroup in lazy mode.
+        if not self.lazy:
+            return super().centralizer(element)
+        self._check_element(element)
+        return CyclicSubgroup(self, 1)
+
+    def conjugacy_classes(self) -> List[List[int]]:
+        return [[x] for x in range(self.n_elements)]
+
+    def left_cosets(self, subgroup: _Subgroup) -> List[List[int]]:
+        # The cosets of the multiples of m are the residue classes modulo m.
+        step = self._subgroup_step(subgroup)
+        return [list(range(a, self.n_elements, step)) for a in range(step)]
+
+    def right_cosets(self, subgroup: _Subgroup) -> List[List[int]]:
+        return self.left_cosets(subgroup)
+
+    def is_normal(self, subgroup: _Subgroup) -> bool:
+        # Every subgroup of an abelian group is normal.
+        self._subgroup_step(subgroup)
+        return True
+
+    def quotient(self, subgroup: _Subgroup) -> 'CyclicGroup':
+        # C_n / <m> is cyclic of order m, the coset a + <m> being labelled by a.
+        return CyclicGroup(self._subgroup_step(subgroup), check_axioms=self.check_axioms,
+                           lazy=self.lazy)
+
+    def fingerprint(self) -> Hashable:
+        # The fingerprint of isomorphism.fingerprint, with phi(d) classes of size 1 of order d.
+        histogram = self.order_histogram()
+        return (self.n_elements, True, tuple(histogram.items()),
+                tuple((d, 1, count) for d, count in histogram.items()))
+
+    def is_isomorphic(self, other: Group) -> bool:
+        # A group is cyclic of order n iff it has order n and an element of order n.
+        return other.order() == self.n_elements and self.n_elements in other.order_histogram()
+
+
+class CyclicSubgroup():
+    """
+    The subgroup <m> of a CyclicGroup C_n, for m dividing n, which is cyclic of order n / m and
+    consists of the multiples of m. It has the interface of cayley.Subgroup, with membership and
+    the operation computed arithmetically, so that subgroups of lazy cyclic groups never need
+    the Cayley table. Its indices are its elements, as in the table of C_n.
+
+    Attributes:
+        - parent (CyclicGroup): the ambient group
+        - step (int): the generator m
+        - indices (numpy.ndarray): the elements 0, m, 2m, ..., generated on first access
+        - generators (numpy.ndarray): [m], or no generators for the trivial subgroup
+
+    Parameters:
+        - parent (CyclicGroup): the ambient group
+        - step (int): a divisor m of n
+
+    Methods:
+        - order
+        - elements
+        - mask
+        - bitset
+        - op
+        - is_subgroup_of
+        - to_cayley_table
+    """
+    def __init__(self, parent: CyclicGroup, step: int) -> None:
+        if parent.n_elements % step:
+            raise ValueError(f'{step} does not divide {parent.n_elements}.')
+        self.parent = parent
+        self.step = step
+        self.generators = numpy.array([step] if step < parent.n_elements else [], dtype=numpy.intp)
+
+    def order(self) -> int:
+        return self.parent.n_elements // self.step
+
+    def __len__(self) -> int:
+        return self.order()
+
+    @property
+    def indices(self) -> numpy.ndarray:
+        return numpy.arange(0, self.parent.n_elements, self.step)
+
+    @property
+    def elements(self) -> List[int]:
+        return list(range(0, self.parent.n_elements, self.step))
+
+    def __iter__(self):
+        return iter(range(0, self.parent.n_elements, self.step))
+
+    def __contains__(self, element: Any) -> bool:
+        try:
+            return self.parent._check_element(element) % self.step == 0
+        except KeyError:
+            return False
+
+    def mask(self) -> numpy.ndarray:
+        # Boolean array over the elements of C_n which is True exactly on the subgroup.
+        mask = numpy.zeros(self.parent.n_elements, dtype=bool)
+        mask[::self.step] = True
+        return mask
+
+    def bitset(self) -> bytes:
+        return numpy.packbits(self.mask()).tobytes()
+
+    def __hash__(self) -> int:
+        return hash((self.parent.n_elements, self.step))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CyclicSubgroup):
+            return NotImplemented
+        return self.parent is other.parent and self.step == other.step
+
+    def __repr__(self) -> str:
+        return f'CyclicSubgroup(<{self.step}> in C_{self.parent.n_elements})'
+
+    def op(self, element_1: Any, element_2: Any) -> int:
+        if element_1 not in self or element_2 not in self:
+            raise KeyError('Can only operate on elements of the subgroup.')
+        return self.parent.op(element_1, element_2)
+
+    def is_subgroup_of(self, other: 'CyclicSubgroup') -> bool:
+        # <m> is contained in <k> iff k divides m.
+        return self.parent is other.parent and self.step % other.step == 0
 
-    def _generate_input_table(self, n_elements: int) -> Dict[int, Dict[int, int]]:
-        # Generates a input table for Cayley table for the Cyclic group of order n, C_n.
-        return gcc.gen_cyclic_table(n_elements)
+    def to_cayley_table(self) -> cayley.CayleyTable:
+        # The Cayley table of the subgroup, labelled by its elements.
+        return cayley.CayleyTable.from_array(
+            self.parent._generate_input_table(self.order()), self.elements, check_axioms=False,
+            copy=False)
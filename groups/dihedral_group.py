@@ -1,5 +1,6 @@
-from typing import Any, Dict, List
-from group import Group
+import math
+import numpy
+from typing import Any, Dict, Iterable, List, Union
 import sys
 from pathlib import Path
 
@@ -7,73 +8,214 @@ current_dir = Path(__file__).resolve().parent
 root_dir = current_dir.parent
 sys.path.append(str(root_dir))
 
-from cayley_tables import cayley
+from cayley_tables import cayley, generators
+from groups.group import Group
+from groups.permutation_group import PermutationGroup
+from utils import nt
+
 
 class DihedralGroup(Group):
     """
-    The Dihedral group of D_n of order n (sometimes also D_{2n}) is the group of symmetries of 
+    The Dihedral group of D_n of order n (sometimes also D_{2n}) is the group of symmetries of
     the regular n-gon, and is a group of order 2n. There are n rotational symmetries and n
     reflection symmetries. If n is odd, then we reflect across the line from each vertex to
-    the midpoint of the opposite side. If n is even, then we reflect across the axes of 
+    the midpoint of the opposite side. If n is even, then we reflect across the axes of
     symmetry connecting opposite vertices, or sides.
 
+    The element r^i s^j (0 <= i < n, 0 <= j < 2) is encoded as the integer i + n j, and
+    products are computed in O(1) from r^a s^b * r^c s^d = r^(a + (-1)^b c) s^(b + d). The
+    usual labels e, r^k and sr^k = s r^k are only used for display, see label and from_label.
+
     Attributes:
         - n_vertices (int): the number of vertices
-        - cayley_table (Dict[Any, Dict[Any, Any]]): 
-            a nested dictionary representing the Cayley table of the elements of C_n. Does not
-            need to be passed in as a parameter.
+        - cayley_table (CayleyTable):
+            the Cayley table of the encoded elements of D_n, generated up front, or on first
+            access in lazy mode. Does not need to be passed in as a parameter.
 
     Parameters:
         - n_vertices (int): the number of vertices, a positive integer
+        - check_axioms: passed on to the Cayley table when it is generated
+        - lazy (bool): if True, do not generate the Cayley table up front
 
     Methods:
-        - _generate_cayley_table: 
-            generates the Cayley table for the cyclic group with n elements.
+        - _generate_cayley_table:
+            generates the index array of the Cayley table of the dihedral group on n vertices.
+        - label
+        - from_label
+        - as_permutation_group
     """
-    def __init__(self, n_vertices: int) -> None:
-        if not isinstance(n_vertices, int):
+    def __init__(self, n_vertices: int, check_axioms=False, lazy=False) -> None:
+        if isinstance(n_vertices, bool) or not isinstance(n_vertices, int):
             raise TypeError('n_elements must be an integer.')
         if n_vertices <= 0:
             raise ValueError('n_elements must be a positive integer.')
 
+        self.check_axioms = check_axioms
         self.n_vertices = n_vertices
-        cayley_table = self._generate_cayley_table(n_vertices)
-        super().__init__(input_table=cayley_table)
-
-    def _generate_cayley_table(self, n_vertices: int) -> Dict[Any, Dict[Any, Any]]:
-        # Generates an input table for the Cayley table of a dihedral group on n vertices.
-        rotations, reflections, table = [], ['s^1'], {}
-        for i in range(1, n_vertices):
-            rotations.append(f'r^{i}')
-            reflections.append(f'sr^{i}')
-        elements = ['e'] + rotations + reflections
-        # First fill in the table values when the first operation is a rotation
-        table['e'] = {}
-        for element in elements:
-            table['e'][element] = element
-
-        for rotation in rotations:
-            table[rotation] = {}
-            for element in elements:
-                if element == 'e':
-                    table[rotation][element] = rotation
-                elif element in rotations:
-                    exponent = (int(rotation[-1]) + int(element[-1])) % n_vertices
-                    table[rotation][element] = 'r^' + str(exponent)
-                elif element in reflections:
-                    exponent = n_vertices - 1 - int(rotation[-1])
-                    if exponent == 0:
-                        table[rotation][element] = 's'
-                    else:
-                        table[rotation][element] = 'rs^' + str(exponent)
-
-
-        for reflection in reflections:
-            table[reflection] = {}
-            for element in elements:
-                if element == 'e':
-                    table[reflection][element] = reflection
-                elif element in rotations:
-                    pass
-                elif element in reflections:
-                    pass
+        self.lazy = lazy
+        self._cayley_table = None
+        if lazy:
+            self.elements = range(2 * n_vertices)
+        else:
+            self.elements = self.cayley_table.elements
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            self._cayley_table = cayley.CayleyTable.from_array(
+                self._generate_cayley_table(self.n_vertices), check_axioms=self.check_axioms,
+                copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _generate_cayley_table(self, n_vertices: int) -> numpy.ndarray:
+        # Generates the index array of the Cayley table of a dihedral group on n vertices.
+        return generators.dihedral_array(n_vertices)
+
+    def as_permutation_group(self) -> PermutationGroup:
+        # D_n acting on the vertices of the n-gon, see PermutationGroup.dihedral.
+        return PermutationGroup.dihedral(self.n_vertices)
+
+    def _check_element(self, element: Any) -> int:
+        # Elements of D_n are the codes 0, ..., 2n - 1.
+        if (isinstance(element, bool) or not isinstance(element, (int, numpy.integer))
+                or not 0 <= element < 2 * self.n_vertices):
+            raise KeyError(f'{element} is not an element of the group.')
+        return int(element)
+
+    def label(self, element: Any) -> str:
+        # Return the display label e, r^k or sr^k of an encoded element.
+        n = self.n_vertices
+        element = self._check_element(element)
+        rotation, reflection = element % n, element // n
+        if reflection:
+            # r^i s = s r^(-i)
+            k = -rotation % n
+            return 's' if k == 0 else ('sr' if k == 1 else f'sr^{k}')
+        if rotation == 0:
+            return 'e'
+        return 'r' if rotation == 1 else f'r^{rotation}'
+
+    def from_label(self, label: str) -> int:
+        # Return the code of the element with display label e, r, r^k, s, sr or sr^k.
+        n = self.n_vertices
+        if label == 'e':
+            return 0
+        reflection = label.startswith('s')
+        rotation_label = label[1:] if reflection else label
+        if rotation_label == '':
+            k = 0
+        elif rotation_label == 'r':
+            k = 1
+        elif rotation_label.startswith('r^') and rotation_label[2:].isdigit():
+            k = int(rotation_label[2:])
+        else:
+            raise KeyError(f'{label} is not an element of the group.')
+        if k >= n:
+            raise KeyError(f'{label} is not an element of the group.')
+        return (-k % n) + n if reflection else k
+
+    def labels(self) -> List[str]:
+        # Display labels of the elements, in order of their codes.
+        return [self.label(element) for element in range(2 * self.n_vertices)]
+
+    def op(self, element_1: Any, element_2: Any) -> int:
+        n = self.n_vertices
+        try:
+            a, b = self._check_element(element_1), self._check_element(element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+        rotation_1, reflection_1 = a % n, a // n
+        rotation_2, reflection_2 = b % n, b // n
+        sign = -1 if reflection_1 else 1
+        return (rotation_1 + sign * rotation_2) % n + n * ((reflection_1 + reflection_2) % 2)
+
+    def indices_of(self, elements: Iterable[Any]) -> numpy.ndarray:
+        # Elements of D_n are their own indices, the codes 0, ..., 2n - 1.
+        if not isinstance(elements, numpy.ndarray):
+            elements = list(elements)
+        try:
+            return cayley.as_indices(elements, 2 * self.n_vertices)
+        except ValueError:
+            raise KeyError('Can only index elements of the group.') from None
+
+    def labels_of(self, indices: Any) -> List[int]:
+        return cayley.as_indices(indices, 2 * self.n_vertices).tolist()
+
+    def op_many(self, xs: Any, ys: Any) -> numpy.ndarray:
+        # r^a s^b * r^c s^d = r^(a + (-1)^b c) s^(b + d), vectorized.
+        n = self.n_vertices
+        xs, ys = cayley.as_indices(xs, 2 * n), cayley.as_indices(ys, 2 * n)
+        reflection_1, reflection_2 = xs // n, ys // n
+        sign = 1 - 2 * reflection_1
+        return (xs + sign * ys) % n + n * ((reflection_1 + reflection_2) % 2)
+
+    def reduce(self, words: Any) -> numpy.ndarray:
+        """
+        The product of the word r^(a_1) s^(b_1) ... r^(a_m) s^(b_m) is r^a s^b with
+        b = b_1 + ... + b_m and a = sum (-1)^(b_1 + ... + b_(i - 1)) a_i, so every word is
+        reduced at once with a cumulative sum of the reflection parts.
+        """
+        n = self.n_vertices
+        words = cayley.as_words(words, 2 * n, 0)
+        reflections = words // n
+        parities = (numpy.cumsum(reflections, axis=1) - reflections) % 2
+        rotation = ((1 - 2 * parities) * (words % n)).sum(axis=1) % n
+        return rotation + n * (reflections.sum(axis=1) % 2)
+
+    def pow_many(self, xs: Any, ks: Any) -> numpy.ndarray:
+        # (r^a)^k = r^(a k), and reflections are involutions.
+        n = self.n_vertices
+        xs, ks = numpy.broadcast_arrays(cayley.as_indices(xs, 2 * n), cayley.as_exponents(ks))
+        rotations = xs * (ks % n) % n
+        return numpy.where(xs < n, rotations, numpy.where(ks % 2 == 1, xs, 0))
+
+    def order(self) -> int:
+        return 2 * self.n_vertices
+
+    def is_abelian(self) -> bool:
+        # D_1 and D_2 are abelian, every larger dihedral group is not.
+        return self.n_vertices <= 2
+
+    def get_identity(self) -> int:
+        return 0
+
+    def get_inverse(self, element: Any) -> int:
+        # Reflections are involutions, rotations r^i have inverse r^(-i).
+        element = self._check_element(element)
+        return element if element >= self.n_vertices else -element % self.n_vertices
+
+    def inverse_indices(self) -> numpy.ndarray:
+        n = self.n_vertices
+        return numpy.concatenate((-numpy.arange(n) % n, numpy.arange(n, 2 * n)))
+
+    def get_order_of_element(self, element: Any) -> int:
+        try:
+            element = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        if element >= self.n_vertices:
+            return 2
+        return self.n_vertices // math.gcd(element, self.n_vertices)
+
+    def get_elements_of_order(self, order: int) -> List[Any]:
+        # Rotations of order d are r^((n / d) k) with k coprime to d, and reflections have order 2.
+        n = self.n_vertices
+        elements = set()
+        if isinstance(order, int) and order > 0 and n % order == 0:
+            elements.update(n // order * k % n for k in nt.units(order))
+        if order == 2:
+            elements.update(range(n, 2 * n))
+        return elements
+
+    def element_orders(self) -> numpy.ndarray:
+        n = self.n_vertices
+        return numpy.concatenate((n // numpy.gcd(numpy.arange(n), n), numpy.full(n, 2)))
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        histogram = {d: nt.totient(d) for d in nt.divisors(self.n_vertices)}
+        histogram[2] = histogram.get(2, 0) + self.n_vertices
+        return dict(sorted(histogram.items()))
@@ -0,0 +1,179 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import sys
+from pathlib import Path
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+from cayley_tables import cayley, todd_coxeter
+from groups.group import Group
+
+Word = Union[str, Sequence[Union[str, Tuple[str, int]]]]
+
+_TOKEN = re.compile(r'\s*([A-Za-z_][A-Za-z0-9_]*|-?\d+|[()^*=])')
+
+
+class FinitelyPresentedGroup(Group):
+    """
+    The finite group G = <g_1, ..., g_m | r_1, ..., r_k> given by generators and relators,
+    e.g. the dihedral group <r, s | r^n, s^2, srs = r^-1>. Its Cayley table is built by
+    Todd-Coxeter coset enumeration of the trivial subgroup, see todd_coxeter.enumerate_cosets,
+    after which G acts regularly on the cosets and the table follows in n gathers. A table
+    built this way is a group by construction, so the axioms are never checked.
+
+    Words are strings of generators separated by spaces or *, with integer powers g^k
+    (negative for inverses), parenthesized subwords (g h)^k, and 1 for the empty word. When
+    every generator is a single character, generators may also be juxtaposed as in srs. A
+    relation u = v stands for the relator u v^-1. A word may also be given as a sequence of
+    generators or of (generator, exponent) pairs.
+
+    Elements are labelled by their shortest words, the first one in the order of the
+    generators (g_1, g_1^-1, g_2, ...), written in the same syntax, with e for the identity.
+
+    Attributes:
+        - generators (List[str]): the names of the generators
+        - relators (List[List[int]]): the relators, as words of letters, see todd_coxeter
+        - coset_table (numpy.ndarray): the coset table of the trivial subgroup, whose entry
+            (i, 2 j) is the index of the element i g_j and (i, 2 j + 1) the one of i g_j^-1
+        - words (List[List[int]]): the word of each element, as letters
+        - cayley_table (CayleyTable): the Cayley table labelled by the words
+
+    Parameters:
+        - generators: the names of the generators, identifiers other than e
+        - relators: words which equal the identity, or relations u = v
+        - max_cosets: the number of cosets the enumeration may define before it is aborted
+            with a RuntimeError, which bounds its memory use
+        - callback, callback_interval: progress reporting, see todd_coxeter.enumerate_cosets
+
+    Methods:
+        - parse_word
+        - evaluate
+        - word_of
+    """
+    def __init__(self, generators: Sequence[str], relators: Sequence[Word],
+                 max_cosets: int = 1 << 20,
+                 callback: Optional[Callable[[Dict[str, int]], Any]] = None,
+                 callback_interval: int = 4096) -> None:
+        self.generators = list(generators)
+        if len(set(self.generators)) != len(self.generators):
+            raise ValueError('Generators must be distinct.')
+        if any(not isinstance(g, str) or not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', g)
+               or g == 'e' for g in self.generators):
+            raise ValueError('Generators must be identifiers other than e.')
+        self._letters = {g: 2 * i for i, g in enumerate(self.generators)}
+        self.relators = [self.parse_word(relator) for relator in relators]
+        self.check_axioms = False
+        self.coset_table = todd_coxeter.enumerate_cosets(
+            len(self.generators), self.relators, max_cosets=max_cosets, callback=callback,
+            callback_interval=callback_interval)
+        array, self.words = todd_coxeter.regular_cayley_array(self.coset_table)
+        self.cayley_table = cayley.CayleyTable.from_array(
+            array, [self._format(word) for word in self.words], check_axioms=False, copy=False)
+        self.elements = self.cayley_table.elements
+
+    def __repr__(self) -> str:
+        relators = ', '.join(self._format(relator) for relator in self.relators)
+        return f'<{", ".join(self.generators)} | {relators}>'
+
+    def parse_word(self, word: Word) -> List[int]:
+        # The letters of a word in the generators, see the class docstring for the syntax.
+        if not isinstance(word, str):
+            letters = []
+            for item in word:
+                generator, exponent = (item, 1) if isinstance(item, str) else item
+                letters += self._power([self._letter(generator)], exponent)
+            return todd_coxeter.reduce_word(letters)
+        tokens = _TOKEN.findall(word)
+        if ''.join(tokens) != re.sub(r'\s+', '', word):
+            raise ValueError(f'Invalid word {word!r}.')
+        if tokens.count('=') > 1:
+            raise ValueError(f'Invalid relation {word!r}.')
+        if '=' in tokens:
+            split = tokens.index('=')
+            left, right = tokens[:split], tokens[split + 1:]
+            letters = (self._parse_tokens(left, word)
+                       + todd_coxeter.invert_word(self._parse_tokens(right, word)))
+        else:
+            letters = self._parse_tokens(tokens, word)
+        return todd_coxeter.reduce_word(letters)
+
+    def _letter(self, generator: str) -> int:
+        if generator not in self._letters:
+            raise ValueError(f'{generator} is not a generator.')
+        return self._letters[generator]
+
+    @staticmethod
+    def _power(letters: List[int], exponent: int) -> List[int]:
+        if exponent < 0:
+            return todd_coxeter.invert_word(letters) * -exponent
+        return letters * exponent
+
+    def _parse_tokens(self, tokens: List[str], word: str) -> List[int]:
+        # Parse a product of factors, each a generator, 1 or a parenthesized word, to a power.
+        stack = [[]]
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            if token == '*':
+                continue
+            if token == '(':
+                stack.append([])
+                continue
+            if token == ')':
+                if len(stack) == 1:
+                    raise ValueError(f'Unbalanced parentheses in {word!r}.')
+                factors = [stack.pop()]
+            elif token == '1':
+                factors = [[]]
+            elif token in self._letters:
+                factors = [[self._letters[token]]]
+            elif token[0].isalpha() or token[0] == '_':
+                # Juxtaposed single character generators, an exponent applies to the last one.
+                factors = [[self._letter(character)] for character in token]
+            else:
+                raise ValueError(f'Invalid word {word!r}.')
+            if position < len(tokens) and tokens[position] == '^':
+                if position + 1 == len(tokens) or not re.fullmatch(r'-?\d+', tokens[position + 1]):
+                    raise ValueError(f'Invalid exponent in {word!r}.')
+                factors[-1] = self._power(factors[-1], int(tokens[position + 1]))
+                position += 2
+            for factor in factors:
+                stack[-1] += factor
+        if len(stack) != 1:
+            raise ValueError(f'Unbalanced parentheses in {word!r}.')
+        return stack[0]
+
+    def _format(self, letters: List[int]) -> str:
+        # Write a word with powers of consecutive equal letters, e.g. [r, r, s] -> r^2s.
+        if not letters:
+            return 'e'
+        separator = '' if all(len(g) == 1 for g in self.generators) else '*'
+        factors = []
+        start = 0
+        for end in range(1, len(letters) + 1):
+            if end < len(letters) and letters[end] == letters[start]:
+                continue
+            exponent = (end - start) * (-1 if letters[start] % 2 else 1)
+            name = self.generators[letters[start] // 2]
+            factors.append(name if exponent == 1 else f'{name}^{exponent}')
+            start = end
+        return separator.join(factors)
+
+    def _evaluate_index(self, word: Word) -> int:
+        # Trace a word from the identity through the coset table.
+        index = 0
+        for letter in self.parse_word(word):
+            index = int(self.coset_table[index, letter])
+        return index
+
+    def evaluate(self, word: Word) -> str:
+        # The element equal to a word in the generators, e.g. evaluate('srs') == 'r^-1'.
+        return self.elements[self._evaluate_index(word)]
+
+    def word_of(self, element: Any) -> List[Tuple[str, int]]:
+        # The word of an element, as (generator, exponent) pairs.
+        return [(self.generators[x // 2], -1 if x % 2 else 1)
+                for x in self.words[self.cayley_table.index_of(element)]]
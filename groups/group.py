@@ -1,5 +1,5 @@
 import numpy
-from typing import List, Dict, Any, Union
+from typing import Hashable, Iterable, Iterator, List, Dict, Any, Union
 
 import sys
 from pathlib import Path
@@ -8,7 +8,7 @@ current_dir = Path(__file__).resolve().parent
 root_dir = current_dir.parent
 sys.path.append(str(root_dir))
 
-from cayley_tables import cayley
+from cayley_tables import cayley, instrumentation, isomorphism, lattice
 
 
 class Group():
@@ -23,17 +23,55 @@ class Group():
     Attributes:
         - input_table (Dict[Dict[Any]]): a nested dictionary corresponding to the Cayley table
         corresponding to G. The value of cayley_table[element1][element2] is
-        element1 * element 2.
+        element1 * element 2. May also be an n by n numpy array of element indices, which is
+        used as the table's storage directly.
+        - elements (List[Any]): labels of the indices when input_table is an array
     """
-    def __init__(self, input_table: Dict[Any, Dict[Any, Any]]=None, check_axioms=True) -> None:
+    def __init__(self, input_table: Dict[Any, Dict[Any, Any]]=None, check_axioms=True,
+                 elements: List[Any] = None) -> None:
         self.check_axioms = check_axioms
-        self.cayley_table = cayley.CayleyTable(input_table, check_axioms=self.check_axioms)
+        with instrumentation.timer('group/construct'):
+            if isinstance(input_table, numpy.ndarray):
+                self.cayley_table = cayley.CayleyTable.from_array(input_table, elements,
+                                                                  check_axioms=self.check_axioms)
+            else:
+                self.cayley_table = cayley.CayleyTable(input_table, check_axioms=self.check_axioms)
         self.elements = self.cayley_table.elements
 
+    @classmethod
+    def from_cayley_table(cls, cayley_table: cayley.CayleyTable) -> 'Group':
+        # Wrap an existing Cayley table as a Group, without copying or re-checking it.
+        group = Group.__new__(Group)
+        group.check_axioms = cayley_table.check_axioms
+        group.cayley_table = cayley_table
+        group.elements = cayley_table.elements
+        return group
+
     def op(self, element_1: Any, element_2: Any) -> Any:
-        if element_1 not in self.elements or element_2 not in self.elements:
-            raise KeyError('Can only operate on elements of the group.')
-        return self.cayley_table.table[element_1][element_2]
+        try:
+            return self.cayley_table.op(element_1, element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+
+    def indices_of(self, elements: Iterable[Any]) -> numpy.ndarray:
+        # Indices of elements in bulk, raising a KeyError for any non-element.
+        return self.cayley_table.indices_of(elements)
+
+    def labels_of(self, indices: Any) -> List[Any]:
+        # Elements with the given indices, the inverse of indices_of.
+        return self.cayley_table.labels_of(indices)
+
+    def op_many(self, xs: Any, ys: Any) -> numpy.ndarray:
+        # Products of arrays of element indices, validated once per batch, see CayleyTable.op_many.
+        return self.cayley_table.op_many(xs, ys)
+
+    def reduce(self, words: Any) -> numpy.ndarray:
+        # Products of words of element indices, see CayleyTable.reduce.
+        return self.cayley_table.reduce(words)
+
+    def pow_many(self, xs: Any, ks: Any) -> numpy.ndarray:
+        # Powers of element indices by repeated squaring, see CayleyTable.pow_many.
+        return self.cayley_table.pow_many(xs, ks)
 
     def elements(self) -> List[Any]:
         return self.elements
@@ -41,6 +79,15 @@ class Group():
     def order(self) -> int:
         return len(self.elements)
     
+    def validate(self) -> cayley.ValidationReport:
+        # Check the group axioms, reporting the first failing one, see CayleyTable.validate.
+        return self.cayley_table.validate()
+
+    def memory_footprint(self) -> Dict[str, int]:
+        # Bytes held by the Cayley table and its cached invariants,
+        # see CayleyTable.memory_footprint.
+        return self.cayley_table.memory_footprint()
+
     def is_abelian(self) -> bool:
         return self.cayley_table.is_abelian()
     
@@ -49,9 +96,63 @@ class Group():
     
     def get_inverse(self, element: Any) -> Any:
         return self.cayley_table.get_inverse(element)
+
+    def inverse_indices(self) -> numpy.ndarray:
+        # Cached array mapping the index of each element to the index of its inverse.
+        return self.cayley_table.inverse_indices()
     
     def get_order_of_element(self, element: Any) -> Union[int, float]:
         return self.cayley_table.get_order_of_element(element)
     
     def get_elements_of_order(self, order: int) -> List[Any]:
         return self.cayley_table.get_elements_of_order(order)
+
+    def element_orders(self) -> numpy.ndarray:
+        return self.cayley_table.element_orders()
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        return self.cayley_table.order_histogram()
+
+    def conjugacy_classes(self) -> List[List[Any]]:
+        return self.cayley_table.conjugacy_classes()
+
+    def center(self) -> cayley.Subgroup:
+        return self.cayley_table.center()
+
+    def centralizer(self, element: Any) -> cayley.Subgroup:
+        return self.cayley_table.centralizer(element)
+
+    def fingerprint(self) -> Hashable:
+        # Hashable isomorphism invariant of G, see isomorphism.fingerprint.
+        return isomorphism.fingerprint(self.cayley_table)
+
+    def is_isomorphic(self, other: 'Group') -> bool:
+        return isomorphism.is_isomorphic(self.cayley_table, other.cayley_table)
+
+    def left_cosets(self, subgroup: Union[cayley.Subgroup, List[Any]]) -> List[List[Any]]:
+        return self.cayley_table.left_cosets(subgroup)
+
+    def right_cosets(self, subgroup: Union[cayley.Subgroup, List[Any]]) -> List[List[Any]]:
+        return self.cayley_table.right_cosets(subgroup)
+
+    def is_normal(self, subgroup: Union[cayley.Subgroup, List[Any]]) -> bool:
+        return self.cayley_table.is_normal(subgroup)
+
+    def quotient(self, subgroup: Union[cayley.Subgroup, List[Any]]) -> 'Group':
+        # The quotient group G / N, with cosets labelled by their representatives.
+        return Group.from_cayley_table(self.cayley_table.quotient(subgroup))
+
+    def is_subgroup(self, subset: List[Any]) -> bool:
+        return self.cayley_table.is_subgroup(subset)
+
+    def generated_subgroup(self, generators: List[Any]) -> cayley.Subgroup:
+        return self.cayley_table.generated_subgroup(generators)
+
+    def subgroups(self) -> Iterator[cayley.Subgroup]:
+        # Stream every subgroup of G, see lattice.iter_subgroups.
+        return lattice.iter_subgroups(self.cayley_table)
+
+    def subgroup_lattice(self) -> lattice.SubgroupLattice:
+        # The lattice of all subgroups of G, computed once and cached on the Cayley table.
+        return self.cayley_table._cached(
+            'subgroup_lattice', lambda: lattice.SubgroupLattice(self.subgroups()))
@@ -0,0 +1,348 @@
+import math
+import numpy
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import sys
+from pathlib import Path
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+from cayley_tables import cayley, generators
+from groups.group import Group
+
+
+class _Level():
+    """
+    One level of a stabilizer chain: a base point b, the strong generators fixing every earlier
+    base point, and a transversal of the orbit of b under them.
+
+    Attributes:
+        - point (int): the base point b
+        - generators (List[numpy.ndarray]): the strong generators of this level
+        - positions (numpy.ndarray): position in the orbit of every point, -1 outside of it
+        - representatives (List[numpy.ndarray]): representatives[k] maps b to the k-th point of
+            the orbit, the first one being the identity
+        - inverses (List[numpy.ndarray]): the inverses of the representatives
+    """
+    def __init__(self, point: int, degree: int) -> None:
+        self.point = point
+        self.degree = degree
+        self.generators = []
+        self.update()
+
+    def update(self) -> None:
+        # Recompute the orbit of the base point and its transversal by breadth first search.
+        identity = numpy.arange(self.degree)
+        self.positions = numpy.full(self.degree, -1, dtype=numpy.intp)
+        self.positions[self.point] = 0
+        self.representatives = [identity]
+        orbit = [self.point]
+        for beta in orbit:
+            representative = self.representatives[self.positions[beta]]
+            for s in self.generators:
+                image = int(s[beta])
+                if self.positions[image] < 0:
+                    self.positions[image] = len(orbit)
+                    orbit.append(image)
+                    self.representatives.append(s[representative])
+        self.orbit = orbit
+        self.inverses = [numpy.argsort(u) for u in self.representatives]
+
+
+class PermutationGroup(Group):
+    """
+    A group of permutations of the points 0, ..., d - 1, given by generators. A permutation is
+    stored as the array p mapping each point x to p[x], and elements are labelled by the tuple
+    of images. Permutations are composed left to right: a * b first applies a, then b.
+
+    The group is described by a base and strong generating set computed with the deterministic
+    Schreier-Sims algorithm: a chain of point stabilizers G = G_0 > G_1 > ... > G_k = 1, with
+    G_i fixing the base points b_1, ..., b_i, together with transversals of the orbit of b_i
+    under G_{i - 1}. Every element then factors uniquely as a product of transversal elements,
+    so the order is the product of the orbit lengths, membership is decided by sifting through
+    the chain, and uniformly random elements are products of random transversal elements.
+    The Cayley table is only built when self.cayley_table is accessed.
+
+    Attributes:
+        - degree (int): the number of points d
+        - generators (List[Tuple[int]]): the generators, as tuples of images
+        - base (List[int]): the base points
+        - cayley_table (CayleyTable):
+            the Cayley table of the group, generated on first access. Element i is the product
+            of transversal elements with mixed-radix digits i.
+
+    Parameters:
+        - generators (Iterable[Sequence[int]]): permutations of 0, ..., d - 1
+        - degree (int): the number of points, only needed when there are no generators
+        - check_axioms: passed on to the Cayley table when it is generated
+
+    Methods:
+        - cyclic
+        - dihedral
+        - symmetric
+        - contains
+        - random_element
+        - strong_generators
+        - element_orders
+    """
+    def __init__(self, generators: Iterable[Sequence[int]], degree: Optional[int] = None,
+                 check_axioms=False) -> None:
+        generators = [numpy.asarray(g, dtype=numpy.intp) for g in generators]
+        if degree is None:
+            if not generators:
+                raise ValueError('degree is required when there are no generators.')
+            degree = len(generators[0])
+        for g in generators:
+            if g.shape != (degree,) or not numpy.array_equal(numpy.sort(g), numpy.arange(degree)):
+                raise ValueError(f'Generators must be permutations of 0, ..., {degree - 1}.')
+        self.degree = degree
+        self.check_axioms = check_axioms
+        self._generators = generators
+        self.generators = [tuple(g.tolist()) for g in generators]
+        self._cayley_table = None
+        self._elements = None
+        self._orders = None
+        self._schreier_sims()
+
+    @classmethod
+    def cyclic(cls, n_elements: int) -> 'PermutationGroup':
+        # C_n as the rotations x -> x + k of Z/nZ.
+        return cls([numpy.roll(numpy.arange(n_elements), -1)])
+
+    @classmethod
+    def dihedral(cls, n_vertices: int) -> 'PermutationGroup':
+        """
+        D_n acting on the vertices of the regular n-gon, generated by r: x -> x + 1 and
+        s: x -> -x. This action is only faithful for n >= 3, so D_1 and D_2 act on themselves
+        by right multiplication instead, with points the codes of DihedralGroup.
+        """
+        if n_vertices <= 2:
+            table = generators.dihedral_array(n_vertices).astype(numpy.intp)
+            return cls([table[:, 1 % n_vertices], table[:, n_vertices]])
+        vertices = numpy.arange(n_vertices)
+        return cls([(vertices + 1) % n_vertices, -vertices % n_vertices])
+
+    @classmethod
+    def symmetric(cls, degree: int) -> 'PermutationGroup':
+        # S_d, generated by a transposition and a d-cycle.
+        if degree <= 2:
+            return cls([numpy.arange(degree)[::-1]], degree)
+        transposition = numpy.arange(degree)
+        transposition[[0, 1]] = [1, 0]
+        return cls([transposition, numpy.roll(numpy.arange(degree), -1)])
+
+    def _schreier_sims(self) -> None:
+        """
+        Compute a base and strong generating set. Each Schreier generator u_beta s u_{beta s}^-1
+        of a level is sifted through the levels below it, and whatever does not sift to the
+        identity is added as a strong generator to the levels it reaches, after which the check
+        resumes from the deepest level that changed.
+        """
+        identity = numpy.arange(self.degree)
+        self._levels = []
+        generators = [g for g in self._generators if not numpy.array_equal(g, identity)]
+        for g in generators:
+            if all(g[level.point] == level.point for level in self._levels):
+                self._levels.append(_Level(int(numpy.argmax(g != identity)), self.degree))
+        for i, level in enumerate(self._levels):
+            level.generators = [g for g in generators
+                                if all(g[L.point] == L.point for L in self._levels[:i])]
+            level.update()
+
+        i = len(self._levels) - 1
+        while i >= 0:
+            level = self._levels[i]
+            extended = False
+            for beta, representative in zip(level.orbit, level.representatives):
+                for s in level.generators:
+                    image = s[representative]
+                    g = level.inverses[level.positions[image[level.point]]][image]
+                    h, j = self._sift(g, i + 1)
+                    if j < len(self._levels) or not numpy.array_equal(h, identity):
+                        if j == len(self._levels):
+                            self._levels.append(_Level(int(numpy.argmax(h != identity)),
+                                                       self.degree))
+                        for L in self._levels[i + 1:j + 1]:
+                            L.generators.append(h)
+                            L.update()
+                        i = j
+                        extended = True
+                        break
+                if extended:
+                    break
+            if not extended:
+                i -= 1
+
+        self.base = [level.point for level in self._levels]
+        self._sizes = [len(level.orbit) for level in self._levels]
+        # Element i has digit (i // stride) % size at each level, see self.elements.
+        self._strides = numpy.cumprod([1] + self._sizes[:-1]).astype(numpy.int64)
+
+    def _sift(self, g: numpy.ndarray, start: int = 0) -> Tuple[numpy.ndarray, int]:
+        # Divide g by transversal elements from level start on, returning the residue and the
+        # level at which it left the chain (the number of levels if it sifted through).
+        for j in range(start, len(self._levels)):
+            level = self._levels[j]
+            position = level.positions[g[level.point]]
+            if position < 0:
+                return g, j
+            g = level.inverses[position][g]
+        return g, len(self._levels)
+
+    def strong_generators(self) -> List[Tuple[int]]:
+        # The strong generating set, with repeats across levels removed.
+        generators = {}
+        for level in self._levels:
+            for g in level.generators:
+                generators.setdefault(tuple(g.tolist()), None)
+        return list(generators)
+
+    def _as_permutation(self, element: Any) -> Optional[numpy.ndarray]:
+        # element as an array, or None if it is not a permutation of the points.
+        try:
+            p = numpy.asarray(element, dtype=numpy.intp)
+        except (TypeError, ValueError):
+            return None
+        if p.shape != (self.degree,) or not (numpy.sort(p) == numpy.arange(self.degree)).all():
+            return None
+        return p
+
+    def contains(self, element: Any) -> bool:
+        # Membership test by sifting, O(|base| d).
+        p = self._as_permutation(element)
+        if p is None:
+            return False
+        h, j = self._sift(p)
+        return j == len(self._levels) and numpy.array_equal(h, numpy.arange(self.degree))
+
+    def __contains__(self, element: Any) -> bool:
+        return self.contains(element)
+
+    def _check_element(self, element: Any) -> numpy.ndarray:
+        if not self.contains(element):
+            raise KeyError(f'{element} is not an element of the group.')
+        return numpy.asarray(element, dtype=numpy.intp)
+
+    def random_element(self, seed: Optional[int] = None) -> Tuple[int]:
+        # A uniformly random element, as a product of random transversal elements.
+        rng = numpy.random.default_rng(seed)
+        g = numpy.arange(self.degree)
+        for level in reversed(self._levels):
+            g = level.representatives[rng.integers(len(level.orbit))][g]
+        return tuple(g.tolist())
+
+    def order(self) -> int:
+        return math.prod(self._sizes)
+
+    def op(self, element_1: Any, element_2: Any) -> Tuple[int]:
+        try:
+            a, b = self._check_element(element_1), self._check_element(element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+        return tuple(b[a].tolist())
+
+    def is_abelian(self) -> bool:
+        # G is abelian iff its generators commute pairwise.
+        return all(numpy.array_equal(a[b], b[a])
+                   for i, a in enumerate(self._generators) for b in self._generators[:i])
+
+    def get_identity(self) -> Tuple[int]:
+        return tuple(range(self.degree))
+
+    def get_inverse(self, element: Any) -> Tuple[int]:
+        return tuple(numpy.argsort(self._check_element(element)).tolist())
+
+    def get_order_of_element(self, element: Any) -> int:
+        # The order of a permutation is the lcm of its cycle lengths.
+        try:
+            p = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        seen = numpy.zeros(self.degree, dtype=bool)
+        order = 1
+        for x in range(self.degree):
+            length = 0
+            while not seen[x]:
+                seen[x] = True
+                x = p[x]
+                length += 1
+            order = math.lcm(order, max(length, 1))
+        return order
+
+    def element_orders(self) -> numpy.ndarray:
+        """
+        Return the array whose entry i is the order of self.elements[i], computed once without
+        the Cayley table. As in get_order_of_element, the order of a permutation is the lcm of
+        its cycle lengths: all rows are advanced together, p, p^2, ..., and the cycle length of
+        x in p is the first k with p^k(x) = x, which takes at most d steps.
+        """
+        if self._orders is None:
+            permutations = self._element_array()
+            points = numpy.arange(self.degree)
+            lengths = numpy.zeros(permutations.shape, dtype=numpy.int64)
+            images = permutations
+            for k in range(1, self.degree + 1):
+                lengths[(lengths == 0) & (images == points)] = k
+                if lengths.all():
+                    break
+                images = numpy.take_along_axis(permutations, images, axis=1)
+            self._orders = numpy.lcm.reduce(lengths, axis=1, initial=1)
+        return self._orders
+
+    def get_elements_of_order(self, order: int) -> Set[Tuple[int]]:
+        return set(self.elements[i] for i in numpy.flatnonzero(self.element_orders() == order))
+
+    def order_histogram(self) -> Dict[int, int]:
+        values, counts = numpy.unique(self.element_orders(), return_counts=True)
+        return {int(value): int(count) for value, count in zip(values, counts)}
+
+    def _element_array(self) -> numpy.ndarray:
+        # Every element as a row, element i being the product of the transversal elements with
+        # mixed-radix digits i, from the last level to the first.
+        elements = numpy.arange(self.degree)[None, :]
+        for level in reversed(self._levels):
+            representatives = numpy.array(level.representatives)
+            elements = representatives[:, elements].transpose(1, 0, 2).reshape(-1, self.degree)
+        return elements
+
+    def _rank(self, permutations: numpy.ndarray) -> numpy.ndarray:
+        # Index of each row of permutations in self.elements, vectorized over the rows.
+        ranks = numpy.zeros(len(permutations), dtype=numpy.int64)
+        for level, stride in zip(self._levels, self._strides):
+            positions = level.positions[permutations[:, level.point]]
+            ranks += positions * stride
+            permutations = numpy.array(level.inverses)[positions[:, None], permutations]
+        return ranks
+
+    @property
+    def elements(self) -> List[Tuple[int]]:
+        # The elements, as tuples of images, enumerated on first access.
+        if self._elements is None:
+            self._elements = [tuple(p) for p in self._element_array().tolist()]
+        return self._elements
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            self._cayley_table = cayley.CayleyTable.from_array(
+                self._generate_cayley_table(), self.elements, check_axioms=self.check_axioms,
+                copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _generate_cayley_table(self, block_size: int = 1 << 20) -> numpy.ndarray:
+        # Rank the products of blocks of rows against all elements at once.
+        elements = self._element_array()
+        n = len(elements)
+        table = numpy.empty((n, n), dtype=cayley.index_dtype(n))
+        rows_per_block = max(1, block_size // (n * self.degree))
+        for start in range(0, n, rows_per_block):
+            block = elements[start:start + rows_per_block]
+            # products[i, j] = block[i] * elements[j] = elements[j][block[i]]
+            products = elements[:, block].transpose(1, 0, 2).reshape(-1, self.degree)
+            table[start:start + len(block)] = self._rank(products).reshape(len(block), n)
+        return table
@@ -0,0 +1,298 @@
+import math
+import numpy
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+import sys
+from pathlib import Path
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+from cayley_tables import cayley, generators
+from cayley_tables.homomorphism import are_homomorphisms
+from groups.group import Group
+
+
+class _ProductGroup(Group):
+    """
+    A group whose elements are the pairs (a, b) of elements of two factor groups A and B. The
+    pair of the elements with indices i and j is encoded as the index i |B| + j, and every
+    operation is computed on batches of such indices from the batched operations of the
+    factors, see Group.op_many. Single elements go through the same code path.
+
+    The Cayley table of the product is only built when self.cayley_table is accessed.
+
+    Attributes:
+        - factors (Tuple[Group, Group]): the factors A and B
+        - cayley_table (CayleyTable): generated on first access, labelled by the pairs (a, b)
+    """
+    def __init__(self, first: Group, second: Group, check_axioms=False) -> None:
+        self.factors = (first, second)
+        self.check_axioms = check_axioms
+        self._cayley_table = None
+        self._elements = None
+        self._orders = None
+
+    @property
+    def cayley_table(self) -> cayley.CayleyTable:
+        if self._cayley_table is None:
+            self._cayley_table = cayley.CayleyTable.from_array(
+                self._generate_cayley_table(), self.elements, check_axioms=self.check_axioms,
+                copy=False)
+        return self._cayley_table
+
+    @cayley_table.setter
+    def cayley_table(self, value: cayley.CayleyTable) -> None:
+        self._cayley_table = value
+
+    def _generate_cayley_table(self) -> numpy.ndarray:
+        # Every product at once, by broadcasting op_many over all pairs of indices.
+        codes = numpy.arange(self.order())
+        products = self.op_many(codes[:, None], codes[None, :])
+        return products.astype(cayley.index_dtype(self.order()))
+
+    @property
+    def elements(self) -> List[Tuple[Any, Any]]:
+        # The pairs (a, b), in order of their indices, enumerated on first access.
+        if self._elements is None:
+            self._elements = self.labels_of(numpy.arange(self.order()))
+        return self._elements
+
+    def _split(self, indices: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # The indices of the components of a batch of indices of the product.
+        return numpy.divmod(cayley.as_indices(indices, self.order()), self.factors[1].order())
+
+    def _join(self, first: numpy.ndarray, second: numpy.ndarray) -> numpy.ndarray:
+        return first * self.factors[1].order() + second
+
+    def indices_of(self, elements: Iterable[Any]) -> numpy.ndarray:
+        elements = list(elements)
+        if not all(isinstance(element, tuple) and len(element) == 2 for element in elements):
+            raise KeyError('Elements of a product group are pairs.')
+        first, second = (numpy.asarray(factor.indices_of([pair[i] for pair in elements]),
+                                       dtype=numpy.intp) for i, factor in enumerate(self.factors))
+        return self._join(first, second)
+
+    def labels_of(self, indices: Any) -> List[Any]:
+        first, second = self._split(indices)
+        pairs = zip(self.factors[0].labels_of(first.ravel()),
+                    self.factors[1].labels_of(second.ravel()))
+        labels = numpy.empty(first.size, dtype=object)
+        for i, pair in enumerate(pairs):
+            labels[i] = pair
+        return labels.reshape(first.shape).tolist()
+
+    def _check_element(self, element: Any) -> int:
+        try:
+            return int(self.indices_of([element])[0])
+        except (KeyError, ValueError):
+            raise KeyError(f'{element} is not an element of the group.') from None
+
+    def op(self, element_1: Any, element_2: Any) -> Tuple[Any, Any]:
+        try:
+            a, b = self._check_element(element_1), self._check_element(element_2)
+        except KeyError:
+            raise KeyError('Can only operate on elements of the group.') from None
+        return self.labels_of(self.op_many(a, b))
+
+    def reduce(self, words: Any) -> numpy.ndarray:
+        # Multiply all words by their next letter at once, see CayleyTable.reduce.
+        identity = self._identity_index()
+        words = cayley.as_words(words, self.order(), identity)
+        products = numpy.full(len(words), identity, dtype=numpy.intp)
+        for letters in words.T:
+            products = self.op_many(products, letters)
+        return products
+
+    def pow_many(self, xs: Any, ks: Any) -> numpy.ndarray:
+        # Repeated squaring with op_many, negative powers being powers of the inverse.
+        xs, ks = numpy.broadcast_arrays(cayley.as_indices(xs, self.order()),
+                                        cayley.as_exponents(ks))
+        xs = numpy.where(ks < 0, self.inverse_indices()[xs], xs)
+        ks = numpy.abs(ks)
+        powers = numpy.full(xs.shape, self._identity_index(), dtype=numpy.intp)
+        while ks.any():
+            odd = (ks & 1).astype(bool)
+            powers[odd] = self.op_many(powers[odd], xs[odd])
+            xs = self.op_many(xs, xs)
+            ks = ks >> 1
+        return powers
+
+    def order(self) -> int:
+        return self.factors[0].order() * self.factors[1].order()
+
+    def _identity_index(self) -> int:
+        return int(self.indices_of([tuple(factor.get_identity() for factor in self.factors)])[0])
+
+    def get_identity(self) -> Tuple[Any, Any]:
+        return self.labels_of(self._identity_index())
+
+    def get_inverse(self, element: Any) -> Tuple[Any, Any]:
+        return self.labels_of(self.inverse_indices()[self._check_element(element)])
+
+    def get_order_of_element(self, element: Any) -> int:
+        try:
+            element = self._check_element(element)
+        except KeyError:
+            raise ValueError('Invalid input: element not in group.') from None
+        return int(self.element_orders()[element])
+
+    def get_elements_of_order(self, order: int) -> List[Any]:
+        return set(self.labels_of(numpy.flatnonzero(self.element_orders() == order)))
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        values, counts = numpy.unique(self.element_orders(), return_counts=True)
+        return {int(value): int(count) for value, count in zip(values, counts)}
+
+
+class DirectProduct(_ProductGroup):
+    """
+    The direct product A x B, with (a, b)(a', b') = (a a', b b'). Every query is answered
+    component-wise from the factors: the inverse of (a, b) is (a^-1, b^-1), its order is
+    lcm(|a|, |b|), and A x B is abelian iff A and B are. With lazy factors such as C_m and D_n
+    nothing of size |A x B|^2 is ever built unless self.cayley_table is accessed, which builds
+    the index table in one broadcast, see generators.direct_product_array.
+
+    Attributes:
+        - factors (Tuple[Group, Group]): the factors A and B
+        - cayley_table (CayleyTable): generated on first access, labelled by the pairs (a, b)
+
+    Parameters:
+        - first, second (Group): the factors A and B
+        - check_axioms: passed on to the Cayley table when it is generated
+    """
+    def _generate_cayley_table(self) -> numpy.ndarray:
+        first, second = self.factors
+        return generators.direct_product_array(first.cayley_table.array,
+                                               second.cayley_table.array)
+
+    def op_many(self, xs: Any, ys: Any) -> numpy.ndarray:
+        (a, b), (c, d) = self._split(xs), self._split(ys)
+        return self._join(self.factors[0].op_many(a, c), self.factors[1].op_many(b, d))
+
+    def reduce(self, words: Any) -> numpy.ndarray:
+        # Each component of a product of words is the product of the component words.
+        words = cayley.as_words(words, self.order(), self._identity_index())
+        first, second = self._split(words)
+        return self._join(self.factors[0].reduce(first), self.factors[1].reduce(second))
+
+    def pow_many(self, xs: Any, ks: Any) -> numpy.ndarray:
+        (a, b), ks = self._split(xs), cayley.as_exponents(ks)
+        return self._join(self.factors[0].pow_many(a, ks), self.factors[1].pow_many(b, ks))
+
+    def is_abelian(self) -> bool:
+        return self.factors[0].is_abelian() and self.factors[1].is_abelian()
+
+    def inverse_indices(self) -> numpy.ndarray:
+        first, second = (numpy.asarray(factor.inverse_indices(), dtype=numpy.intp)
+                         for factor in self.factors)
+        return self._join(first[:, None], second[None, :]).ravel()
+
+    def element_orders(self) -> numpy.ndarray:
+        # The order of (a, b) is lcm(|a|, |b|).
+        if self._orders is None:
+            first, second = (numpy.asarray(factor.element_orders(), dtype=numpy.int64)
+                             for factor in self.factors)
+            self._orders = numpy.lcm.outer(first, second).ravel()
+        return self._orders
+
+    def order_histogram(self) -> Dict[Union[int, float], int]:
+        # Combine the histograms of the factors, with O(k_A k_B) work for k distinct orders.
+        histogram = {}
+        for order_1, count_1 in self.factors[0].order_histogram().items():
+            for order_2, count_2 in self.factors[1].order_histogram().items():
+                order = math.lcm(order_1, order_2)
+                histogram[order] = histogram.get(order, 0) + count_1 * count_2
+        return dict(sorted(histogram.items()))
+
+
+class SemidirectProduct(_ProductGroup):
+    """
+    The semidirect product N x_phi H for an action phi: H -> Aut(N), with
+    (n, h)(n', h') = (n phi_h(n'), h h'). The action is stored as an |H| by |N| array of
+    indices, so that products of whole batches of pairs are gathers into the action and the
+    batched operations of N and H.
+
+    The inverse of (n, h) is (phi_h^-1(n^-1), h^-1). If h has order k then
+    (n, h)^k = (m, e) and the order of (n, h) is k |m|, which is computed for all elements at
+    once by repeated squaring. N x_phi H is abelian iff N and H are and the action is trivial.
+
+    Attributes:
+        - factors (Tuple[Group, Group]): the factors N and H
+        - action (numpy.ndarray): action[h, n] is the index of phi_h(n), for indices h and n
+        - cayley_table (CayleyTable): generated on first access, labelled by the pairs (n, h)
+
+    Parameters:
+        - normal, acting (Group): the factors N and H
+        - action: a function (h, n) -> phi_h(n) on labels, or an |H| by |N| array of indices
+        - check_action (bool): verify that every phi_h is an automorphism of N and that
+            phi_(h h') = phi_h o phi_(h'), checked on the generators of H
+        - check_axioms: passed on to the Cayley table when it is generated
+    """
+    def __init__(self, normal: Group, acting: Group,
+                 action: Union[Callable[[Any, Any], Any], numpy.ndarray],
+                 check_action=True, check_axioms=False) -> None:
+        super().__init__(normal, acting, check_axioms=check_axioms)
+        n, m = normal.order(), acting.order()
+        if callable(action):
+            images = [action(h, x) for h in acting.labels_of(numpy.arange(m))
+                      for x in normal.labels_of(numpy.arange(n))]
+            action = normal.indices_of(images).reshape(m, n)
+        self.action = cayley.as_indices(action, n)
+        if self.action.shape != (m, n):
+            raise ValueError(f'action must be a {m} by {n} array.')
+        self.action.flags.writeable = False
+        if check_action:
+            self._check_action()
+
+    def _check_action(self) -> None:
+        normal, acting = self.factors
+        A = self.action
+        if not (numpy.sort(A, axis=1) == numpy.arange(normal.order())).all():
+            raise ValueError('action does not act by permutations.')
+        if not are_homomorphisms(normal, normal, A).all():
+            raise ValueError('action does not act by automorphisms.')
+        # phi_(h s)(x) = phi_h(phi_s(x)) for every h and every generator s of H.
+        table = acting.cayley_table
+        for s in table._group_generators():
+            if not (A[table.array[:, s].astype(numpy.intp)] == A[:, A[s]]).all():
+                raise ValueError('action is not a homomorphism into Aut(N).')
+
+    def op_many(self, xs: Any, ys: Any) -> numpy.ndarray:
+        (a, b), (c, d) = self._split(xs), self._split(ys)
+        return self._join(self.factors[0].op_many(a, self.action[b, c]),
+                          self.factors[1].op_many(b, d))
+
+    def is_abelian(self) -> bool:
+        trivial = (self.action == numpy.arange(self.factors[0].order())).all()
+        return bool(trivial) and self.factors[0].is_abelian() and self.factors[1].is_abelian()
+
+    def inverse_indices(self) -> numpy.ndarray:
+        # (n, h)^-1 = (phi_(h^-1)(n^-1), h^-1) for all pairs at once.
+        normal, acting = self.factors
+        n_inverses = numpy.asarray(normal.inverse_indices(), dtype=numpy.intp)
+        h_inverses = numpy.asarray(acting.inverse_indices(), dtype=numpy.intp)
+        return self._join(self.action[h_inverses[None, :], n_inverses[:, None]],
+                          h_inverses[None, :]).ravel()
+
+    def element_orders(self) -> numpy.ndarray:
+        if self._orders is None:
+            normal, acting = self.factors
+            codes = numpy.arange(self.order())
+            k = numpy.asarray(acting.element_orders(), dtype=numpy.int64)[codes % acting.order()]
+            m = self.pow_many(codes, k) // acting.order()
+            self._orders = k * numpy.asarray(normal.element_orders(), dtype=numpy.int64)[m]
+        return self._orders
+
+
+def direct_product(first: Group, second: Group, check_axioms=False) -> DirectProduct:
+    # The direct product of two groups, see DirectProduct.
+    return DirectProduct(first, second, check_axioms=check_axioms)
+
+
+def semidirect_product(normal: Group, acting: Group,
+                       action: Union[Callable[[Any, Any], Any], numpy.ndarray],
+                       check_action=True, check_axioms=False) -> SemidirectProduct:
+    # The semidirect product of normal by acting for the given action, see SemidirectProduct.
+    return SemidirectProduct(normal, acting, action, check_action=check_action,
+                             check_axioms=check_axioms)
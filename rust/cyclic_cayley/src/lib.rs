@@ -1,6 +1,83 @@
+use numpy::{Element, PyArray1, PyReadonlyArray2};
 use pyo3::prelude::*;
 use pyo3::Python;
 use pyo3::types::PyDict;
+use rayon::prelude::*;
+
+/// Unsigned integer types used for element indices, mirroring cayley.index_dtype: the
+/// smallest type which can hold every index 0, ..., n.
+trait Index: Element + Copy + Default + Send + Sync {
+    fn from_usize(x: usize) -> Self;
+}
+
+impl Index for u8 {
+    fn from_usize(x: usize) -> Self { x as u8 }
+}
+
+impl Index for u16 {
+    fn from_usize(x: usize) -> Self { x as u16 }
+}
+
+impl Index for u32 {
+    fn from_usize(x: usize) -> Self { x as u32 }
+}
+
+impl Index for u64 {
+    fn from_usize(x: usize) -> Self { x as u64 }
+}
+
+fn fill_table<T, F>(n: usize, f: &F) -> Vec<T>
+where
+    T: Index,
+    F: Fn(usize, usize) -> usize + Sync,
+{
+    // Fill the n by n row-major buffer whose entry (i, j) is f(i, j), one row per rayon task.
+    let mut buffer = vec![T::default(); n * n];
+    if n == 0 {
+        return buffer
+    }
+    buffer.par_chunks_mut(n).enumerate().for_each(|(i, row)| {
+        for (j, entry) in row.iter_mut().enumerate() {
+            *entry = T::from_usize(f(i, j));
+        }
+    });
+    buffer
+}
+
+fn to_numpy<T, F>(py: Python, n: usize, f: F) -> PyResult<PyObject>
+where
+    T: Index,
+    F: Fn(usize, usize) -> usize + Sync + Send,
+{
+    // The table is generated without holding the GIL, then the buffer is moved into a numpy
+    // array without copying.
+    let buffer = py.allow_threads(|| fill_table::<T, F>(n, &f));
+    let array = PyArray1::from_vec(py, buffer).reshape([n, n])?;
+    Ok(array.into_py(py))
+}
+
+fn index_table<F>(py: Python, n: usize, f: F) -> PyResult<PyObject>
+where
+    F: Fn(usize, usize) -> usize + Sync + Send,
+{
+    if n <= u8::MAX as usize {
+        to_numpy::<u8, F>(py, n, f)
+    } else if n <= u16::MAX as usize {
+        to_numpy::<u16, F>(py, n, f)
+    } else if n <= u32::MAX as usize {
+        to_numpy::<u32, F>(py, n, f)
+    } else {
+        to_numpy::<u64, F>(py, n, f)
+    }
+}
+
+fn dihedral_product(n_vertices: usize, x: usize, y: usize) -> usize {
+    // r^a s^b * r^c s^d = r^(a + (-1)^b c) s^(b + d), with r^i s^j encoded as i + n j.
+    let (a, b) = (x % n_vertices, x / n_vertices);
+    let (c, d) = (y % n_vertices, y / n_vertices);
+    let rotation = if b == 0 { a + c } else { a + n_vertices - c };
+    rotation % n_vertices + n_vertices * ((b + d) % 2)
+}
 
 #[pyfunction]
 fn gen_cyclic_table(py: Python, n_elements: usize) -> PyResult<PyObject> {
@@ -16,9 +93,64 @@ fn gen_cyclic_table(py: Python, n_elements: usize) -> PyResult<PyObject> {
     Ok(table.into())
 }
 
+#[pyfunction]
+fn gen_cyclic_array(py: Python, n_elements: usize) -> PyResult<PyObject> {
+    // Index table of Z/nZ: entry (i, j) is (i + j) mod n.
+    index_table(py, n_elements, move |i, j| (i + j) % n_elements)
+}
+
+#[pyfunction]
+fn gen_dihedral_array(py: Python, n_vertices: usize) -> PyResult<PyObject> {
+    // Index table of the dihedral group of order 2n, with r^i s^j encoded as i + n j.
+    index_table(py, 2 * n_vertices, move |i, j| dihedral_product(n_vertices, i, j))
+}
+
+#[pyfunction]
+fn gen_direct_product_array(
+    py: Python,
+    table_1: PyReadonlyArray2<u32>,
+    table_2: PyReadonlyArray2<u32>,
+) -> PyResult<PyObject> {
+    // Index table of G x H, with (g, h) encoded as g |H| + h.
+    let n_2 = table_2.shape()[0];
+    let n_1 = table_1.shape()[0];
+    let t_1 = table_1.as_slice()?.to_vec();
+    let t_2 = table_2.as_slice()?.to_vec();
+    index_table(py, n_1 * n_2, move |i, j| {
+        let (g_1, h_1) = (i / n_2, i % n_2);
+        let (g_2, h_2) = (j / n_2, j % n_2);
+        t_1[g_1 * n_1 + g_2] as usize * n_2 + t_2[h_1 * n_2 + h_2] as usize
+    })
+}
+
 #[pymodule]
 fn gen_cyclic_cayley(_py: Python, m: &PyModule) -> PyResult<()> {
     // Corresponding Python module.
     m.add_function(wrap_pyfunction!(gen_cyclic_table, m)?)?;
+    m.add_function(wrap_pyfunction!(gen_cyclic_array, m)?)?;
+    m.add_function(wrap_pyfunction!(gen_dihedral_array, m)?)?;
+    m.add_function(wrap_pyfunction!(gen_direct_product_array, m)?)?;
     Ok(())
-} 
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_fill_table_cyclic() {
+        let table = fill_table::<u8, _>(3, &|i: usize, j: usize| (i + j) % 3);
+        assert_eq!(table, vec![0, 1, 2, 1, 2, 0, 2, 0, 1]);
+    }
+
+    #[test]
+    fn test_dihedral_product() {
+        // In D_4, r * s = r s and s * r = r^3 s.
+        assert_eq!(dihedral_product(4, 1, 4), 5);
+        assert_eq!(dihedral_product(4, 4, 1), 7);
+        // Reflections are involutions.
+        for x in 4..8 {
+            assert_eq!(dihedral_product(4, x, x), 0);
+        }
+    }
+}
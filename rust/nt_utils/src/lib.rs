@@ -1,47 +1,320 @@
+use numpy::{IntoPyArray, PyArray1, PyReadonlyArray1};
 use pyo3::prelude::*;
 use pyo3::Python;
+use rayon::prelude::*;
 
-#[pyfunction]
-fn is_prime(n: usize) -> bool {
-    // Every prime number >3 is congruent to 1 or -1 mod 6
-    if n <= 1 {
-        return false
+// Miller-Rabin with these bases is deterministic for every u64.
+const WITNESSES: [u64; 12] = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37];
+
+// Number of integers sieved at once by each task of the segmented sieve.
+const SEGMENT_SIZE: u64 = 1 << 18;
+
+fn mul_mod(a: u64, b: u64, m: u64) -> u64 {
+    ((a as u128 * b as u128) % m as u128) as u64
+}
+
+fn pow_mod(mut base: u64, mut exponent: u64, m: u64) -> u64 {
+    let mut result = 1 % m;
+    base %= m;
+    while exponent > 0 {
+        if exponent & 1 == 1 {
+            result = mul_mod(result, base, m);
+        }
+        base = mul_mod(base, base, m);
+        exponent >>= 1;
     }
-    else if n <= 3 {
-        return true
+    result
+}
+
+fn gcd(mut a: u64, mut b: u64) -> u64 {
+    while b != 0 {
+        let t = a % b;
+        a = b;
+        b = t;
     }
-    else if n % 2 == 0 || n % 3 == 0 {
+    a
+}
+
+fn isqrt(n: u64) -> u64 {
+    // Floor of the square root, corrected after the floating point estimate.
+    let mut r = (n as f64).sqrt() as u64;
+    while r.checked_mul(r).map_or(true, |s| s > n) {
+        r -= 1;
+    }
+    while (r + 1).checked_mul(r + 1).map_or(false, |s| s <= n) {
+        r += 1;
+    }
+    r
+}
+
+fn is_prime_u64(n: u64) -> bool {
+    if n < 2 {
         return false
     }
-    let mut curr = 5;
-    let upper_limit: usize = (n as f64).sqrt() as usize + 1;
-    while curr <= upper_limit {
-        if n % curr == 0 || n % (curr + 2) == 0 {
-            return false
+    for &p in WITNESSES.iter() {
+        if n % p == 0 {
+            return n == p
+        }
+    }
+    let s = (n - 1).trailing_zeros();
+    let d = (n - 1) >> s;
+    'witness: for &a in WITNESSES.iter() {
+        let mut x = pow_mod(a, d, n);
+        if x == 1 || x == n - 1 {
+            continue
+        }
+        for _ in 1..s {
+            x = mul_mod(x, x, n);
+            if x == n - 1 {
+                continue 'witness
+            }
         }
-        curr += 6;
+        return false
     }
     true
 }
 
+fn pollard_rho(n: u64) -> u64 {
+    // A nontrivial factor of the odd composite n, by Brent's variant of Pollard's rho method.
+    for c in 1..n {
+        let f = |x: u64| ((x as u128 * x as u128 + c as u128) % n as u128) as u64;
+        let (mut x, mut y, mut ys) = (2u64, 2u64, 2u64);
+        let (mut q, mut g, mut r) = (1u64, 1u64, 1u64);
+        while g == 1 {
+            x = y;
+            for _ in 0..r {
+                y = f(y);
+            }
+            let mut k = 0;
+            while k < r && g == 1 {
+                ys = y;
+                for _ in 0..std::cmp::min(128, r - k) {
+                    y = f(y);
+                    q = mul_mod(q, x.abs_diff(y), n);
+                }
+                g = gcd(q, n);
+                k += 128;
+            }
+            r *= 2;
+        }
+        if g == n {
+            g = 1;
+            while g == 1 {
+                ys = f(ys);
+                g = gcd(x.abs_diff(ys), n);
+            }
+        }
+        if g != n {
+            return g
+        }
+    }
+    n
+}
+
+fn factorize_u64(mut n: u64) -> Vec<(u64, u32)> {
+    // Divide out the small primes, then split the cofactor with Pollard's rho method.
+    let mut primes = Vec::new();
+    for &p in WITNESSES.iter() {
+        while n % p == 0 {
+            primes.push(p);
+            n /= p;
+        }
+    }
+    let mut stack = if n > 1 { vec![n] } else { vec![] };
+    while let Some(m) = stack.pop() {
+        if is_prime_u64(m) {
+            primes.push(m);
+        } else {
+            let d = pollard_rho(m);
+            stack.push(d);
+            stack.push(m / d);
+        }
+    }
+    primes.sort_unstable();
+    let mut factors: Vec<(u64, u32)> = Vec::new();
+    for p in primes {
+        match factors.last_mut() {
+            Some((q, e)) if *q == p => *e += 1,
+            _ => factors.push((p, 1)),
+        }
+    }
+    factors
+}
+
+fn totient_u64(n: u64) -> u64 {
+    factorize_u64(n).iter().fold(n, |result, &(p, _)| result / p * (p - 1))
+}
+
+fn divisors_u64(n: u64) -> Vec<u64> {
+    let mut result = vec![1u64];
+    for (p, e) in factorize_u64(n) {
+        let count = result.len();
+        let mut power = 1u64;
+        for _ in 0..e {
+            power *= p;
+            for i in 0..count {
+                result.push(result[i] * power);
+            }
+        }
+    }
+    result.sort_unstable();
+    result
+}
+
+fn small_primes(limit: u64) -> Vec<u64> {
+    // The primes up to limit, by the sieve of Eratosthenes.
+    let limit = limit as usize;
+    let mut composite = vec![false; limit + 1];
+    let mut primes = Vec::new();
+    for p in 2..=limit {
+        if !composite[p] {
+            primes.push(p as u64);
+            let mut multiple = p * p;
+            while multiple <= limit {
+                composite[multiple] = true;
+                multiple += p;
+            }
+        }
+    }
+    primes
+}
+
+fn sieve_segment(low: u64, high: u64, base: &[u64]) -> Vec<u64> {
+    // The primes in [low, high), crossing off multiples of the base primes.
+    let mut composite = vec![false; (high - low) as usize];
+    for &p in base {
+        if p.saturating_mul(p) >= high {
+            break
+        }
+        let mut multiple = std::cmp::max(p * p, (low + p - 1) / p * p);
+        while multiple < high {
+            composite[(multiple - low) as usize] = true;
+            multiple += p;
+        }
+    }
+    composite
+        .iter()
+        .enumerate()
+        .filter(|&(_, &c)| !c)
+        .map(|(i, _)| low + i as u64)
+        .collect()
+}
+
+fn primes_in_range(start: u64, stop: u64) -> Vec<u64> {
+    // Segmented sieve of Eratosthenes, one rayon task per segment.
+    let start = std::cmp::max(start, 2);
+    if stop <= start {
+        return Vec::new()
+    }
+    let base = small_primes(isqrt(stop - 1));
+    let lows: Vec<u64> = (start..stop).step_by(SEGMENT_SIZE as usize).collect();
+    lows.par_iter()
+        .map(|&low| {
+            let high = std::cmp::min(low.saturating_add(SEGMENT_SIZE), stop);
+            sieve_segment(low, high, &base)
+        })
+        .collect::<Vec<_>>()
+        .concat()
+}
+
+#[pyfunction]
+fn is_prime(n: u64) -> bool {
+    is_prime_u64(n)
+}
+
+#[pyfunction]
+fn factorize(n: u64) -> Vec<(u64, u32)> {
+    // Prime factorization as (p, e) pairs in increasing order of p.
+    factorize_u64(n)
+}
+
+#[pyfunction]
+fn totient(n: u64) -> u64 {
+    totient_u64(n)
+}
+
+#[pyfunction]
+fn divisors(n: u64) -> Vec<u64> {
+    divisors_u64(n)
+}
+
+#[pyfunction]
+fn primes_between(py: Python, start: u64, stop: u64) -> Py<PyArray1<u64>> {
+    // The primes in [start, stop), sieved without holding the GIL.
+    let primes = py.allow_threads(|| primes_in_range(start, stop));
+    primes.into_pyarray(py).into()
+}
+
+#[pyfunction]
+fn is_prime_many(py: Python, values: PyReadonlyArray1<u64>) -> Py<PyArray1<bool>> {
+    let values = values.as_array().to_vec();
+    let result: Vec<bool> =
+        py.allow_threads(|| values.par_iter().map(|&n| is_prime_u64(n)).collect());
+    result.into_pyarray(py).into()
+}
+
+#[pyfunction]
+fn totient_many(py: Python, values: PyReadonlyArray1<u64>) -> Py<PyArray1<u64>> {
+    let values = values.as_array().to_vec();
+    let result: Vec<u64> =
+        py.allow_threads(|| values.par_iter().map(|&n| totient_u64(n)).collect());
+    result.into_pyarray(py).into()
+}
+
 #[pymodule]
 fn nt_utils(_py: Python, m: &PyModule) -> PyResult<()> {
     // Corresponding Python module.
     m.add_function(wrap_pyfunction!(is_prime, m)?)?;
+    m.add_function(wrap_pyfunction!(factorize, m)?)?;
+    m.add_function(wrap_pyfunction!(totient, m)?)?;
+    m.add_function(wrap_pyfunction!(divisors, m)?)?;
+    m.add_function(wrap_pyfunction!(primes_between, m)?)?;
+    m.add_function(wrap_pyfunction!(is_prime_many, m)?)?;
+    m.add_function(wrap_pyfunction!(totient_many, m)?)?;
     Ok(())
-} 
+}
 
 #[cfg(test)]
 mod tests {
     use super::*;
-    
+
     #[test]
     fn test_is_prime() {
-        assert_eq!(is_prime(2), true);
-        assert_eq!(is_prime(3), true);
-        assert_eq!(is_prime(4), false);
-        assert_eq!(is_prime(5), true);
-        assert_eq!(is_prime(29), true);
-        assert_eq!(is_prime(30), false);
+        assert_eq!(is_prime_u64(1), false);
+        assert_eq!(is_prime_u64(2), true);
+        assert_eq!(is_prime_u64(3), true);
+        assert_eq!(is_prime_u64(4), false);
+        assert_eq!(is_prime_u64(5), true);
+        assert_eq!(is_prime_u64(29), true);
+        assert_eq!(is_prime_u64(30), false);
+        // Carmichael number and a strong pseudoprime to base 2.
+        assert_eq!(is_prime_u64(561), false);
+        assert_eq!(is_prime_u64(2047), false);
+        assert_eq!(is_prime_u64((1 << 61) - 1), true);
+        assert_eq!(is_prime_u64(18446744073709551557), true);
+        assert_eq!(is_prime_u64(u64::MAX), false);
+    }
+
+    #[test]
+    fn test_factorize() {
+        assert_eq!(factorize_u64(1), vec![]);
+        assert_eq!(factorize_u64(360), vec![(2, 3), (3, 2), (5, 1)]);
+        assert_eq!(factorize_u64(600851475143), vec![(71, 1), (839, 1), (1471, 1), (6857, 1)]);
+        assert_eq!(factorize_u64(4294967291 * 4294967279), vec![(4294967279, 1), (4294967291, 1)]);
+    }
+
+    #[test]
+    fn test_totient_and_divisors() {
+        let totients: Vec<u64> = (1..11).map(totient_u64).collect();
+        assert_eq!(totients, vec![1, 1, 2, 2, 4, 2, 6, 4, 6, 4]);
+        assert_eq!(divisors_u64(12), vec![1, 2, 3, 4, 6, 12]);
+    }
+
+    #[test]
+    fn test_primes_in_range() {
+        assert_eq!(primes_in_range(0, 30), vec![2, 3, 5, 7, 11, 13, 17, 19, 23, 29]);
+        let naive: Vec<u64> = (1000000..1001000).filter(|&n| is_prime_u64(n)).collect();
+        assert_eq!(primes_in_range(1000000, 1001000), naive);
+        assert_eq!(primes_in_range(0, 1000000).len(), 78498);
     }
 }
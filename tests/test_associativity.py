@@ -0,0 +1,80 @@
+import yaml
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from cayley_tables import cayley, parallel
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+# x * y = 2x - y mod 5 is a quasigroup with identity-free rows, but not associative.
+nonassociative = np.array([[(2 * x - y) % 5 for y in range(5)] for x in range(5)])
+# Z/12Z with a single entry of the addition table swapped.
+mod12 = np.add.outer(np.arange(12), np.arange(12)) % 12
+broken_mod12 = mod12.copy()
+broken_mod12[[5, 5], [7, 8]] = broken_mod12[[5, 5], [8, 7]]
+# The smallest loop which is not a group: identity 0 and every element is its own inverse.
+loop5 = np.array([[0, 1, 2, 3, 4],
+                  [1, 0, 3, 4, 2],
+                  [2, 4, 0, 1, 3],
+                  [3, 2, 4, 0, 1],
+                  [4, 3, 1, 2, 0]])
+
+
+@pytest.mark.parametrize('method', cayley.ASSOCIATIVITY_METHODS)
+def test_valid_tables_associative(method):
+    for name in valid_tables:
+        table = cayley.CayleyTable(valid_tables[name], check_axioms=method)
+        assert (table.find_nonassociative_triple(method, seed=0) is None)
+
+
+@pytest.mark.parametrize('method', cayley.ASSOCIATIVITY_METHODS)
+def test_counterexample_is_genuine(method):
+    for array in (nonassociative, broken_mod12, loop5):
+        table = cayley.CayleyTable.from_array(array, check_axioms=False)
+        a, b, c = table.find_nonassociative_triple(method, seed=0)
+        assert (table.op(table.op(a, b), c) != table.op(a, table.op(b, c)))
+
+
+def test_generating_set_mod12():
+    table = cayley.CayleyTable.from_array(mod12)
+    assert (table._generating_set() == [0, 1])
+
+
+def test_error_message_reports_triple():
+    with pytest.raises(ValueError) as e:
+        cayley.CayleyTable.from_array(loop5, check_axioms='light')
+    assert ('Associativity fails' in str(e.value))
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        cayley.CayleyTable(valid_tables['cayley_mod3'], check_axioms='fast')
+    with pytest.raises(ValueError):
+        cayley.CayleyTable(valid_tables['cayley_mod3'], check_axioms='random', error_bound=0)
+
+
+def test_parallel_matches_exact():
+    for array in (nonassociative, broken_mod12, loop5, mod12):
+        table = cayley.CayleyTable.from_array(array, check_axioms=False)
+        expected = table.find_nonassociative_triple('exact')
+        for workers in (1, 3):
+            assert (table.find_nonassociative_triple('parallel', workers=workers) == expected)
+            assert (parallel.find_counterexample(table.array, workers, rows_per_task=1)
+                    == table._exact_counterexample())
+
+
+def test_parallel_workers():
+    table = cayley.CayleyTable.from_array(mod12, check_axioms='parallel', workers=2)
+    assert (table.workers == 2)
+    with pytest.raises(ValueError):
+        cayley.CayleyTable.from_array(mod12, check_axioms='parallel', workers=0)
+    with pytest.raises(ValueError) as e:
+        cayley.CayleyTable.from_array(loop5, check_axioms='parallel', workers=2)
+    assert ('Associativity fails' in str(e.value))
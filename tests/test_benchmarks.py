@@ -0,0 +1,47 @@
+import json
+from benchmarks import suite
+
+
+def test_run_small():
+    results = suite.run(orders=[6, 12], repeats=1, memory=False)
+    json.loads(json.dumps(results))
+    names = [result['name'] for result in results['results']]
+    assert (len(names) == len(set(names)))
+    by_name = {result['name']: result for result in results['results']}
+    assert (by_name['validate/exact[dihedral-12]']['seconds'] >= 0)
+    assert (by_name['is_subgroup[config-s3]']['order'] == 6)
+    products = ('C2 x C6', 'C3 x C4', 'C4 x C3', 'C6 x C2', 'D1 x C6', 'D2 x C3', 'D3 x C2')
+    assert (by_name['construct/python[product-12]']['group'] in products)
+    rust = by_name['construct/rust[cyclic-6]']
+    assert (('skipped' in rust) != results['metadata']['rust']['gen_cyclic_cayley'])
+    assert ('nt/primes/python[nt-12]' in by_name)
+
+
+def test_limits_and_memory():
+    results = suite.run(families=['cyclic'], orders=[20], repeats=1, limits={'exact': 10})
+    by_name = {result['name']: result for result in results['results']}
+    assert ('skipped' in by_name['validate/exact[cyclic-20]'])
+    assert (by_name['memory[cyclic-20]']['peak_bytes'] > 0)
+
+
+def test_compare():
+    baseline = {'results': [{'name': 'a', 'seconds': 1.0}, {'name': 'b', 'seconds': 1.0},
+                            {'name': 'c', 'peak_bytes': 100}, {'name': 'd', 'seconds': 1e-5},
+                            {'name': 'e', 'skipped': 'Rust extension not built'}]}
+    current = {'results': [{'name': 'a', 'seconds': 2.0}, {'name': 'b', 'seconds': 1.1},
+                           {'name': 'c', 'peak_bytes': 200}, {'name': 'd', 'seconds': 1e-4},
+                           {'name': 'e', 'seconds': 1.0}, {'name': 'f', 'seconds': 1.0}]}
+    comparisons = suite.compare(current, baseline, threshold=1.25)
+    assert ([c['name'] for c in comparisons] == ['a', 'b', 'c', 'd'])
+    assert ([c['regression'] for c in comparisons] == [True, False, True, False])
+    assert (comparisons[0]['ratio'] == 2.0)
+
+
+def test_main(tmp_path):
+    output, baseline = tmp_path / 'results.json', tmp_path / 'baseline.json'
+    arguments = ['--families', 'cyclic', '--orders', '8', '--repeat', '1', '--quiet']
+    assert (suite.main(arguments + ['--output', str(baseline)]) == 0)
+    assert (json.loads(baseline.read_text())['results'])
+    status = suite.main(arguments + ['--output', str(output), '--baseline', str(baseline),
+                                     '--threshold', '1000'])
+    assert (status == 0)
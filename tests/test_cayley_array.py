@@ -0,0 +1,88 @@
+import yaml
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from cayley_tables import cayley
+from groups import group
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+with open('../config/invalid_tables.yml', 'r') as f:
+    invalid_tables = yaml.safe_load(f)
+
+cayley_d4 = cayley.CayleyTable(valid_tables['cayley_d4'])
+cayley_mod4 = cayley.CayleyTable(valid_tables['cayley_mod4'])
+
+
+def test_index_dtype():
+    assert (cayley.index_dtype(10) == np.uint8)
+    assert (cayley.index_dtype(255) == np.uint8)
+    assert (cayley.index_dtype(256) == np.uint16)
+    assert (cayley.index_dtype(70000) == np.uint32)
+
+
+def test_array_d4():
+    assert (cayley_d4.array.shape == (8, 8))
+    assert (cayley_d4.array.dtype == np.uint8)
+    r, s = cayley_d4.index_of('r'), cayley_d4.index_of('s')
+    assert (cayley_d4.elements[cayley_d4.array[r, s]] == 'sr^3')
+
+
+def test_table_view_matches_input():
+    assert (cayley_d4.table == valid_tables['cayley_d4'])
+    assert (cayley_mod4.table[3][2] == 1)
+    assert ('r^2' in cayley_d4.table)
+    assert ('x' not in cayley_d4.table)
+
+
+def test_from_array_mod4():
+    array = np.add.outer(np.arange(4), np.arange(4)) % 4
+    mod4 = cayley.CayleyTable.from_array(array)
+    assert (mod4.table == valid_tables['cayley_mod4'])
+    assert (mod4.get_identity() == 0)
+
+
+def test_from_array_copies():
+    array = (np.add.outer(np.arange(4), np.arange(4)) % 4).astype(np.uint8)
+    table = cayley.CayleyTable.from_array(array, check_axioms=False)
+    table.set_product(1, 1, 3)
+    assert (array[1, 1] == 2)
+    # Read-only arrays, such as the array of another table, are copied even with copy=False.
+    other = cayley.CayleyTable.from_array(table.array, check_axioms=False, copy=False)
+    other.set_product(1, 1, 2)
+    assert (table.op(1, 1) == 3)
+    owner = cayley.CayleyTable.from_array(array, check_axioms=False, copy=False)
+    owner.set_product(0, 0, 1)
+    assert (array[0, 0] == 1)
+
+
+def test_from_array_not_square():
+    with pytest.raises(ValueError):
+        cayley.CayleyTable.from_array(np.zeros((2, 3), dtype=int))
+
+
+def test_not_closed():
+    table = {0: {0: 0, 1: 1}, 1: {0: 1, 1: 2}}
+    not_closed = cayley.CayleyTable(table, check_axioms=False)
+    assert (not_closed._is_closed() is False)
+    assert (not_closed.table[1][1] == 2)
+
+
+def test_invalid_tables_rejected():
+    for name in invalid_tables:
+        with pytest.raises(ValueError):
+            cayley.CayleyTable(invalid_tables[name])
+
+
+def test_group_op():
+    klein4 = group.Group(valid_tables['cayley_klein4'])
+    assert (klein4.op('a', 'b') == 'c')
+    with pytest.raises(KeyError):
+        klein4.op('a', 'x')
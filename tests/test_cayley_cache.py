@@ -0,0 +1,55 @@
+import yaml
+import sys
+import pytest
+from pathlib import Path
+from cayley_tables import cayley
+from groups import group
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+
+def test_inverse_indices_d4():
+    cayley_d4 = cayley.CayleyTable(valid_tables['cayley_d4'])
+    inverses = cayley_d4.inverse_indices()
+    assert ([cayley_d4.elements[i] for i in inverses]
+            == ['e', 'r^3', 'r^2', 'r', 's', 'sr', 'sr^2', 'sr^3'])
+    assert (cayley_d4.inverse_indices() is inverses)
+
+
+def test_array_is_read_only():
+    cayley_mod3 = cayley.CayleyTable(valid_tables['cayley_mod3'])
+    with pytest.raises(ValueError):
+        cayley_mod3.array[0, 0] = 1
+
+
+def test_set_product_invalidates_cache():
+    cayley_mod3 = cayley.CayleyTable(valid_tables['cayley_mod3'])
+    assert (cayley_mod3.get_identity() == 0)
+    assert (cayley_mod3.get_inverse(1) == 2)
+    assert (cayley_mod3.is_abelian() is True)
+    cayley_mod3.set_product(1, 2, 1)
+    assert (cayley_mod3.table[1][2] == 1)
+    assert (cayley_mod3.get_inverse(1) is None)
+    assert (cayley_mod3.is_abelian() is False)
+    assert (cayley_mod3.is_group() is False)
+
+
+def test_table_view_assignment():
+    cayley_klein4 = cayley.CayleyTable(valid_tables['cayley_klein4'])
+    cayley_klein4.table['a']['a'] = 'x'
+    assert (cayley_klein4.table['a']['a'] == 'x')
+    assert (cayley_klein4._is_closed() is False)
+    cayley_klein4.table['a']['a'] = 'e'
+    assert (cayley_klein4.is_group() is True)
+
+
+def test_group_exposes_cache():
+    s3 = group.Group(valid_tables['cayley_s3'])
+    assert (s3.inverse_indices() is s3.cayley_table.inverse_indices())
+    assert (s3.get_inverse('p') == 'q')
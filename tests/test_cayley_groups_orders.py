@@ -1,3 +1,4 @@
+import math
 import yaml
 import sys
 import pytest
@@ -73,6 +74,12 @@ def test_order_1_mod4():
 def test_order_q_s3():
     assert (cayley_s3.get_order_of_element('q') == 3)
 
+
+def test_order_invalid_element():
+    for element in ('x', ['a'], {'e': 'e'}):
+        with pytest.raises(ValueError):
+            cayley_s3.get_order_of_element(element)
+
 # Testing get_elements_of_order
     
 
@@ -90,3 +97,25 @@ def test_elts_order_4_mod4():
 
 def test_elts_order_2_klein4():
     assert (cayley_klein4.get_elements_of_order(2) == {'a', 'b', 'c'})
+
+# Testing element_orders and order_histogram
+
+
+def test_element_orders_d4():
+    assert (list(cayley_d4.element_orders()) == [1, 4, 2, 4, 2, 2, 2, 2])
+
+
+def test_order_histogram_s3():
+    assert (cayley_s3.order_histogram() == {1: 1, 2: 3, 3: 2})
+
+
+def test_order_histogram_mod4():
+    assert (cayley_mod4.order_histogram() == {1: 1, 2: 1, 4: 2})
+
+
+def test_element_orders_large_cyclic():
+    n = 360
+    mod_n = cayley.CayleyTable({i: {j: (i + j) % n for j in range(n)} for i in range(n)},
+                               check_axioms=False)
+    assert (all(mod_n.get_order_of_element(k) == n // math.gcd(k, n) for k in range(n)))
+    assert (sum(mod_n.order_histogram().values()) == n)
@@ -0,0 +1,66 @@
+import yaml
+import sys
+from pathlib import Path
+from groups import group
+from groups.dihedral_group import DihedralGroup
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+d4 = group.Group(valid_tables['cayley_d4'])
+s3 = group.Group(valid_tables['cayley_s3'])
+klein4 = group.Group(valid_tables['cayley_klein4'])
+
+
+def brute_force_classes(G):
+    # Conjugacy classes by conjugating every element by every element.
+    classes = set()
+    for g in G.elements:
+        classes.add(frozenset(G.op(G.op(G.get_inverse(h), g), h) for h in G.elements))
+    return classes
+
+
+def test_conjugacy_classes_match_brute_force():
+    for G in (d4, s3, klein4, DihedralGroup(7), DihedralGroup(12)):
+        assert (set(map(frozenset, G.conjugacy_classes())) == brute_force_classes(G))
+
+
+def test_conjugacy_classes_d4():
+    assert (sorted(len(c) for c in d4.conjugacy_classes()) == [1, 1, 2, 2, 2])
+    assert (['r', 'r^3'] in d4.conjugacy_classes())
+
+
+def test_center():
+    assert (set(d4.center()) == {'e', 'r^2'})
+    assert (set(s3.center()) == {'e'})
+    assert (klein4.center().order() == 4)
+    assert (DihedralGroup(12).center().order() == 2)
+    assert (DihedralGroup(9).center().order() == 1)
+
+
+def test_centralizer():
+    assert (set(d4.centralizer('r')) == {'e', 'r', 'r^2', 'r^3'})
+    assert (set(d4.centralizer('s')) == {'e', 's', 'r^2', 'sr^2'})
+    assert (d4.centralizer('e').order() == 8)
+    assert (d4.centralizer('r') is d4.centralizer('r'))
+
+
+def test_class_equation():
+    # |G| = sum of |G| / |C(g)| over class representatives.
+    G = DihedralGroup(10)
+    assert (sum(G.order() // G.centralizer(c[0]).order()
+                for c in G.conjugacy_classes()) == G.order())
+
+
+def test_is_abelian_from_center():
+    G = group.Group(valid_tables['cayley_s3'])
+    G.center()
+    assert ('abelian' not in G.cayley_table._cache)
+    assert (G.is_abelian() is False)
+    assert ('abelian' not in G.cayley_table._cache)
+    assert (group.Group(valid_tables['cayley_klein4']).is_abelian() is True)
@@ -0,0 +1,76 @@
+import pytest
+from groups.group import Group
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.permutation_group import PermutationGroup
+
+d6 = DihedralGroup(6)
+s4 = PermutationGroup.symmetric(4)
+# The Klein four group, normal in S_4.
+klein = s4.generated_subgroup([(1, 0, 3, 2), (2, 3, 0, 1)])
+
+
+def brute_force_cosets(G, subgroup, side):
+    cosets = set()
+    for g in G.elements:
+        if side == 'left':
+            cosets.add(frozenset(G.op(g, h) for h in subgroup))
+        else:
+            cosets.add(frozenset(G.op(h, g) for h in subgroup))
+    return cosets
+
+
+def test_cosets():
+    subgroups = [(d6, d6.generated_subgroup([d6.n_vertices])), (d6, d6.center()),
+                 (d6, d6.generated_subgroup([2])), (s4, klein),
+                 (s4, s4.generated_subgroup([(1, 2, 0, 3)]))]
+    for G, H in subgroups:
+        for side, cosets in (('left', G.left_cosets(H)), ('right', G.right_cosets(H))):
+            assert (len(cosets) * H.order() == G.order())
+            assert (all(len(coset) == H.order() for coset in cosets))
+            assert (set(map(frozenset, cosets)) == brute_force_cosets(G, H, side))
+        assert (G.left_cosets(H)[0] == sorted(H.elements, key=G.cayley_table.index_of))
+
+
+def test_cosets_from_elements():
+    C = CyclicGroup(12)
+    assert (C.left_cosets([0, 4, 8]) == [[0, 4, 8], [1, 5, 9], [2, 6, 10], [3, 7, 11]])
+    assert (C.right_cosets([0, 6]) == C.left_cosets([0, 6]))
+
+
+def test_is_normal():
+    assert (d6.is_normal(d6.generated_subgroup([1])))
+    assert (d6.is_normal(d6.center()))
+    assert (not d6.is_normal(d6.generated_subgroup([d6.n_vertices])))
+    assert (s4.is_normal(klein))
+    assert (not s4.is_normal(s4.generated_subgroup([(1, 0, 2, 3)])))
+    # H is normal iff its left and right cosets agree.
+    for H in d6.subgroups():
+        assert (d6.is_normal(H) == (d6.left_cosets(H) == d6.right_cosets(H)))
+
+
+def test_quotient():
+    Q = s4.quotient(klein)
+    assert (Q.order() == 6)
+    assert (Q.cayley_table.is_group('exact'))
+    assert (Q.is_isomorphic(PermutationGroup.symmetric(3)))
+    assert (set(Q.elements) <= set(s4.elements))
+    assert (d6.quotient(d6.generated_subgroup([1])).is_isomorphic(CyclicGroup(2)))
+    assert (d6.quotient(d6.center()).is_isomorphic(DihedralGroup(3)))
+    C = CyclicGroup(12)
+    assert (C.quotient([0, 4, 8]).is_isomorphic(CyclicGroup(4)))
+    assert (C.quotient([0]).is_isomorphic(C))
+    assert (C.quotient(C.elements).order() == 1)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        d6.quotient(d6.generated_subgroup([d6.n_vertices]))
+    with pytest.raises(ValueError):
+        d6.left_cosets([0, 1])
+    with pytest.raises(ValueError):
+        d6.cayley_table.coset_indices(d6.center(), side='middle')
+    with pytest.raises(ValueError):
+        s4.is_normal(d6.center())
+    table = {'e': {'e': 'e', 'a': 'a'}, 'a': {'e': 'a', 'a': 'e'}}
+    assert (Group(table).quotient(['e']).elements == ['e', 'a'])
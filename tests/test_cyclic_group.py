@@ -0,0 +1,112 @@
+import sys
+import pytest
+from pathlib import Path
+from cayley_tables import cayley, isomorphism
+from groups.cyclic_group import CyclicGroup, CyclicSubgroup
+from groups.product_group import DirectProduct
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+c12 = CyclicGroup(12)
+lazy_c12 = CyclicGroup(12, lazy=True)
+lazy_c100000 = CyclicGroup(100000, lazy=True)
+
+
+def test_lazy_matches_table():
+    for x in range(12):
+        assert (lazy_c12.get_inverse(x) == c12.cayley_table.get_inverse(x))
+        assert (lazy_c12.get_order_of_element(x) == c12.cayley_table.get_order_of_element(x))
+        for y in range(12):
+            assert (lazy_c12.op(x, y) == c12.cayley_table.op(x, y))
+    for d in range(1, 13):
+        assert (lazy_c12.get_elements_of_order(d) == c12.cayley_table.get_elements_of_order(d))
+    assert (lazy_c12.order_histogram() == c12.cayley_table.order_histogram())
+    assert (list(lazy_c12.element_orders()) == list(c12.cayley_table.element_orders()))
+
+
+def test_lazy_never_builds_table():
+    assert (lazy_c100000.order() == 100000)
+    assert (lazy_c100000.op(99999, 2) == 1)
+    assert (lazy_c100000.get_inverse(1) == 99999)
+    assert (lazy_c100000.get_order_of_element(2500) == 40)
+    assert (len(lazy_c100000.get_elements_of_order(100000)) == 40000)
+    assert (lazy_c100000.order_histogram()[2] == 1)
+    assert (lazy_c100000.is_abelian() is True)
+    H = lazy_c100000.generated_subgroup([25000, 40000])
+    assert (H.order() == 20 and 95000 in H and 2500 not in H)
+    assert (len(list(lazy_c100000.subgroups())) == 36)
+    assert (lazy_c100000.left_cosets(H)[1][:2] == [1, 5001])
+    assert (len(lazy_c100000.left_cosets([0, 50000])) == 50000)
+    assert (lazy_c100000.is_normal(lazy_c100000.subgroup_of_order(8)) is True)
+    assert (lazy_c100000.quotient([0, 50000]).order() == 50000)
+    assert (lazy_c100000.is_isomorphic(CyclicGroup(100000, lazy=True)) is True)
+    assert (len(lazy_c100000.center()) == 100000 and H.is_subgroup_of(lazy_c100000.center()))
+    assert (lazy_c100000._cayley_table is None)
+    with pytest.raises(ValueError):
+        lazy_c100000.subgroup_lattice()
+
+
+def test_lazy_table_on_request():
+    lazy_c5 = CyclicGroup(5, lazy=True)
+    assert (lazy_c5.cayley_table.table[3][4] == 2)
+    assert (lazy_c5.cayley_table.is_group() is True)
+
+
+def test_subgroups():
+    assert (lazy_c12.subgroup_of_order(4) == [0, 3, 6, 9])
+    assert (lazy_c12.is_subgroup([0, 4, 8]) is True)
+    assert (lazy_c12.is_subgroup([0, 3, 6]) is False)
+    assert (c12.is_subgroup([0, 6]) is True)
+    with pytest.raises(ValueError):
+        lazy_c12.subgroup_of_order(5)
+
+
+def test_subgroup_queries_match_table():
+    for subgroup in ([0, 4, 8], [0, 6], c12.generated_subgroup([3])):
+        assert (lazy_c12.left_cosets(subgroup) == c12.cayley_table.left_cosets(subgroup))
+        assert (lazy_c12.right_cosets(subgroup) == c12.cayley_table.right_cosets(subgroup))
+        assert (lazy_c12.is_normal(subgroup) is True)
+    assert (lazy_c12.generated_subgroup([8, 6]).elements
+            == c12.generated_subgroup([8, 6]).elements)
+    assert (sorted(H.elements for H in lazy_c12.subgroups())
+            == sorted(H.elements for H in c12.subgroups()))
+    assert (lazy_c12.conjugacy_classes() == c12.cayley_table.conjugacy_classes())
+    assert (lazy_c12.fingerprint() == isomorphism.fingerprint(c12.cayley_table))
+    assert (lazy_c12.quotient([0, 4, 8]).is_isomorphic(CyclicGroup(4)))
+    assert (not lazy_c12.is_isomorphic(DirectProduct(CyclicGroup(2), CyclicGroup(6))))
+    with pytest.raises(ValueError):
+        lazy_c12.left_cosets([0, 5])
+
+
+def test_lazy_subgroups_have_subgroup_interface():
+    # Lazy groups return CyclicSubgroups, eager ones Subgroup views, with the same interface.
+    lazy, eager = lazy_c12.generated_subgroup([9]), c12.generated_subgroup([9])
+    assert (isinstance(lazy, CyclicSubgroup) and isinstance(eager, cayley.Subgroup))
+    for H in (lazy, eager):
+        assert (H.order() == len(H) == 4 and list(H) == H.elements == [0, 3, 6, 9])
+        assert (H.indices.tolist() == [0, 3, 6, 9])
+        assert (6 in H and 4 not in H and 'x' not in H)
+        assert (H.op(9, 6) == 3)
+        assert (H.mask().sum() == 4 and H.bitset() == eager.bitset())
+        table = H.to_cayley_table()
+        assert (table.elements == [0, 3, 6, 9] and table.op(9, 6) == 3)
+        assert (isomorphism.is_isomorphic(table, CyclicGroup(4).cayley_table))
+        assert (H.is_subgroup_of(H))
+        with pytest.raises(KeyError):
+            H.op(1, 3)
+    assert (lazy == CyclicSubgroup(lazy_c12, 3) and hash(lazy) == hash(CyclicSubgroup(lazy_c12, 3)))
+    assert (lazy_c12.center().is_subgroup_of(lazy) is False)
+    assert (c12.cayley_table.left_cosets(lazy) == lazy_c12.left_cosets(lazy))
+    with pytest.raises(ValueError):
+        CyclicSubgroup(lazy_c12, 5)
+
+
+def test_invalid_elements():
+    with pytest.raises(KeyError):
+        lazy_c12.op(12, 0)
+    with pytest.raises(ValueError):
+        lazy_c12.get_order_of_element(-1)
+    with pytest.raises(ValueError):
+        CyclicGroup(0)
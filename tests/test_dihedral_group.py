@@ -0,0 +1,68 @@
+import yaml
+import sys
+import pytest
+from pathlib import Path
+from cayley_tables import cayley
+from groups.dihedral_group import DihedralGroup
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+d4 = DihedralGroup(4, lazy=True)
+d12 = DihedralGroup(12, lazy=False)
+
+
+def test_d4_matches_config():
+    labelled = cayley.CayleyTable.from_array(d4.cayley_table.array, elements=d4.labels())
+    assert (labelled.table == valid_tables['cayley_d4'])
+
+
+def test_labels_round_trip():
+    for element in d12.elements:
+        assert (d12.from_label(d12.label(element)) == element)
+    assert (d12.label(d12.from_label('sr^11')) == 'sr^11')
+    with pytest.raises(KeyError):
+        d12.from_label('r^12')
+
+
+def test_arithmetic_matches_table():
+    table = d12.cayley_table
+    for x in d12.elements:
+        assert (d12.get_inverse(x) == table.get_inverse(x))
+        assert (d12.get_order_of_element(x) == table.get_order_of_element(x))
+        for y in d12.elements:
+            assert (d12.op(x, y) == table.op(x, y))
+    for order in range(1, 13):
+        assert (d12.get_elements_of_order(order) == table.get_elements_of_order(order))
+    assert (d12.order_histogram() == table.order_histogram())
+    assert (list(d12.inverse_indices()) == list(table.inverse_indices()))
+
+
+def test_materialized_table_is_group():
+    assert (d12.cayley_table.is_group() is True)
+    assert (d12.is_abelian() is False)
+    assert (DihedralGroup(2).is_abelian() is True)
+
+
+def test_large_dihedral_is_lazy():
+    d5000 = DihedralGroup(5000, lazy=True)
+    assert (d5000.order() == 10000)
+    assert (d5000.label(d5000.op(d5000.from_label('r^4999'), d5000.from_label('s'))) == 'sr')
+    assert (len(d5000.get_elements_of_order(2)) == 5001)
+    assert (d5000._cayley_table is None)
+    # The table is built up front unless lazy mode is requested, as for CyclicGroup.
+    assert (DihedralGroup(5)._cayley_table is not None)
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        DihedralGroup(0)
+    with pytest.raises(TypeError):
+        DihedralGroup(2.5)
+    with pytest.raises(KeyError):
+        d4.op(8, 0)
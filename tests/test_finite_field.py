@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from fields.finite_field import FiniteField
+from groups.cyclic_group import CyclicGroup
+
+fields = [FiniteField(p, k) for p, k in ((2, 1), (3, 1), (7, 1), (2, 4), (3, 2), (5, 2), (3, 3))]
+gf9 = FiniteField(3, 2)
+
+
+def test_order_and_primitive_element():
+    for F in fields:
+        assert (F.q == F.p ** F.k)
+        assert (len(F.modulus) == F.k + 1 and F.modulus[-1] == 1)
+        powers = F.pow(F.primitive_element, np.arange(F.q - 1))
+        assert (sorted(powers.tolist()) == list(range(1, F.q)))
+
+
+def test_field_axioms():
+    rng = np.random.default_rng(0)
+    for F in fields:
+        a, b, c = rng.integers(0, F.q, (3, 500))
+        assert (np.array_equal(F.add(a, b), F.add(b, a)))
+        assert (np.array_equal(F.mul(a, b), F.mul(b, a)))
+        assert (np.array_equal(F.add(F.add(a, b), c), F.add(a, F.add(b, c))))
+        assert (np.array_equal(F.mul(F.mul(a, b), c), F.mul(a, F.mul(b, c))))
+        assert (np.array_equal(F.mul(a, F.add(b, c)), F.add(F.mul(a, b), F.mul(a, c))))
+        assert (np.array_equal(F.add(a, F.neg(a)), np.zeros(500)))
+        assert (np.array_equal(F.sub(F.add(a, b), b), a))
+        units = np.arange(1, F.q)
+        assert (np.array_equal(F.mul(units, F.inv(units)), np.ones(F.q - 1)))
+        assert (np.array_equal(F.mul(F.div(a, units[:1]), units[:1]), a))
+
+
+def test_prime_field_is_modular_arithmetic():
+    F = FiniteField(7)
+    a = np.arange(7)
+    assert (np.array_equal(F.add(a[:, None], a[None, :]), (a[:, None] + a[None, :]) % 7))
+    assert (np.array_equal(F.mul(a[:, None], a[None, :]), (a[:, None] * a[None, :]) % 7))
+
+
+def test_pow():
+    for F in fields:
+        a = np.arange(F.q)
+        # Fermat: a^q = a, and a^(q - 1) = 1 for a != 0.
+        assert (np.array_equal(F.pow(a, F.q), a))
+        assert (np.array_equal(F.pow(a[1:], F.q - 1), np.ones(F.q - 1)))
+        assert (np.array_equal(F.pow(a[1:], -1), F.inv(a[1:])))
+        assert (F.pow(0, 0) == 1 and F.pow(0, 3) == 0)
+        assert (F.pow(F.primitive_element, F.log(a[1:])).tolist() == a[1:].tolist())
+
+
+def test_scalars():
+    assert (gf9.add(4, 5) == 6 and isinstance(gf9.add(4, 5), int))
+    assert (gf9.mul(gf9.primitive_element, gf9.inv(gf9.primitive_element)) == 1)
+    assert (FiniteField(2, 3).add(5, 3) == 6)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        FiniteField(6)
+    with pytest.raises(ValueError):
+        FiniteField(3, 0)
+    with pytest.raises(ValueError):
+        gf9.add(9, 1)
+    with pytest.raises(ValueError):
+        gf9.mul(np.array([1, -1]), 2)
+    with pytest.raises(ZeroDivisionError):
+        gf9.inv(np.array([1, 0]))
+    with pytest.raises(ZeroDivisionError):
+        gf9.pow(0, -1)
+
+
+def test_additive_group():
+    G = gf9.additive_group()
+    assert (G.order() == 9 and G.get_identity() == 0 and G.is_abelian())
+    assert (G.order_histogram() == {1: 1, 3: 8})
+    assert (G.cayley_table.is_group('exact'))
+    assert (G.cayley_table.order_histogram() == G.order_histogram())
+    assert (G.op(G.get_inverse(5), 5) == 0)
+    with pytest.raises(KeyError):
+        G.op(9, 1)
+
+
+def test_multiplicative_group():
+    for F in fields:
+        G = F.multiplicative_group()
+        assert (G.order() == F.q - 1 and G.get_identity() == 1)
+        assert (G.cayley_table.is_group('exact'))
+        assert (G.cayley_table.order_histogram() == G.order_histogram())
+        assert (G.get_order_of_element(F.primitive_element) == F.q - 1)
+        for d in G.order_histogram():
+            assert (G.get_elements_of_order(d) == set(G.cayley_table.get_elements_of_order(d)))
+        assert (G.is_isomorphic(CyclicGroup(F.q - 1)))
+    with pytest.raises(ValueError):
+        gf9.multiplicative_group().get_order_of_element(0)
@@ -0,0 +1,77 @@
+import pytest
+from cayley_tables import instrumentation, todd_coxeter
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.finitely_presented_group import FinitelyPresentedGroup
+from groups.permutation_group import PermutationGroup
+
+d4 = FinitelyPresentedGroup('rs', ['r^4', 's^2', 'srs = r^-1'])
+
+
+def test_dihedral():
+    assert (d4.elements == ['e', 'r', 'r^-1', 's', 'r^2', 'rs', 'r^-1s', 'r^2s'])
+    assert (d4.cayley_table.is_group('exact'))
+    assert (d4.is_isomorphic(DihedralGroup(4)))
+    assert (d4.evaluate('srs') == 'r^-1' and d4.evaluate('s r^5 s') == 'r^-1')
+    assert (d4.evaluate([('r', 2), 's', 's']) == 'r^2')
+    assert (d4.op('rs', 'r') == d4.evaluate('r s r') == 's')
+    assert (d4.op('r', 'rs') == 'r^2s')
+    assert (d4.word_of('r^-1s') == [('r', -1), ('s', 1)])
+    d100 = FinitelyPresentedGroup(['r', 's'], ['r^100', 's^2', '(s*r)^2'])
+    assert (d100.order() == 200 and d100.is_isomorphic(DihedralGroup(100)))
+
+
+def test_presentations():
+    quaternion = FinitelyPresentedGroup('ij', ['i^4', 'i^2 = j^2', 'j^-1 i j = i^-1'])
+    assert (quaternion.order_histogram() == {1: 1, 2: 1, 4: 6})
+    a5 = FinitelyPresentedGroup(['a', 'b'], ['a^2', 'b^3', '(a*b)^5'])
+    assert (a5.order() == 60 and a5.cayley_table.is_group('light'))
+    assert (a5.center().order() == 1)
+    s5 = FinitelyPresentedGroup('ab', ['a^2', 'b^5', '(ab)^4', '(a b^-1 a b)^3'])
+    assert (s5.is_isomorphic(PermutationGroup.symmetric(5)))
+    # Relators which collapse the group force coincidences.
+    assert (FinitelyPresentedGroup('x', ['x^6', 'x^4']).is_isomorphic(CyclicGroup(2)))
+    assert (FinitelyPresentedGroup('xy', ['x', 'y^3']).elements == ['e', 'y', 'y^-1'])
+    assert (FinitelyPresentedGroup('x', ['1', 'x x^-1 x']).elements == ['e'])
+
+
+def test_invalid_words():
+    for word in ('r^', 't', 'r)', '(r', 'r = s = e', 'r + s'):
+        with pytest.raises(ValueError):
+            d4.parse_word(word)
+    with pytest.raises(ValueError):
+        FinitelyPresentedGroup(['e', 'x'], ['x'])
+    with pytest.raises(ValueError):
+        FinitelyPresentedGroup(['x', 'x'], ['x'])
+
+
+def test_coset_limit_and_progress():
+    # The infinite dihedral group, and Z x Z, never close up.
+    with pytest.raises(RuntimeError):
+        FinitelyPresentedGroup('rs', ['s^2', '(sr)^2'], max_cosets=1000)
+    with pytest.raises(RuntimeError):
+        FinitelyPresentedGroup('xy', ['x y x^-1 y^-1'], max_cosets=1000)
+    progress = []
+    FinitelyPresentedGroup('rs', ['r^50', 's^2', '(sr)^2'], callback=progress.append,
+                           callback_interval=16)
+    assert (len(progress) >= 6)
+    assert (progress[-1]['live'] == 100)
+    assert (all(p['defined'] >= p['live'] for p in progress))
+
+
+def test_enumerate_cosets():
+    # The cosets of <s> in D_6, the dihedral group of order 12, correspond to the 6 vertices.
+    r, s = 0, 2
+    table = todd_coxeter.enumerate_cosets(2, [[r] * 6, [s, s], [s, r, s, r]], subgroup=[[s]])
+    assert (table.shape == (6, 4))
+    assert (table[0, s] == 0)
+    assert (sorted(table[:, r]) == list(range(6)))
+    with pytest.raises(ValueError):
+        todd_coxeter.enumerate_cosets(1, [[2]])
+
+
+def test_skips_axiom_check():
+    with instrumentation.profile() as profile:
+        FinitelyPresentedGroup('rs', ['r^30', 's^2', 'srs = r^-1'])
+    assert ('validate' not in profile.timers)
+    assert (profile.counters['tables'] == 1)
@@ -0,0 +1,57 @@
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from cayley_tables import cayley, generators
+from groups import group
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+def test_cyclic_array():
+    array = generators.cyclic_array(300, use_rust=False)
+    assert (array.dtype == np.uint16)
+    assert (array[299, 2] == 1)
+    assert (cayley.CayleyTable.from_array(array, check_axioms='light').is_abelian() is True)
+
+
+@pytest.mark.parametrize('n_vertices', [1, 2, 3, 4, 11])
+def test_dihedral_array_is_group(n_vertices):
+    array = generators.dihedral_array(n_vertices, use_rust=False)
+    table = cayley.CayleyTable.from_array(array)
+    assert (table.order() == 2 * n_vertices)
+    assert (table.is_abelian() is (n_vertices <= 2))
+
+
+def test_dihedral_array_relations():
+    array = generators.dihedral_array(4, use_rust=False)
+    r, s = 1, 4
+    # s r s = r^-1
+    assert (array[array[s, r], s] == 3)
+
+
+def test_direct_product_array():
+    c2 = generators.cyclic_array(2, use_rust=False)
+    c3 = generators.cyclic_array(3, use_rust=False)
+    klein4 = cayley.CayleyTable.from_array(generators.direct_product_array(c2, c2, use_rust=False))
+    assert (klein4.order_histogram() == {1: 1, 2: 3})
+    c6 = cayley.CayleyTable.from_array(generators.direct_product_array(c2, c3, use_rust=False))
+    assert (c6.order_histogram() == {1: 1, 2: 1, 3: 2, 6: 2})
+
+
+@pytest.mark.skipif(generators.gcc is None, reason='Rust extension not built')
+def test_rust_matches_numpy():
+    for n in (1, 7, 256, 300):
+        assert (np.array_equal(generators.cyclic_array(n), generators.cyclic_array(n, False)))
+        assert (np.array_equal(generators.dihedral_array(n), generators.dihedral_array(n, False)))
+    c4, c5 = generators.cyclic_array(4), generators.cyclic_array(5)
+    assert (np.array_equal(generators.direct_product_array(c4, c5),
+                           generators.direct_product_array(c4, c5, use_rust=False)))
+
+
+def test_group_from_array():
+    c4 = group.Group(generators.cyclic_array(4, use_rust=False), elements=['e', 'a', 'b', 'c'])
+    assert (c4.op('a', 'c') == 'e')
+    assert (c4.get_inverse('a') == 'c')
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from cayley_tables import isomorphism
+from cayley_tables.homomorphism import Homomorphism, are_homomorphisms
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.permutation_group import PermutationGroup
+
+c12 = CyclicGroup(12)
+c4 = CyclicGroup(4)
+c2 = CyclicGroup(2)
+s4 = PermutationGroup.symmetric(4)
+
+
+def test_from_images():
+    phi = Homomorphism(c12, c4, np.arange(12) % 4)
+    assert (phi(7) == 3)
+    assert (phi.map_indices([[5, 6], [7, 8]]).tolist() == [[1, 2], [3, 0]])
+    assert (phi.kernel().elements == [0, 4, 8])
+    assert (phi.image().order() == 4)
+    assert (phi.is_surjective() and not phi.is_injective())
+    assert (c12.is_normal(phi.kernel()))
+    with pytest.raises(ValueError):
+        Homomorphism(c12, c4, (np.arange(12) + 1) % 4)
+    with pytest.raises(ValueError):
+        Homomorphism(c12, c4, np.arange(4))
+    # Without the check any map is accepted.
+    assert (Homomorphism(c12, c4, np.ones(12, dtype=int), check=False).image().order() == 1)
+
+
+def test_from_generators():
+    # The sign of a permutation, from the images of a transposition and a 4-cycle.
+    sign = Homomorphism(s4, c2, {(1, 0, 2, 3): 1, (1, 2, 3, 0): 1})
+    assert (sign.kernel().order() == 12)
+    assert (sign((1, 2, 0, 3)) == 0 and sign((1, 0, 3, 2)) == 0)
+    assert (s4.quotient(sign.kernel()).is_isomorphic(c2))
+    d6, d3 = DihedralGroup(6), DihedralGroup(3)
+    phi = Homomorphism(d6, d3, {1: 1, 6: 3})
+    assert (phi.kernel() == d6.center())
+    assert (phi.is_surjective())
+    assert (are_homomorphisms(d6, d3, phi.images)[0])
+
+
+def test_invalid_generator_images():
+    with pytest.raises(ValueError):
+        Homomorphism(c12, CyclicGroup(5), {1: 1})
+    # 2 does not generate C_12.
+    with pytest.raises(ValueError):
+        Homomorphism(c12, c4, {2: 2})
+    with pytest.raises(KeyError):
+        Homomorphism(c12, c4, {12: 0})
+
+
+def test_are_homomorphisms():
+    c6 = CyclicGroup(6)
+    maps = np.arange(6)[:, None] * np.arange(6)[None, :] % 6
+    assert (are_homomorphisms(c6, c6, maps).all())
+    rng = np.random.default_rng(0)
+    random_maps = np.array([rng.permutation(6) for _ in range(50)])
+    expected = [all((m[(a + b) % 6] == (m[a] + m[b]) % 6) for a in range(6) for b in range(6))
+                for m in random_maps]
+    assert (are_homomorphisms(c6, c6, random_maps).tolist() == expected)
+    trivial = CyclicGroup(1)
+    assert (are_homomorphisms(trivial, c6, [[0], [1]]).tolist() == [True, False])
+
+
+def test_compose():
+    phi = Homomorphism(c12, c4, np.arange(12) % 4)
+    psi = Homomorphism(c4, c2, np.arange(4) % 2)
+    composite = psi.compose(phi)
+    assert (composite.images.tolist() == (np.arange(12) % 2).tolist())
+    assert (composite.kernel().order() == 6)
+    with pytest.raises(ValueError):
+        phi.compose(psi)
+
+
+def test_isomorphism():
+    d4 = DihedralGroup(4)
+    p4 = PermutationGroup.dihedral(4)
+    phi = Homomorphism(d4, p4, isomorphism.find_isomorphism(d4, p4))
+    assert (phi.is_isomorphism())
+    assert (phi.as_dict()[0] == p4.get_identity())
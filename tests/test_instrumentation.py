@@ -0,0 +1,72 @@
+import json
+import yaml
+from cayley_tables import instrumentation
+from cayley_tables.cayley import CayleyTable
+from groups.cyclic_group import CyclicGroup
+from groups.group import Group
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+
+def test_phases_and_counters():
+    with instrumentation.profile() as profile:
+        group = Group(valid_tables['cayley_s3'], check_axioms='light')
+        group.op('e', 'e')
+        group.op_many([0, 1, 2], [1, 2, 3])
+        group.cayley_table.table['e']['e']
+        group.inverse_indices()
+    timers = profile.timers
+    for phase in ('group/construct', 'construct/dict', 'validate', 'validate/closure',
+                  'validate/latin_square', 'validate/identity', 'validate/inverses',
+                  'validate/associativity', 'validate/associativity/light', 'compute/inverses'):
+        assert (timers[phase]['calls'] >= 1 and timers[phase]['seconds'] >= 0)
+    assert (timers['validate/latin_square']['calls'] == 2)
+    assert (timers['group/construct']['seconds'] >= timers['validate']['seconds'])
+    counters = profile.counters
+    assert (counters['lookups'] == 5)
+    assert (counters['cache_misses/inverses'] == 1 and counters['cache_hits/inverses'] == 1)
+    assert (counters['cache_hits'] + counters['cache_misses'] > 2)
+    assert (counters['tables'] == 1)
+    assert (profile.memory == {'table_bytes': 36, 'tables_bytes': 36})
+
+
+def test_disabled_and_nested():
+    CyclicGroup(10).is_abelian()
+    with instrumentation.profile() as outer:
+        table = CyclicGroup(12).cayley_table
+        with instrumentation.profile() as inner:
+            table.inverse_indices()
+        assert (instrumentation.active_profiles() == [outer])
+        table.inverse_indices()
+    assert (instrumentation.active_profiles() == [])
+    table.inverse_indices()
+    assert ('generate/cyclic/python' in outer.timers or 'generate/cyclic/rust' in outer.timers)
+    assert ('generate/cyclic/python' not in inner.timers)
+    assert (inner.counters['cache_misses/inverses'] == 1 and 'cache_hits' not in inner.counters)
+    assert (outer.counters['cache_hits/inverses'] == 1)
+    assert (outer.counters['cache_misses/inverses'] == 1)
+
+
+def test_callback_and_export():
+    events = []
+    with instrumentation.profile(events.append) as profile:
+        CayleyTable.from_array(CyclicGroup(5).cayley_table.array, check_axioms=True)
+    assert ({'type': 'memory', 'name': 'table_bytes', 'value': 25} in events)
+    names = [event['name'] for event in events if event['type'] == 'timer']
+    assert (names.index('validate/closure') < names.index('validate'))
+    exported = json.loads(profile.to_json())
+    assert (exported == profile.as_dict())
+    assert (set(exported) == {'timers', 'counters', 'memory'})
+    profile.reset()
+    assert (profile.as_dict() == {'timers': {}, 'counters': {}, 'memory': {}})
+
+
+def test_memory_footprint():
+    group = Group(CyclicGroup(100).cayley_table.array, check_axioms=False)
+    footprint = group.memory_footprint()
+    assert (footprint['array'] == 100 * 100 and footprint['cache'] == 0)
+    group.element_orders()
+    footprint = group.memory_footprint()
+    assert (footprint['cache'] > 0)
+    assert (footprint['total'] == footprint['array'] + footprint['cache'])
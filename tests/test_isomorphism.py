@@ -0,0 +1,74 @@
+import yaml
+import sys
+import numpy as np
+from pathlib import Path
+from cayley_tables import cayley, generators, isomorphism
+from groups import group
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+d4 = group.Group(valid_tables['cayley_d4'])
+s3 = group.Group(valid_tables['cayley_s3'])
+klein4 = group.Group(valid_tables['cayley_klein4'])
+mod4 = group.Group(valid_tables['cayley_mod4'])
+
+
+def relabelled(table, seed):
+    # A copy of table with its indices shuffled by a random permutation.
+    permutation = np.random.default_rng(seed).permutation(table.order())
+    array = np.empty_like(table.array)
+    array[np.ix_(permutation, permutation)] = permutation[table.array]
+    return cayley.CayleyTable.from_array(array, check_axioms=False)
+
+
+def test_is_isomorphic_small():
+    assert (s3.is_isomorphic(DihedralGroup(3)) is True)
+    assert (d4.is_isomorphic(DihedralGroup(4)) is True)
+    assert (klein4.is_isomorphic(mod4) is False)
+    assert (mod4.is_isomorphic(CyclicGroup(4)) is True)
+    assert (d4.is_isomorphic(s3) is False)
+
+
+def test_find_isomorphism_relabelled():
+    for n in (5, 8, 12):
+        table = DihedralGroup(n).cayley_table
+        other = relabelled(table, n)
+        phi = isomorphism.find_isomorphism(table, other)
+        assert (phi is not None)
+        assert (sorted(phi.tolist()) == list(range(table.order())))
+        assert (np.array_equal(phi[table.array], other.array[np.ix_(phi, phi)]))
+
+
+def test_direct_product_isomorphisms():
+    # D_6 = D_3 x C_2, but D_12 and D_6 x C_2 have different element orders.
+    d3_c2 = cayley.CayleyTable.from_array(generators.direct_product_array(
+        generators.dihedral_array(3), generators.cyclic_array(2)), check_axioms=False)
+    assert (isomorphism.is_isomorphic(DihedralGroup(6), d3_c2) is True)
+    d6_c2 = cayley.CayleyTable.from_array(generators.direct_product_array(
+        generators.dihedral_array(6), generators.cyclic_array(2)), check_axioms=False)
+    assert (isomorphism.is_isomorphic(DihedralGroup(12), d6_c2) is False)
+    c6_c2 = cayley.CayleyTable.from_array(generators.direct_product_array(
+        generators.cyclic_array(6), generators.cyclic_array(2)), check_axioms=False)
+    assert (isomorphism.is_isomorphic(c6_c2, CyclicGroup(12)) is False)
+    c3_c4 = cayley.CayleyTable.from_array(generators.direct_product_array(
+        generators.cyclic_array(3), generators.cyclic_array(4)), check_axioms=False)
+    assert (isomorphism.is_isomorphic(c3_c4, CyclicGroup(12)) is True)
+
+
+def test_fingerprint_buckets():
+    groups = [DihedralGroup(4), d4, CyclicGroup(8), klein4, mod4, CyclicGroup(4), s3]
+    buckets = {}
+    for G in groups:
+        buckets.setdefault(G.fingerprint(), []).append(G)
+    assert (len(buckets) == 5)
+    assert (buckets[d4.fingerprint()] == [groups[0], d4])
+    assert (d4.fingerprint() is d4.fingerprint())
+    assert (hash(s3.fingerprint()) == hash(DihedralGroup(3).fingerprint()))
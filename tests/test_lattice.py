@@ -0,0 +1,67 @@
+import yaml
+import sys
+import itertools
+from pathlib import Path
+from cayley_tables import lattice
+from groups import group
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.permutation_group import PermutationGroup
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+d4 = group.Group(valid_tables['cayley_d4'])
+s3 = group.Group(valid_tables['cayley_s3'])
+klein4 = group.Group(valid_tables['cayley_klein4'])
+
+
+def brute_force_subgroups(G):
+    # All subsets which pass the subgroup test, only feasible for tiny groups.
+    return {frozenset(subset) for k in range(1, G.order() + 1)
+            for subset in itertools.combinations(G.elements, k) if G.is_subgroup(list(subset))}
+
+
+def test_subgroups_match_brute_force():
+    for G in (d4, s3, klein4):
+        subgroups = [frozenset(H.elements) for H in G.subgroups()]
+        assert (len(subgroups) == len(set(subgroups)))
+        assert (set(subgroups) == brute_force_subgroups(G))
+
+
+def test_subgroup_counts():
+    assert (len(list(CyclicGroup(60).subgroups())) == 12)
+    assert (len(list(DihedralGroup(12).subgroups())) == 34)
+    # d(n) + sigma(n) subgroups in D_n.
+    assert (len(list(DihedralGroup(100).subgroups())) == 226)
+    assert (len(list(PermutationGroup.symmetric(4).subgroups())) == 30)
+    assert (len(list(PermutationGroup.symmetric(5).subgroups())) == 156)
+
+
+def test_stream_stops_early():
+    stream = DihedralGroup(30).subgroups()
+    first = list(itertools.islice(stream, 3))
+    assert ([H.order() for H in first] == [1, 30, 15])
+
+
+def test_lattice_d4():
+    lattice_d4 = d4.subgroup_lattice()
+    assert (len(lattice_d4) == 10)
+    assert (lattice_d4.order_profile() == {1: 1, 2: 5, 4: 3, 8: 1})
+    assert (len(lattice_d4.edges()) == 15)
+    whole = lattice_d4[len(lattice_d4) - 1]
+    assert ([H.order() for H in lattice_d4.maximal_subgroups(whole)] == [4, 4, 4])
+    assert (len(lattice_d4.minimal_supergroups(lattice_d4[0])) == 5)
+    assert (d4.subgroup_lattice() is lattice_d4)
+
+
+def test_lattice_containment():
+    lattice_s3 = lattice.SubgroupLattice(s3.subgroups())
+    for i, H in enumerate(lattice_s3):
+        for j, K in enumerate(lattice_s3):
+            assert (lattice_s3.containment[i, j] == H.is_subgroup_of(K))
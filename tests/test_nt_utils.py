@@ -1,5 +1,6 @@
 import sys
 import pytest
+import numpy as np
 from pathlib import Path
 from utils import nt
 
@@ -27,3 +28,64 @@ def test_is_prime_float():
     with pytest.raises(ValueError) as e:
         nt.is_prime(6.17)
     assert str(e.value) == 'n must be a positive integer.'
+
+# Test factorize, divisors and totient
+
+
+def test_factorize():
+    assert (nt.factorize(360) == {2: 3, 3: 2, 5: 1})
+    assert (nt.factorize(1) == {})
+
+
+def test_divisors():
+    assert (nt.divisors(12) == [1, 2, 3, 4, 6, 12])
+
+
+def test_totient():
+    assert ([nt.totient(n) for n in range(1, 11)] == [1, 1, 2, 2, 4, 2, 6, 4, 6, 4])
+
+
+def test_divisors_invalid():
+    with pytest.raises(ValueError) as e:
+        nt.divisors(0)
+    assert str(e.value) == 'n must be a positive integer.'
+
+
+def test_is_prime_miller_rabin():
+    # Carmichael number, strong pseudoprime to base 2, Mersenne prime and the largest u64 prime.
+    assert (nt.is_prime(561) is False)
+    assert (nt.is_prime(2047) is False)
+    assert (nt.is_prime(2 ** 61 - 1) is True)
+    assert (nt.is_prime(18446744073709551557) is True)
+    assert (nt.is_prime(1) is False)
+    assert (nt.is_prime(2) is True)
+
+
+def test_factorize_large():
+    assert (nt.factorize(600851475143) == {71: 1, 839: 1, 1471: 1, 6857: 1})
+    assert (nt.factorize(4294967291 * 4294967279) == {4294967279: 1, 4294967291: 1})
+    assert (nt.factorize(2 ** 10 * 41 ** 2) == {2: 10, 41: 2})
+    assert (nt.totient(10 ** 18) == 4 * 10 ** 17)
+
+
+def test_primes():
+    assert (nt.primes(30).tolist() == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+    assert (nt.primes(30).dtype == np.uint64)
+    assert (len(nt.primes(10 ** 6)) == 78498)
+    assert (nt.primes(1001000, 1000000).tolist()
+            == [n for n in range(1000000, 1001000) if nt.is_prime(n)])
+    assert (len(nt.primes(2)) == 0)
+    with pytest.raises(ValueError):
+        nt.primes(-1)
+
+
+def test_batch():
+    values = np.arange(1, 101)
+    assert (np.flatnonzero(nt.is_prime_many(values)).tolist()
+            == [n - 1 for n in nt.primes(101).tolist()])
+    assert (nt.totient_many([[1, 2], [9, 10]]).tolist() == [[1, 1], [6, 4]])
+    with pytest.raises(ValueError) as e:
+        nt.is_prime_many([3, 0])
+    assert str(e.value) == 'values must be positive integers.'
+    with pytest.raises(ValueError):
+        nt.totient_many([1.5])
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from groups.group import Group
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.permutation_group import PermutationGroup
+
+rng = np.random.default_rng(0)
+groups = [CyclicGroup(12, lazy=True), CyclicGroup(7), DihedralGroup(1), DihedralGroup(2),
+          DihedralGroup(6, lazy=True), DihedralGroup(9), PermutationGroup.symmetric(4)]
+
+
+def test_op_many():
+    for G in groups:
+        n = G.order()
+        xs, ys = rng.integers(0, n, (2, 200))
+        expected = [G.cayley_table.index_of(G.op(*G.labels_of([x, y]))) for x, y in zip(xs, ys)]
+        assert (G.op_many(xs, ys).tolist() == expected)
+        assert (np.array_equal(G.op_many(xs, ys), G.cayley_table.op_many(xs, ys)))
+        # Broadcasting gives back the whole table.
+        table = G.op_many(np.arange(n)[:, None], np.arange(n)[None, :])
+        assert (np.array_equal(table, G.cayley_table.array))
+
+
+def test_reduce():
+    for G in groups:
+        n = G.order()
+        words = rng.integers(0, n, (50, 7))
+        expected = words[:, 0]
+        for letters in words[:, 1:].T:
+            expected = G.cayley_table.op_many(expected, letters)
+        assert (np.array_equal(G.reduce(words), expected))
+        assert (np.array_equal(G.cayley_table.reduce(words), expected))
+        # Ragged words are padded with the identity.
+        ragged = [words[0, :3], words[1], []]
+        identity = G.cayley_table.index_of(G.get_identity())
+        prefix = G.reduce(words[:1, :3])[0]
+        for H in (G, G.cayley_table):
+            assert (H.reduce(ragged).tolist() == [prefix, expected[1], identity])
+        assert (G.reduce(np.zeros((3, 0), dtype=int)).tolist() == [identity] * 3)
+
+
+def test_pow_many():
+    for G in groups:
+        n = G.order()
+        xs = rng.integers(0, n, 100)
+        ks = rng.integers(-30, 30, 100)
+        identity = G.cayley_table.index_of(G.get_identity())
+        expected = []
+        for x, k in zip(xs.tolist(), ks.tolist()):
+            power = identity
+            base = x if k >= 0 else G.cayley_table.inverse_indices()[x]
+            for _ in range(abs(k)):
+                power = G.cayley_table.op_many(power, base)
+            expected.append(int(power))
+        assert (G.pow_many(xs, ks).tolist() == expected)
+        assert (G.cayley_table.pow_many(xs, ks).tolist() == expected)
+        assert (G.pow_many(xs, 0).tolist() == [identity] * 100)
+
+
+def test_large_exponents():
+    G = CyclicGroup(10 ** 6, lazy=True)
+    assert (G.pow_many([3], [10 ** 17 + 1]).tolist() == [3 * (10 ** 17 + 1) % 10 ** 6])
+    D = DihedralGroup(5, lazy=True)
+    assert (np.array_equal(D.pow_many(np.arange(10), 2 ** 40),
+                           D.cayley_table.pow_many(np.arange(10), 2 ** 40)))
+
+
+def test_labels():
+    S = PermutationGroup.symmetric(3)
+    labels = S.labels_of([0, 5, 2])
+    assert (all(isinstance(label, tuple) for label in labels))
+    assert (S.indices_of(labels).tolist() == [0, 5, 2])
+    assert (S.labels_of(np.array([[0, 1], [2, 3]]))[1] == S.labels_of([2, 3]))
+    for G in groups[:6]:
+        assert (G.indices_of(range(G.order())).tolist() == list(range(G.order())))
+        assert (G.labels_of(np.arange(G.order())) == list(range(G.order())))
+    table = {'e': {'e': 'e', 'a': 'a'}, 'a': {'e': 'a', 'a': 'e'}}
+    G = Group(table)
+    assert (G.labels_of(G.op_many(G.indices_of(['a', 'a', 'e']), G.indices_of('aea')))
+            == ['e', 'a', 'a'])
+
+
+def test_errors():
+    for G in (CyclicGroup(5, lazy=True), DihedralGroup(5, lazy=True),
+              PermutationGroup.symmetric(3)):
+        n = G.order()
+        with pytest.raises(ValueError):
+            G.op_many([0, n], [0, 0])
+        with pytest.raises(ValueError):
+            G.op_many([-1], [0])
+        with pytest.raises(ValueError):
+            G.reduce([[0, 1.5]])
+        with pytest.raises(ValueError):
+            G.reduce([0, 1])
+        with pytest.raises(ValueError):
+            G.pow_many([0], [0.5])
+        with pytest.raises(KeyError):
+            G.indices_of([n])
+    # Words and powers need a group.
+    magma = Group(np.array([[0, 0], [0, 0]]), check_axioms=False)
+    with pytest.raises(ValueError):
+        magma.pow_many([1], [2])
+    with pytest.raises(ValueError):
+        magma.reduce([[1, 1]])
@@ -0,0 +1,108 @@
+import math
+import numpy as np
+import pytest
+from cayley_tables import isomorphism
+from groups.permutation_group import PermutationGroup
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+
+s5 = PermutationGroup.symmetric(5)
+
+
+def test_order():
+    for d in (1, 2, 3, 6, 10, 15):
+        assert (PermutationGroup.symmetric(d).order() == math.factorial(d))
+    assert (PermutationGroup.cyclic(12).order() == 12)
+    assert (PermutationGroup.dihedral(9).order() == 18)
+    # The Klein four group inside S_4.
+    assert (PermutationGroup([[1, 0, 3, 2], [2, 3, 0, 1]]).order() == 4)
+    assert (PermutationGroup([], degree=3).order() == 1)
+
+
+def test_order_alternating():
+    # A_n is generated by the 3-cycles (0 1 k).
+    for d in (4, 5, 7):
+        generators = []
+        for k in range(2, d):
+            p = list(range(d))
+            p[0], p[1], p[k] = 1, k, 0
+            generators.append(p)
+        A = PermutationGroup(generators)
+        assert (A.order() == math.factorial(d) // 2)
+        assert (A.contains(list(range(d))) is True)
+        assert (A.contains([1, 0] + list(range(2, d))) is False)
+
+
+def test_membership():
+    D = PermutationGroup.dihedral(6)
+    assert ((1, 2, 3, 4, 5, 0) in D)
+    assert ((0, 5, 4, 3, 2, 1) in D)
+    assert ((1, 0, 2, 3, 4, 5) not in D)
+    assert ((0, 1, 2) not in D)
+    assert ('abc' not in D)
+
+
+def test_random_element():
+    D = PermutationGroup.dihedral(7)
+    samples = {D.random_element(seed) for seed in range(300)}
+    assert (all(g in D for g in samples))
+    assert (len(samples) == 14)
+
+
+def test_arithmetic():
+    r, s = (1, 2, 3, 0), (0, 3, 2, 1)
+    D = PermutationGroup([r, s])
+    assert (D.op(r, s) == (3, 2, 1, 0))
+    assert (D.get_inverse(r) == (3, 0, 1, 2))
+    assert (D.get_identity() == (0, 1, 2, 3))
+    assert (D.get_order_of_element(r) == 4)
+    assert (D.get_order_of_element(s) == 2)
+    assert (D.is_abelian() is False)
+    assert (PermutationGroup.cyclic(5).is_abelian() is True)
+    with pytest.raises(KeyError):
+        D.op(r, (1, 0, 2, 3))
+    with pytest.raises(ValueError):
+        D.get_order_of_element((1, 0, 2, 3))
+
+
+def test_invalid_generators():
+    with pytest.raises(ValueError):
+        PermutationGroup([[0, 0, 1]])
+    with pytest.raises(ValueError):
+        PermutationGroup([[0, 1], [0, 1, 2]])
+    with pytest.raises(ValueError):
+        PermutationGroup([])
+
+
+def test_cayley_table_is_lazy():
+    S = PermutationGroup.symmetric(4)
+    assert (S._cayley_table is None)
+    table = S.cayley_table
+    assert (table.order() == 24)
+    assert (table.is_group('exact') is True)
+    for a in S.elements[:6]:
+        for b in S.elements:
+            assert (table.op(a, b) == S.op(a, b))
+    assert (S.elements[0] == S.get_identity())
+
+
+def test_element_orders_match_table():
+    assert (s5.order_histogram() == {1: 1, 2: 25, 3: 20, 4: 30, 5: 24, 6: 20})
+    assert (s5.get_order_of_element((1, 2, 0, 4, 3)) == 6)
+    S = PermutationGroup.symmetric(5)
+    assert (S.order_histogram() == s5.order_histogram() and S._cayley_table is None)
+    assert (list(S.element_orders()) == list(S.cayley_table.element_orders()))
+    for d in (1, 4, 6, 7):
+        assert (S.get_elements_of_order(d) == S.cayley_table.get_elements_of_order(d))
+    trivial = PermutationGroup([], degree=0)
+    assert (trivial.order_histogram() == {1: 1})
+
+
+def test_cyclic_and_dihedral_as_permutation_groups():
+    for n in (1, 2, 3, 4, 10):
+        assert (isomorphism.is_isomorphic(CyclicGroup(n).as_permutation_group(), CyclicGroup(n)))
+        D = DihedralGroup(n)
+        assert (D.as_permutation_group().order() == D.order())
+        assert (isomorphism.is_isomorphic(D.as_permutation_group(), D))
+    assert (np.array_equal(DihedralGroup(6).as_permutation_group().element_orders().sum(),
+                           DihedralGroup(6).element_orders().sum()))
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from groups.cyclic_group import CyclicGroup
+from groups.dihedral_group import DihedralGroup
+from groups.permutation_group import PermutationGroup
+from groups.product_group import direct_product, semidirect_product
+
+c4_d3 = direct_product(CyclicGroup(4, lazy=True), DihedralGroup(3))
+# The Frobenius group of order 21, C_7 x| C_3 with the generator of C_3 acting by x -> 2x.
+frobenius = semidirect_product(CyclicGroup(7, lazy=True), CyclicGroup(3, lazy=True),
+                               lambda h, n: pow(2, h, 7) * n % 7)
+
+
+def test_matches_table():
+    for G in (c4_d3, frobenius):
+        table = G.cayley_table
+        assert (table.is_group('exact'))
+        for x in G.elements:
+            assert (G.get_inverse(x) == table.get_inverse(x))
+            assert (G.get_order_of_element(x) == table.get_order_of_element(x))
+            for y in G.elements:
+                assert (G.op(x, y) == table.op(x, y))
+        assert (G.order_histogram() == table.order_histogram())
+        assert (np.array_equal(G.inverse_indices(), table.inverse_indices()))
+        assert (G.is_abelian() == table.is_abelian())
+        for order in G.order_histogram():
+            assert (G.get_elements_of_order(order) == table.get_elements_of_order(order))
+
+
+def test_direct_product():
+    G = direct_product(CyclicGroup(2), CyclicGroup(3))
+    assert (G.is_abelian() and G.is_isomorphic(CyclicGroup(6)))
+    assert (G.elements[:3] == [(0, 0), (0, 1), (0, 2)])
+    assert (G.op((1, 2), (1, 2)) == (0, 1))
+    assert (G.get_identity() == (0, 0))
+    assert (not c4_d3.is_abelian())
+    assert (c4_d3.order_histogram() == {1: 1, 2: 7, 3: 2, 4: 8, 6: 2, 12: 4})
+    # Nested products have pairs as components.
+    H = direct_product(G, CyclicGroup(2))
+    assert (H.op(((1, 1), 1), ((1, 1), 1)) == ((0, 2), 0))
+
+
+def test_direct_product_is_lazy():
+    G = direct_product(CyclicGroup(1000, lazy=True), DihedralGroup(500, lazy=True))
+    assert (G.order() == 10 ** 6)
+    assert (G.get_order_of_element((10, 3)) == 500)
+    assert (G.order_histogram()[2] == 2 * 502 - 1)
+    assert (G.pow_many(G.indices_of([(1, 1)]), 1000).tolist() == G.indices_of([(0, 0)]).tolist())
+    assert (G._cayley_table is None)
+    assert (G.factors[0]._cayley_table is None and G.factors[1]._cayley_table is None)
+
+
+def test_semidirect_product():
+    assert (frobenius.order() == 21 and not frobenius.is_abelian())
+    assert (frobenius.order_histogram() == {1: 1, 3: 14, 7: 6})
+    assert (frobenius.op((1, 1), (1, 0)) == (3, 1))
+    dihedral = semidirect_product(CyclicGroup(5), CyclicGroup(2), lambda h, n: -n % 5 if h else n)
+    assert (dihedral.is_isomorphic(DihedralGroup(5)))
+    trivial = semidirect_product(CyclicGroup(3), CyclicGroup(2), np.array([[0, 1, 2], [0, 1, 2]]))
+    assert (trivial.is_abelian() and trivial.is_isomorphic(CyclicGroup(6)))
+    # S_3 acting on the Klein four group by permuting its nonzero elements gives S_4. Products
+    # of permutations apply the left factor first, so p acts through its inverse.
+    klein = direct_product(CyclicGroup(2), CyclicGroup(2))
+    s3 = PermutationGroup.symmetric(3)
+    nonzero = [(0, 1), (1, 0), (1, 1)]
+
+    def permute(p, v):
+        return v if v == (0, 0) else nonzero[p.index(nonzero.index(v))]
+    assert (semidirect_product(klein, s3, permute).is_isomorphic(PermutationGroup.symmetric(4)))
+
+
+def test_invalid_action():
+    c7, c3 = CyclicGroup(7), CyclicGroup(3)
+    with pytest.raises(ValueError):
+        semidirect_product(c7, c3, lambda h, n: (n + h) % 7)
+    # x -> 3x has order 6, so it does not define an action of C_3.
+    with pytest.raises(ValueError):
+        semidirect_product(c7, c3, lambda h, n: pow(3, h, 7) * n % 7)
+    with pytest.raises(ValueError):
+        semidirect_product(c7, c3, np.zeros((3, 7), dtype=int))
+    with pytest.raises(ValueError):
+        semidirect_product(c7, c3, np.zeros((2, 7), dtype=int))
+    with pytest.raises(KeyError):
+        c4_d3.op((0, 6), (0, 0))
+    with pytest.raises(ValueError):
+        c4_d3.get_order_of_element(0)
+
+
+def test_batched_operations():
+    rng = np.random.default_rng(0)
+    for G in (c4_d3, frobenius):
+        table = G.cayley_table
+        xs, ys = rng.integers(0, G.order(), (2, 100))
+        ks = rng.integers(-50, 50, 100)
+        words = rng.integers(0, G.order(), (20, 5))
+        assert (np.array_equal(G.op_many(xs, ys), table.op_many(xs, ys)))
+        assert (np.array_equal(G.pow_many(xs, ks), table.pow_many(xs, ks)))
+        assert (np.array_equal(G.reduce(words), table.reduce(words)))
+        assert (G.labels_of(xs) == table.labels_of(xs))
+        assert (np.array_equal(G.indices_of(G.labels_of(xs)), xs))
@@ -0,0 +1,67 @@
+import yaml
+import sys
+import pytest
+from pathlib import Path
+from cayley_tables import cayley, generators
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+cayley_d4 = cayley.CayleyTable(valid_tables['cayley_d4'])
+cayley_s3 = cayley.CayleyTable(valid_tables['cayley_s3'])
+
+
+def test_is_subgroup_d4():
+    assert (cayley_d4.is_subgroup(['e', 'r', 'r^2', 'r^3']) is True)
+    assert (cayley_d4.is_subgroup(['e', 's', 'r^2', 'sr^2']) is True)
+    assert (cayley_d4.is_subgroup(['e', 'r']) is False)
+    assert (cayley_d4.is_subgroup([]) is False)
+
+
+def test_is_subgroup_undefined_product():
+    # 'a' * 'a' is not an element, so the table stores the sentinel index for it.
+    table = cayley.CayleyTable({'e': {'e': 'e', 'a': 'a'}, 'a': {'e': 'a', 'a': 'x'}},
+                               check_axioms=False)
+    assert (table.is_subgroup(['e', 'a']) is False)
+    assert (table.is_subgroup(['e']) is True)
+
+
+def test_is_subgroup_invalid_element():
+    with pytest.raises(KeyError):
+        cayley_d4.is_subgroup(['e', 'x'])
+
+
+def test_generated_subgroup_d4():
+    assert (set(cayley_d4.generated_subgroup(['r'])) == {'e', 'r', 'r^2', 'r^3'})
+    assert (cayley_d4.generated_subgroup(['r', 's']).order() == 8)
+    assert (cayley_d4.generated_subgroup([]).elements == ['e'])
+
+
+def test_generated_subgroup_s3():
+    assert (set(cayley_s3.generated_subgroup(['p'])) == {'e', 'p', 'q'})
+    assert (cayley_s3.generated_subgroup(['r', 's']).order() == 6)
+
+
+def test_subgroup_view():
+    rotations = cayley_d4.subgroup(['r^3', 'e', 'r', 'r^2'])
+    assert (rotations == cayley_d4.generated_subgroup(['r^3']))
+    assert (hash(rotations) == hash(cayley_d4.generated_subgroup(['r'])))
+    assert ('r^2' in rotations and 's' not in rotations)
+    assert (rotations.op('r', 'r^3') == 'e')
+    assert (cayley_d4.generated_subgroup(['r^2']).is_subgroup_of(rotations) is True)
+    assert (rotations.to_cayley_table().is_group() is True)
+    with pytest.raises(ValueError):
+        cayley_d4.subgroup(['e', 'r'])
+
+
+def test_generated_subgroup_large_cyclic():
+    c1000 = cayley.CayleyTable.from_array(generators.cyclic_array(1000, use_rust=False),
+                                          check_axioms=False)
+    subgroup = c1000.generated_subgroup([150, 250])
+    assert (subgroup.order() == 20)
+    assert (c1000.is_subgroup(subgroup.elements) is True)
@@ -0,0 +1,93 @@
+import yaml
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from cayley_tables import cayley, table_io
+from groups.dihedral_group import DihedralGroup
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+cayley_d4 = cayley.CayleyTable(valid_tables['cayley_d4'])
+
+
+def test_save_load_roundtrip(tmp_path):
+    path = tmp_path / 'd4.cayley'
+    cayley_d4.save(path)
+    for mmap in (True, False):
+        table = cayley.CayleyTable.load(path, mmap=mmap)
+        assert (table.elements == cayley_d4.elements)
+        assert (np.array_equal(table.array, cayley_d4.array))
+        assert (table.table['r']['s'] == 'sr^3')
+    # Loading does not validate by default, so the memory map is not read.
+    table = cayley.CayleyTable.load(path)
+    assert (isinstance(table._array, np.memmap) and table._cache == {})
+    assert (cayley.CayleyTable.load(path, check_axioms='light').is_group())
+
+
+def test_load_mmap_copy_on_write(tmp_path):
+    path = tmp_path / 'd4.cayley'
+    cayley_d4.save(path)
+    table = cayley.CayleyTable.load(path, check_axioms=False)
+    table.set_product('r', 'r', 'e')
+    assert (table.table['r']['r'] == 'e')
+    assert (cayley.CayleyTable.load(path).table['r']['r'] == 'r^2')
+
+
+def test_save_load_large(tmp_path):
+    path = tmp_path / 'd300.cayley'
+    array = DihedralGroup(300).cayley_table.array
+    cayley.CayleyTable.from_array(array, check_axioms=False).save(path)
+    table = cayley.CayleyTable.load(path, check_axioms=False)
+    assert (table.array.dtype == np.uint16)
+    assert (np.array_equal(table.array, array))
+    assert (table.get_order_of_element(1) == 300)
+
+
+def test_load_invalid(tmp_path):
+    path = tmp_path / 'bad.cayley'
+    path.write_bytes(b'not a table')
+    with pytest.raises(ValueError):
+        cayley.CayleyTable.load(path)
+    cayley_d4.save(path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        cayley.CayleyTable.load(path)
+    with pytest.raises(TypeError):
+        cayley.CayleyTable.from_array(np.zeros((1, 1), dtype=int), [(0,)]).save(path)
+
+
+def test_import_yaml(tmp_path):
+    for name in ('cayley_d4', 'cayley_mod3', 'cayley_s3'):
+        path = tmp_path / f'{name}.cayley'
+        table_io.import_yaml('../config/valid_tables.yml', path, name=name)
+        expected = cayley.CayleyTable(valid_tables[name])
+        table = cayley.CayleyTable.load(path)
+        assert (table.elements == expected.elements)
+        assert (np.array_equal(table.array, expected.array))
+    with pytest.raises(KeyError):
+        table_io.import_yaml('../config/valid_tables.yml', tmp_path / 'x.cayley', name='nope')
+
+
+def test_import_csv(tmp_path):
+    source = tmp_path / 'klein4.csv'
+    source.write_text('*,e,a,b,c\ne,e,a,b,c\na,a,e,c,b\nb,b,c,e,a\nc,c,b,a,e\n')
+    table_io.import_csv(source, tmp_path / 'klein4.cayley')
+    table = cayley.CayleyTable.load(tmp_path / 'klein4.cayley')
+    expected = cayley.CayleyTable(valid_tables['cayley_klein4'])
+    assert (table.elements == expected.elements)
+    assert (np.array_equal(table.array, expected.array))
+
+
+def test_import_csv_missing_rows(tmp_path):
+    source = tmp_path / 'partial.csv'
+    source.write_text('*,e,a\ne,e,x\n')
+    table_io.import_csv(source, tmp_path / 'partial.cayley')
+    table = cayley.CayleyTable.load(tmp_path / 'partial.cayley', check_axioms=False)
+    assert (table.array.tolist() == [[0, 2], [2, 2]])
@@ -0,0 +1,79 @@
+import yaml
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from cayley_tables import cayley
+
+current_dir = Path(__file__).resolve().parent
+root_dir = current_dir.parent
+sys.path.append(str(root_dir))
+
+
+with open('../config/valid_tables.yml', 'r') as f:
+    valid_tables = yaml.safe_load(f)
+
+with open('../config/invalid_tables.yml', 'r') as f:
+    invalid_tables = yaml.safe_load(f)
+
+
+def unchecked(array):
+    return cayley.CayleyTable.from_array(np.array(array), check_axioms=False)
+
+
+def test_valid_tables_report():
+    for name in valid_tables:
+        report = cayley.CayleyTable(valid_tables[name]).validate()
+        assert (report.is_group is True)
+        assert (bool(report) is True)
+        assert (report.axiom is None)
+
+
+def test_invalid_tables_report():
+    for name in invalid_tables:
+        table = cayley.CayleyTable(invalid_tables[name], check_axioms=False)
+        report = table.validate()
+        assert (bool(report) is False)
+        assert (report.axiom == 'latin_square')
+        a, b, c = report.witness
+        assert (b != c)
+        assert (table.op(a, b) == table.op(a, c) or table.op(b, a) == table.op(c, a))
+
+
+def test_closure_report():
+    table = cayley.CayleyTable({0: {0: 0, 1: 1}, 1: {0: 1, 1: 2}}, check_axioms=False)
+    report = table.validate()
+    assert (report.axiom == 'closure')
+    assert (report.witness == (1, 1))
+
+
+def test_latin_square_column_report():
+    # Rows are permutations but column 0 is not.
+    report = unchecked([[0, 1], [0, 1]]).validate()
+    assert (report.axiom == 'latin_square')
+    assert (report.witness == (0, 0, 1))
+    assert ('0 * 0 = 1 * 0' in report.message)
+
+
+def test_identity_and_inverses_report():
+    # x * y = 2x - y mod 3 is a Latin square without identity.
+    report = unchecked([[(2 * x - y) % 3 for y in range(3)] for x in range(3)]).validate()
+    assert (report.axiom == 'identity')
+    # A loop where 1 * 2 = 0 but 2 * 1 = 3, so 1 has no two-sided inverse.
+    loop = [[0, 1, 2, 3, 4], [1, 2, 0, 4, 3], [2, 3, 4, 0, 1], [3, 4, 1, 2, 0], [4, 0, 3, 1, 2]]
+    report = unchecked(loop).validate()
+    assert (report.axiom == 'inverses')
+    assert (report.witness == 1)
+
+
+def test_associativity_report():
+    loop5 = [[0, 1, 2, 3, 4], [1, 0, 3, 4, 2], [2, 4, 0, 1, 3], [3, 2, 4, 0, 1], [4, 3, 1, 2, 0]]
+    report = unchecked(loop5).validate('light')
+    assert (report.axiom == 'associativity')
+    assert (report.to_dict()['witness'] == report.witness)
+
+
+def test_error_message_names_axiom():
+    with pytest.raises(ValueError) as e:
+        cayley.CayleyTable(invalid_tables['cayley_no_inverse'])
+    assert ('Latin square' in str(e.value))
@@ -0,0 +1,216 @@
+import math
+import numpy as np
+from typing import Dict, List
+
+try:
+    import nt_utils as _rust
+except ImportError:
+    # The Rust extension is optional, every function then falls back to pure Python.
+    _rust = None
+
+# Largest input handled by the Rust kernels, which work with u64.
+_U64_MAX = 2 ** 64 - 1
+
+# Miller-Rabin with these bases is deterministic for n < 3.3 * 10^24, in particular for all u64.
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _check_positive_integer(n: int) -> None:
+    if isinstance(n, bool) or not isinstance(n, int) or n <= 0:
+        raise ValueError('n must be a positive integer.')
+
+
+def _check_positive_array(values) -> np.ndarray:
+    # values as a uint64 array, raising a ValueError unless they are all positive integers.
+    array = np.asarray(values)
+    if array.dtype.kind not in 'iu' or (array.size and array.min() <= 0):
+        raise ValueError('values must be positive integers.')
+    return np.ascontiguousarray(array, dtype=np.uint64)
+
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    '''
+    Return True if n is prime, with the Miller-Rabin test over the first twelve primes as
+    bases. This is deterministic for n < 3.3 * 10^24, which covers every u64, and a strong
+    probable prime test beyond.
+
+    Arguments:
+        - n: a positive integer
+    '''
+    _check_positive_integer(n)
+    if _rust is not None and n <= _U64_MAX:
+        return bool(_rust.is_prime(n))
+    return _is_prime(n)
+
+
+def _pollard_rho(n: int) -> int:
+    # A nontrivial factor of the odd composite n, by Brent's variant of Pollard's rho method.
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ValueError(f'{n} is prime.')
+
+
+def _factorize(n: int) -> Dict[int, int]:
+    factors = {}
+    for p in _WITNESSES:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if _is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_rho(m)
+            stack.extend((d, m // d))
+    return dict(sorted(factors.items()))
+
+
+def factorize(n: int) -> Dict[int, int]:
+    '''
+    Return the prime factorization of n as a dictionary mapping each prime to its exponent,
+    in increasing order of the primes. Small primes are divided out first and the remaining
+    cofactor is split with Pollard's rho method, so the cost grows with the second largest
+    prime factor rather than with sqrt(n).
+
+    Arguments:
+        - n: a positive integer
+
+    Outputs:
+        - {p: e} such that n is the product of p^e
+    '''
+    _check_positive_integer(n)
+    if _rust is not None and n <= _U64_MAX:
+        return {int(p): int(e) for p, e in _rust.factorize(n)}
+    return _factorize(n)
+
+
+def divisors(n: int) -> List[int]:
+    # Return the sorted list of positive divisors of n.
+    result = [1]
+    for p, e in factorize(n).items():
+        result = [d * p ** k for d in result for k in range(e + 1)]
+    return sorted(result)
+
+
+def totient(n: int) -> int:
+    # Euler's totient function: the number of 1 <= k <= n with gcd(k, n) = 1.
+    result = n
+    for p in factorize(n):
+        result -= result // p
+    return result
+
+
+def units(n: int) -> List[int]:
+    # Return the integers 1 <= k <= n coprime to n, in increasing order.
+    _check_positive_integer(n)
+    return [k for k in range(1, n + 1) if math.gcd(k, n) == 1]
+
+
+def _small_primes(limit: int) -> np.ndarray:
+    # The primes up to limit, by the sieve of Eratosthenes.
+    is_prime = np.ones(limit + 1, dtype=bool)
+    is_prime[:2] = False
+    for p in range(2, math.isqrt(limit) + 1):
+        if is_prime[p]:
+            is_prime[p * p::p] = False
+    return np.flatnonzero(is_prime)
+
+
+def primes(stop: int, start: int = 0, segment_size: int = 1 << 20) -> np.ndarray:
+    '''
+    Return the primes p with start <= p < stop as a uint64 array, with a segmented sieve of
+    Eratosthenes: only the primes up to sqrt(stop) and one segment of the range are held in
+    memory at a time.
+
+    Arguments:
+        - stop: end of the range, exclusive
+        - start: start of the range
+        - segment_size: the number of integers sieved at once
+    '''
+    for bound in (start, stop):
+        if isinstance(bound, bool) or not isinstance(bound, int) or bound < 0:
+            raise ValueError('start and stop must be non-negative integers.')
+    if _rust is not None and stop <= _U64_MAX:
+        return _rust.primes_between(start, stop)
+    start = max(start, 2)
+    if stop <= start:
+        return np.zeros(0, dtype=np.uint64)
+    base = _small_primes(math.isqrt(stop - 1))
+    segments = []
+    for low in range(start, stop, segment_size):
+        high = min(low + segment_size, stop)
+        composite = np.zeros(high - low, dtype=bool)
+        for p in base.tolist():
+            if p * p >= high:
+                break
+            composite[max(p * p, -(-low // p) * p) - low::p] = True
+        segments.append(np.flatnonzero(~composite) + low)
+    return np.concatenate(segments).astype(np.uint64)
+
+
+def is_prime_many(values) -> np.ndarray:
+    '''
+    Vectorized is_prime over an array of positive integers below 2^64, returning a boolean
+    array of the same shape. The Rust kernel runs in parallel without holding the GIL.
+    '''
+    array = _check_positive_array(values)
+    if _rust is not None:
+        return _rust.is_prime_many(array.ravel()).reshape(array.shape)
+    return np.fromiter((_is_prime(n) for n in array.ravel().tolist()), dtype=bool,
+                       count=array.size).reshape(array.shape)
+
+
+def totient_many(values) -> np.ndarray:
+    '''
+    Vectorized totient over an array of positive integers below 2^64, returning a uint64
+    array of the same shape. The Rust kernel runs in parallel without holding the GIL.
+    '''
+    array = _check_positive_array(values)
+    if _rust is not None:
+        return _rust.totient_many(array.ravel()).reshape(array.shape)
+    return np.fromiter((totient(n) for n in array.ravel().tolist()), dtype=np.uint64,
+                       count=array.size).reshape(array.shape)